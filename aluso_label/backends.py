@@ -0,0 +1,184 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Document backends (LaTeX, Typst or PDF) sharing a common interface."""
+
+from __future__ import annotations
+
+import abc
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from .event import EventFood, EventType
+from .latex import Label, LatexDocument
+from .people import Person
+
+# ==============================================================================
+
+
+class DocumentBackend(abc.ABC):
+    """Base class for the document backends.
+
+    A backend turns the document model (label type, event type, event food and list of people) into a document, which
+    is generated as a stream of chunks (either `str` or `bytes` depending on `binary`).
+
+    NB: the modules specific to each backend are only imported when generating a document in order to keep the startup
+        time of the command line interface to a minimum.
+    """
+
+    name: str
+    description: str
+    file_extension: str
+    mimetype: str
+    binary: bool = False
+
+    @abc.abstractmethod
+    def iter_generate(
+        self,
+        label_type: Label,
+        event_type: EventType,
+        event_food: EventFood,
+        people: Iterable[Person],
+        start_offset: int = 0,
+    ) -> Iterator[str] | Iterator[bytes]:
+        """Generate a document as a stream of chunks.
+
+        Args:
+            label_type (Label): Type of label to generate
+            event_type (EventType): Type of event
+            event_food (EventFood): Type of food provided (if any)
+            people (Iterable[Person]): Participants to generate a label for
+            start_offset (int): Number of labels to skip on the first page (e.g. to reuse a partially used sheet)
+
+        Raises:
+            ValueError: if the start offset is invalid
+        """
+
+    @property
+    def filename(self) -> str:
+        """Default file name of the generated documents."""
+        return f'labels{self.file_extension}'
+
+
+class LatexBackend(DocumentBackend):
+    """LaTeX code (to be compiled with XeLaTeX)."""
+
+    name = 'latex'
+    description = 'LaTeX'
+    file_extension = '.tex'
+    mimetype = 'application/x-tex'
+
+    def __init__(self, cache_icons: bool = False):
+        """Initialize a LaTeX backend.
+
+        Args:
+            cache_icons (bool): Whether to typeset the logo and the icons only once per document (see `LatexDocument`)
+        """
+        self.cache_icons = cache_icons
+
+    def iter_generate(
+        self,
+        label_type: Label,
+        event_type: EventType,
+        event_food: EventFood,
+        people: Iterable[Person],
+        start_offset: int = 0,
+    ) -> Iterator[str]:
+        """Generate a LaTeX document as a stream of text chunks."""
+        document = LatexDocument(label_type, event_type, event_food, self.cache_icons)
+        return document.iter_generate(people, start_offset)
+
+
+class TypstBackend(DocumentBackend):
+    """Typst code (to be compiled with Typst 0.13 or later)."""
+
+    name = 'typst'
+    description = 'Typst'
+    file_extension = '.typ'
+    mimetype = 'text/plain'
+
+    def iter_generate(
+        self,
+        label_type: Label,
+        event_type: EventType,
+        event_food: EventFood,
+        people: Iterable[Person],
+        start_offset: int = 0,
+    ) -> Iterator[str]:
+        """Generate a Typst document as a stream of text chunks."""
+        from .typst import TypstDocument  # noqa: PLC0415
+
+        return TypstDocument(label_type, event_type, event_food).iter_generate(people, start_offset)
+
+
+class PdfBackend(DocumentBackend):
+    """PDF file generated directly (without going through LaTeX or Typst)."""
+
+    name = 'pdf'
+    description = 'PDF'
+    file_extension = '.pdf'
+    mimetype = 'application/pdf'
+    binary = True
+
+    def __init__(self, font_path: str | Path | None = None):
+        """Initialize a PDF backend.
+
+        Args:
+            font_path (str | Path): Path to a TrueType font file to embed (Helvetica is used if not specified)
+        """
+        self.font_path = font_path
+
+    def iter_generate(
+        self,
+        label_type: Label,
+        event_type: EventType,
+        event_food: EventFood,
+        people: Iterable[Person],
+        start_offset: int = 0,
+    ) -> Iterator[bytes]:
+        """Generate a PDF document (as a single chunk).
+
+        Raises:
+            ValueError: if some names cannot be represented using the standard font (see `StandardFont`)
+            RuntimeError: if a name is too long to fit on a label
+        """
+        from .pdf import PdfDocument  # noqa: PLC0415
+
+        document = PdfDocument(label_type, event_type, event_food, self.font_path)
+        return iter([document.generate(people, start_offset)])
+
+
+BACKENDS: dict[str, type[DocumentBackend]] = {
+    backend.name: backend for backend in (LatexBackend, TypstBackend, PdfBackend)
+}
+
+# ==============================================================================
+
+
+def get_backend(name: str, **kwargs: str | Path | bool | None) -> DocumentBackend:
+    """Create a document backend from its name.
+
+    Args:
+        name (str): Name of the backend (see `BACKENDS`)
+        kwargs: Backend-specific options (e.g. `cache_icons` for LaTeX or `font_path` for PDF files)
+
+    Raises:
+        ValueError: if no backend with that name exists
+    """
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Invalid output format: {name} (valid values: {", ".join(BACKENDS)})') from None
+    return backend(**kwargs)
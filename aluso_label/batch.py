@@ -0,0 +1,279 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Batch generation of LaTeX documents for many events at once.
+
+The options for each event are read from a JSON manifest file of the form:
+
+    {
+        "defaults": {"label_type": "AVERY_70X36"},
+        "events": {
+            "2023-03-visit.csv": {"event_type": "CULTURAL_VISIT", "tickets": {"Visite seule": {"post_visit": false}}}
+        }
+    }
+
+where the keys of "events" are the CSV file names (without directory). See `generate_latex_from_csv()` for the list of
+supported options.
+
+Since the LaTeX files are named after the CSV files and all written into the same output directory, the names of the CSV
+files processed at once need to be unique (regardless of case and directory).
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import glob
+import json
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from .csv_import import MissingFieldError
+from .people import Person
+from .pipeline import check_options, generate_latex_from_csv
+
+# ==============================================================================
+
+
+class BatchResult(NamedTuple):
+    """Result of the generation of a single LaTeX document."""
+
+    csv_path: Path
+    output_path: Path | None
+    duration: float
+    error: str | None = None
+
+
+def _init_worker(committee_list: set[str]):
+    """Initialize a worker process."""
+    Person.COMMITTEE_LIST = committee_list
+
+
+def generate_event(csv_path: Path, output_path: Path, options: dict) -> BatchResult:
+    """Generate the LaTeX document for a single event.
+
+    Args:
+        csv_path (Path): Path to the EPFL Alumni CSV file
+        output_path (Path): Path to the output LaTeX file
+        options (dict): Generation options (see `generate_latex_from_csv()`)
+    """
+    start = time.perf_counter()
+    try:
+        with csv_path.open('rb') as csv_file:
+            chunks = generate_latex_from_csv(csv_file, options)
+            with output_path.open('w', encoding='utf-8') as output:
+                output.writelines(chunks)
+    except (OSError, MissingFieldError, ValueError, RuntimeError) as err:
+        output_path.unlink(missing_ok=True)
+        return BatchResult(csv_path, None, time.perf_counter() - start, str(err))
+    except Exception as err:  # noqa: BLE001
+        # NB: a bug triggered by a single event must not abort the generation of all the other ones
+        output_path.unlink(missing_ok=True)
+        return BatchResult(csv_path, None, time.perf_counter() - start, f'{type(err).__name__}: {err}')
+    return BatchResult(csv_path, output_path, time.perf_counter() - start)
+
+
+def find_csv_files(inputs: list[str]) -> list[Path]:
+    """Expand a list of CSV files, directories or glob patterns into a list of CSV files."""
+    csv_files = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            csv_files.extend(sorted(file for file in path.iterdir() if file.suffix.lower() == '.csv'))
+        elif path.exists():
+            csv_files.append(path)
+        else:
+            csv_files.extend(sorted(Path(file) for file in glob.glob(item)))  # noqa: PTH207
+    return list(dict.fromkeys(csv_files))
+
+
+def get_output_name(csv_path: Path) -> str:
+    """Name of the LaTeX file generated for a CSV file."""
+    return csv_path.with_suffix('.tex').name
+
+
+def check_unique_names(csv_files: list[Path]):
+    """Check that no two CSV files would be written into the same LaTeX file.
+
+    NB: names are compared regardless of case since output directories might be on case-insensitive file systems.
+
+    Raises:
+        ValueError: if some CSV files share the same name
+    """
+    files_by_name = {}
+    for csv_path in csv_files:
+        files_by_name.setdefault(get_output_name(csv_path).casefold(), []).append(csv_path)
+
+    duplicates = [', '.join(str(path) for path in paths) for paths in files_by_name.values() if len(paths) > 1]
+    if duplicates:
+        raise ValueError(
+            f'CSV files with the same name would overwrite each other\'s LaTeX file: {"; ".join(duplicates)} '
+            '(please rename them or process them separately)'
+        )
+
+
+def check_manifest(manifest: object):
+    """Check the structure of a manifest (see module documentation).
+
+    NB: the manifest usually comes from a JSON file written by hand, hence any type of value needs to be handled. The
+        options themselves are checked for each event by `check_event_options()`.
+
+    Raises:
+        ValueError: if the manifest is not a mapping with optional "defaults" options and "events" mapping of CSV file
+            names to options
+    """
+    if not isinstance(manifest, dict):
+        raise ValueError(f'Invalid manifest: expected a JSON object, not {type(manifest).__name__}')
+    if not isinstance(manifest.get('defaults', {}), dict):
+        raise ValueError('Invalid manifest: "defaults" must be an object with the default options')
+    events = manifest.get('events', {})
+    if not isinstance(events, dict) or not all(isinstance(options, dict) for options in events.values()):
+        raise ValueError('Invalid manifest: "events" must be an object mapping CSV file names to options')
+
+
+def get_event_options(manifest: dict, csv_path: Path) -> dict:
+    """Options of the event of a CSV file (ie. the default options updated with the ones of the event)."""
+    return {**manifest.get('defaults', {}), **manifest.get('events', {}).get(csv_path.name, {})}
+
+
+def check_event_options(csv_files: list[Path], manifest: dict):
+    """Check the options of each event before any CSV file is processed.
+
+    Raises:
+        ValueError: if the options of some events are missing or invalid (see `check_options()`)
+    """
+    errors = []
+    for csv_path in csv_files:
+        try:
+            check_options(get_event_options(manifest, csv_path))
+        except ValueError as err:
+            errors.append(f'{csv_path}: {err}')
+    if errors:
+        raise ValueError(f'Invalid options in the manifest: {"; ".join(errors)}')
+
+
+def generate_batch(
+    csv_files: list[Path],
+    output_dir: Path,
+    manifest: dict | None = None,
+    max_workers: int | None = None,
+    committee_list: set[str] | None = None,
+) -> Iterator[BatchResult]:
+    """Generate the LaTeX documents for a list of events in parallel.
+
+    Args:
+        csv_files (list[Path]): List of EPFL Alumni CSV files
+        output_dir (Path): Directory where the LaTeX files are written (one per CSV file)
+        manifest (dict): Options for each event (see module documentation)
+        max_workers (int): Maximum number of worker processes (defaults to the number of CPUs)
+        committee_list (set[str]): User IDs of the committee members
+
+    Returns:
+        Iterator over the results (in order of completion)
+
+    Raises:
+        ValueError: if some CSV files share the same name (see `check_unique_names()`) or if the manifest is invalid
+            (see `check_manifest()`)
+    """
+    check_unique_names(csv_files)
+    if manifest is None:
+        manifest = {}
+    check_manifest(manifest)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(committee_list or set(),)
+    ) as executor:
+        futures = [
+            executor.submit(
+                generate_event,
+                csv_path,
+                output_dir / get_output_name(csv_path),
+                get_event_options(manifest, csv_path),
+            )
+            for csv_path in csv_files
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+# ==============================================================================
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the batch command line interface."""
+    parser = argparse.ArgumentParser(
+        prog='aluso-labels-batch', description='Generate LaTeX labels for many EPFL Alumni CSV export files at once.'
+    )
+    parser.add_argument('inputs', nargs='+', help='CSV files, directories containing CSV files or glob patterns')
+    parser.add_argument('-m', '--manifest', type=Path, help='JSON file with the options for each event')
+    parser.add_argument('-o', '--output-dir', type=Path, default=Path(), help='output directory for the LaTeX files')
+    parser.add_argument('-j', '--jobs', type=int, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('-l', '--label-type', help='default type of label (if not specified in the manifest)')
+    parser.add_argument(
+        '-c', '--committee', default='', help='comma-separated list of user IDs of the committee members'
+    )
+    args = parser.parse_args(argv)
+
+    manifest = {}
+    if args.manifest is not None:
+        try:
+            with args.manifest.open(encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError) as err:
+            parser.error(f'cannot read manifest {args.manifest}: {err}')
+    try:
+        check_manifest(manifest)
+    except ValueError as err:
+        parser.error(f'{args.manifest}: {err}')
+    if args.label_type:
+        manifest.setdefault('defaults', {}).setdefault('label_type', args.label_type)
+
+    csv_files = find_csv_files(args.inputs)
+    if not csv_files:
+        parser.error('no CSV file found')
+    try:
+        check_unique_names(csv_files)
+        check_event_options(csv_files, manifest)
+    except ValueError as err:
+        parser.error(str(err))
+
+    start = time.perf_counter()
+    n_errors = 0
+    for result in generate_batch(
+        csv_files,
+        args.output_dir,
+        manifest,
+        max_workers=args.jobs,
+        committee_list={uid.strip() for uid in args.committee.split(',') if uid.strip()},
+    ):
+        if result.error is None:
+            print(f'{result.csv_path} -> {result.output_path} ({result.duration:.3f}s)', file=sys.stderr)
+        else:
+            n_errors += 1
+            print(f'{result.csv_path}: error: {result.error} ({result.duration:.3f}s)', file=sys.stderr)
+
+    print(
+        f'Processed {len(csv_files)} file(s) in {time.perf_counter() - start:.3f}s ({n_errors} error(s))',
+        file=sys.stderr,
+    )
+    return 1 if n_errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Command line interface for the AluSO label generator.
+
+NB: In order to keep the startup time to a minimum, the modules required to generate the labels are only imported once
+    the command line arguments have been parsed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Iterable
+
+_TICKET_FEATURES = ('visit', 'post_visit')
+_OUTPUT_FORMATS = ('latex', 'typst', 'pdf')
+_SORT_TYPES = ('last_name', 'first_name', 'ticket', 'membership')
+
+
+def _parse_ticket_option(value: str) -> tuple[str, set[str]]:
+    """Parse a ticket option of the form 'TICKET NAME=visit,post_visit'."""
+    ticket, sep, features = value.rpartition('=')
+    if not sep or not ticket:
+        raise argparse.ArgumentTypeError(f'Invalid ticket option (expected "TICKET NAME=visit,post_visit"): {value}')
+
+    features = {feature.strip() for feature in features.split(',') if feature.strip()}
+    invalid_features = features - set(_TICKET_FEATURES)
+    if invalid_features:
+        raise argparse.ArgumentTypeError(
+            f'Invalid ticket features: {", ".join(sorted(invalid_features))} (valid: {", ".join(_TICKET_FEATURES)})'
+        )
+    return ticket, features
+
+
+def write_output(output: str, chunks: Iterable[str] | Iterable[bytes], binary: bool = False):
+    """Write a generated document into a file (or into the standard output if `output` is "-").
+
+    NB: the file is only opened once the caller is done generating the document, so that no empty or partial output
+        file is left behind if an error occurs.
+    """
+    if output == '-':
+        (sys.stdout.buffer if binary else sys.stdout).writelines(chunks)
+        return
+
+    from pathlib import Path
+
+    with Path(output).open('wb' if binary else 'w', encoding=None if binary else 'utf-8') as fd:
+        fd.writelines(chunks)
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Create the command line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='aluso-labels', description='Generate LaTeX, Typst or PDF labels from an EPFL Alumni CSV export file.'
+    )
+    parser.add_argument(
+        'csv_file', type=argparse.FileType('rb'), help='EPFL Alumni CSV file (use "-" for standard input)'
+    )
+    # NB: not an `argparse.FileType` since the output file is only created once the document was generated
+    parser.add_argument(
+        '-o', '--output', default='-', help='output LaTeX, Typst or PDF file (default: standard output)'
+    )
+    parser.add_argument(
+        '-F',
+        '--format',
+        choices=_OUTPUT_FORMATS,
+        default='latex',
+        help='output format: LaTeX code, Typst code or PDF file generated directly without LaTeX (default: latex)',
+    )
+    parser.add_argument('--font', help='TrueType font file to embed in PDF files (default: Helvetica, not embedded)')
+    parser.add_argument(
+        '--cache-icons',
+        action='store_true',
+        help='typeset the logo and icons only once per LaTeX document (smaller documents that compile faster)',
+    )
+    parser.add_argument('-l', '--label-type', required=True, help='type of label (e.g. AVERY_70X36)')
+    parser.add_argument('-e', '--event-type', default='COMPANY_VISIT', help='type of event (default: COMPANY_VISIT)')
+    parser.add_argument(
+        '-f', '--event-food', help='food provided at the event (NOTHING, APERO or MEAL; default: guessed from tickets)'
+    )
+    parser.add_argument(
+        '-s', '--sort-type', choices=_SORT_TYPES, default='last_name', help='sort participants by (default: last_name)'
+    )
+    parser.add_argument(
+        '-t',
+        '--ticket',
+        dest='tickets',
+        action='append',
+        default=[],
+        type=_parse_ticket_option,
+        metavar='NAME=FEATURES',
+        help=(
+            'features included in a ticket as a comma-separated list of visit/post_visit (e.g. "Visit only=visit"). '
+            'Can be specified multiple times. Tickets not specified are guessed from their names.'
+        ),
+    )
+    parser.add_argument(
+        '-c', '--committee', default='', help='comma-separated list of user IDs of the committee members'
+    )
+    parser.add_argument(
+        '--snapshot',
+        metavar='FILE',
+        help=(
+            'JSON file with the participants of a previous run of the same event: only participants that are new or '
+            'whose label changed since then get a label. The file is created or updated with the current participants.'
+        ),
+    )
+    parser.add_argument(
+        '--start-offset',
+        type=int,
+        default=0,
+        metavar='N',
+        help='number of labels to skip on the first page (to reuse a partially used sheet of labels)',
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the command line interface."""
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    # NB: imports are deferred until here to keep the startup time (e.g. for --help) to a minimum
+    from .backends import get_backend
+    from .csv_import import MissingFieldError
+    from .people import Person
+    from .pipeline import prepare_document
+    from .snapshots import diff_people, load_snapshot, save_snapshot, take_snapshot
+
+    if args.font is not None and args.format != 'pdf':
+        parser.error('--font is only supported for PDF output')
+    if args.cache_icons and args.format != 'latex':
+        parser.error('--cache-icons is only supported for LaTeX output')
+    backend_options = {'latex': {'cache_icons': args.cache_icons}, 'pdf': {'font_path': args.font}}
+    backend = get_backend(args.format, **backend_options.get(args.format, {}))
+
+    Person.COMMITTEE_LIST = {uid.strip() for uid in args.committee.split(',') if uid.strip()}
+
+    options = {
+        'label_type': args.label_type,
+        'event_type': args.event_type,
+        'event_food': args.event_food,
+        'sort_type': args.sort_type,
+        'tickets': {
+            ticket: {feature: feature in features for feature in _TICKET_FEATURES} for ticket, features in args.tickets
+        },
+    }
+
+    try:
+        label_type, event_type, event_food, people = prepare_document(args.csv_file, options)
+        if args.snapshot is not None:
+            snapshot = take_snapshot(people)
+            previous_snapshot = load_snapshot(args.snapshot)
+            if previous_snapshot is not None:
+                n_people = len(people)
+                people = diff_people(people, previous_snapshot)
+                print(f'{len(people)} new or changed participants (out of {n_people})', file=sys.stderr)
+        chunks = backend.iter_generate(label_type, event_type, event_food, people, args.start_offset)
+        if args.output != '-':
+            # NB: the whole document is generated before creating the output file (see `write_output()`)
+            chunks = list(chunks)
+    except (MissingFieldError, RuntimeError, OSError) as err:
+        print(f'aluso-labels: error: {err}', file=sys.stderr)
+        return 1
+    except ValueError as err:
+        parser.error(str(err))
+    finally:
+        if args.csv_file is not sys.stdin.buffer:
+            args.csv_file.close()
+
+    try:
+        write_output(args.output, chunks, binary=backend.binary)
+    except OSError as err:
+        print(f'aluso-labels: error: {err}', file=sys.stderr)
+        return 1
+
+    # NB: the snapshot is only updated once the labels were successfully generated
+    if args.snapshot is not None:
+        save_snapshot(args.snapshot, snapshot)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
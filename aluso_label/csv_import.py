@@ -0,0 +1,188 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""EPFL Alumni CSV import utilities."""
+
+import codecs
+import csv
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from .people import Person
+
+# ==============================================================================
+
+DATA_FIELDS = {
+    'aluso_uid': ['ID user AF'],
+    'first_name': ['Prénom', 'First name'],
+    'last_name': ['Nom de famille', 'Family Name'],
+    'contribution_status': ['Cotisant', 'Contributeur', 'Contributor'],
+    'ticket_name': ['Nom du billet', 'Ticket name'],
+}
+
+_CHUNK_SIZE = 64 * 1024
+_SAMPLE_SIZE = 64 * 1024
+_BOMS = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'))
+_FALLBACK_ENCODINGS = {'utf-8': 'cp1252', 'cp1252': 'latin-1'}
+
+# ==============================================================================
+
+
+class MissingFieldError(ValueError):
+    """Exception raised when a required field cannot be found within the CSV header."""
+
+    def __init__(self, field: str, options: list[str]):
+        """Initialize a missing field exception.
+
+        Args:
+            field (str): Name of the missing field
+            options (list[str]): Column names that were tried for that field
+        """
+        self.field = field
+        self.options = options
+        str_options = [f'"{option}"' for option in options]
+        super().__init__(f'Unable to parse CSV data for field {field} (tried {", ".join(str_options)})')
+
+
+# ==============================================================================
+
+
+def detect_encoding(sample: bytes) -> tuple[str, int]:
+    """Guess the encoding of some CSV data based on a sample of its first bytes.
+
+    The detection first looks for a byte order mark (BOM), then checks whether the sample is valid UTF-8 and otherwise
+    falls back to cp1252 (Windows-generated CSV files) or latin-1 if the sample contains bytes undefined in cp1252.
+
+    Args:
+        sample (bytes): First bytes of the data
+
+    Returns:
+        Tuple with the name of the encoding and the length of the BOM (if any)
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+
+    try:
+        # NB: not final since the sample might end in the middle of a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+    except UnicodeDecodeError:
+        pass
+    else:
+        return 'utf-8', 0
+
+    try:
+        sample.decode('cp1252')
+    except UnicodeDecodeError:
+        return 'latin-1', 0
+    return 'cp1252', 0
+
+
+def iter_decoded_lines(
+    stream: BinaryIO, chunk_size: int = _CHUNK_SIZE, sample_size: int = _SAMPLE_SIZE
+) -> Iterator[str]:
+    """Decode a binary stream chunk by chunk and yield its lines (including line terminators).
+
+    The encoding is guessed from the first `sample_size` bytes of the stream (see `detect_encoding()`). If some data
+    cannot be decoded further down the stream, decoding continues from that point onwards using a fallback encoding
+    (UTF-8 -> cp1252 -> latin-1) without having to read the stream a second time.
+
+    Args:
+        stream (BinaryIO): Binary input stream
+        chunk_size (int): Number of bytes read from the stream at once
+        sample_size (int): Number of bytes used to detect the encoding of the stream
+    """
+    sample = stream.read(sample_size)
+    encoding, bom_length = detect_encoding(sample)
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    chunk = sample[bom_length:]
+    final = not sample
+    pending = ''
+    while True:
+        text = ''
+        data = chunk
+        while True:
+            try:
+                text += decoder.decode(data, final=final)
+                break
+            except UnicodeDecodeError as err:
+                # NB: error positions are relative to the data seen by the decoder (ie. including any buffered bytes)
+                data = decoder.getstate()[0] + data
+                text += data[: err.start].decode(encoding)
+                data = data[err.start :]
+                encoding = _FALLBACK_ENCODINGS.get(encoding, 'latin-1')
+                decoder = codecs.getincrementaldecoder(encoding)()
+
+        lines = (pending + text).splitlines(keepends=True)
+        pending = ''
+        # NB: keep incomplete lines (or lines ending with '\r' that might be followed by '\n') for the next chunk
+        if not final and lines and (lines[-1].endswith('\r') or lines[-1].splitlines() == [lines[-1]]):
+            pending = lines.pop()
+        yield from lines
+
+        if final:
+            return
+        chunk = stream.read(chunk_size)
+        final = not chunk
+
+
+def read_people(stream: BinaryIO) -> Iterator[Person]:
+    """Read an EPFL Alumni CSV file and yield its participants one by one.
+
+    The column of each field in `DATA_FIELDS` is resolved once from the CSV header. Rows with an empty ticket name are
+    skipped.
+
+    Args:
+        stream (BinaryIO): Binary input stream with the CSV data
+
+    Raises:
+        MissingFieldError: if a required field cannot be found within the CSV header
+    """
+    reader = csv.reader(iter_decoded_lines(stream), skipinitialspace=True)
+    # NB: in case of duplicated column names, the last one wins (same as csv.DictReader)
+    header = {name: idx for idx, name in enumerate(next(reader, []))}
+
+    columns = {}
+    for field, options in DATA_FIELDS.items():
+        for option in options:
+            if option in header:
+                columns[field] = header[option]
+                break
+        else:
+            raise MissingFieldError(field, options)
+
+    uid_col, first_name_col, last_name_col, status_col, ticket_col = (columns[field] for field in DATA_FIELDS)
+    n_columns = max(columns.values()) + 1
+
+    for values in reader:
+        if not values:
+            continue
+        row = values + [''] * (n_columns - len(values))
+
+        ticket_name = row[ticket_col].strip()
+        if not ticket_name:
+            # There are sometimes some double entries with identical data except empty ticket name
+            continue
+
+        contribution_status = row[status_col].strip()
+        yield Person(
+            row[uid_col].strip(),
+            row[first_name_col].strip(),
+            row[last_name_col].strip(),
+            bool(contribution_status),
+            contribution_status in ('Oui', 'Yes'),
+            ticket_name,
+        )
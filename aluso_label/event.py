@@ -15,7 +15,15 @@
 
 """Event related definitions."""
 
+from __future__ import annotations
+
 import enum
+import functools
+import re
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .people import EventParticipation
 
 
 class EventFood(enum.Enum):
@@ -35,3 +43,128 @@ class EventType(enum.Enum):
     NETWORKING = enum.auto()
     MEAL_ONLY = enum.auto()
     OTHER = enum.auto()
+
+
+# ==============================================================================
+
+
+class TicketRule(NamedTuple):
+    """A rule to guess the options of a ticket from its name.
+
+    Attributes:
+        name: Name of the rule
+        pattern: Regular expression searched (case-insensitively) within the ticket names
+        participation: Participation type of the tickets matching the rule
+        food: Type of food provided at the event if a ticket matches the rule
+    """
+
+    name: str
+    pattern: str
+    participation: EventParticipation
+    food: EventFood
+
+
+class TicketGuess(NamedTuple):
+    """Options of a ticket guessed from its name."""
+
+    participation: EventParticipation
+    food: EventFood
+    rule: str | None = None
+
+
+_DEFAULT_GUESS = TicketGuess(EventParticipation.VISIT, EventFood.NOTHING)
+
+# NB: the rules are tried in order, the first one that matches wins
+DEFAULT_TICKET_RULES = (
+    TicketRule(
+        'meal',
+        r'(avec|with)\s+(repas|souper|d[iî]ner|meal|lunch|dinner)',
+        EventParticipation.VISIT | EventParticipation.POST_VISIT,
+        EventFood.MEAL,
+    ),
+    TicketRule(
+        'apero', r'(avec|with)\s+ap[eé]ro', EventParticipation.VISIT | EventParticipation.POST_VISIT, EventFood.APERO
+    ),
+    TicketRule('visit_only', r'visite?\s+(seule|uniquement|only)', EventParticipation.VISIT, EventFood.NOTHING),
+)
+
+
+class TicketClassifier:
+    """Guess the options of tickets from their names using a table of rules.
+
+    The patterns of the rules are compiled once and the results are memoized for each ticket name.
+
+    NB: combining all the patterns into a single regular expression (with one lookahead per rule to keep their priority)
+        was measured to be slower than trying each compiled pattern in turn with the backtracking engine of `re`.
+    """
+
+    def __init__(self, rules: Iterable[TicketRule] = DEFAULT_TICKET_RULES, cache_size: int = 4096):
+        """Initialize a ticket classifier.
+
+        Args:
+            rules (Iterable[TicketRule]): Rules to apply (in order of priority)
+            cache_size (int): Maximum number of ticket names whose result is memoized
+
+        Raises:
+            ValueError: if the pattern of a rule cannot be compiled
+        """
+        try:
+            self._rules = [
+                (re.compile(rule.pattern, re.IGNORECASE), TicketGuess(rule.participation, rule.food, rule.name))
+                for rule in rules
+            ]
+        except re.error as err:
+            raise ValueError(f'Invalid ticket rule pattern: {err}') from err
+        self._classify_cached = functools.lru_cache(maxsize=cache_size)(self._classify)
+
+    def classify(self, ticket_name: str) -> TicketGuess:
+        """Guess the options of a ticket from its name (tickets not matching any rule only include the visit)."""
+        return self._classify_cached(ticket_name)
+
+    def cache_info(self) -> functools._CacheInfo:
+        """Hit/miss statistics of the memoized results (see `functools.lru_cache`)."""
+        return self._classify_cached.cache_info()
+
+    def _classify(self, ticket_name: str) -> TicketGuess:
+        """Guess the options of a ticket from its name (without memoization)."""
+        for regex, guess in self._rules:
+            if regex.search(ticket_name):
+                return guess
+        return _DEFAULT_GUESS
+
+    def guess_ticket_options(self, ticket_names: Iterable[str]) -> tuple[list[bool], EventFood]:
+        """Guess the ticket options and the type of food at the event based on the ticket names.
+
+        Returns:
+            Tuple with a list of flags indicating whether each ticket includes the meal/apéro and the guessed type of
+            food provided at the event (ie. the one of the first ticket that provides some food).
+        """
+        post_visit = []
+        event_food = EventFood.NOTHING
+        for name in ticket_names:
+            guess = self.classify(name)
+            post_visit.append(EventParticipation.POST_VISIT in guess.participation)
+            if event_food == EventFood.NOTHING:
+                event_food = guess.food
+        return post_visit, event_food
+
+
+DEFAULT_TICKET_CLASSIFIER = TicketClassifier()
+
+
+def guess_ticket_options(ticket_names: list[str]) -> tuple[list[bool], EventFood]:
+    """Guess the ticket options and the type of food at the event based on the ticket names.
+
+    See `TicketClassifier.guess_ticket_options()` (using the default rules).
+    """
+    return DEFAULT_TICKET_CLASSIFIER.guess_ticket_options(ticket_names)
+
+
+# NB: characters replaced to turn a ticket name into an HTML identifier (same as `re.sub(r'[ -/\{}]', '_', ...)`)
+_TICKET_ID_TABLE = str.maketrans(dict.fromkeys([*map(chr, range(ord(' '), ord('/') + 1)), '{', '}'], '_'))
+
+
+@functools.lru_cache(maxsize=4096)
+def get_ticket_id(ticket_name: str) -> str:
+    """Convert a ticket name into an identifier usable within HTML forms."""
+    return ticket_name.lower().translate(_TICKET_ID_TABLE)
@@ -0,0 +1,421 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Vector icons for label documents.
+
+The icons are direct translations of the TikZ pictures used in the LaTeX documents (see `LatexDocument`), which can be
+rendered either as PDF drawing operators or as SVG images. All coordinates below are expressed in the same units as in
+the TikZ code, so that both can easily be compared.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import NamedTuple
+
+from aluso_label.event import EventFood, EventType
+
+# ==============================================================================
+
+CM = 72 / 2.54
+MM = CM / 10
+
+_LINE_WIDTH = 0.4  # TikZ default line width (in pt)
+_BEZIER_MAX_ANGLE = 90
+
+BLACK = (0, 0, 0)
+WHITE = (1, 1, 1)
+EPFL_RED = (1, 0, 0)
+
+_SVG_COMMANDS = {'m': 'M', 'l': 'L', 'c': 'C', 'h': 'Z'}
+
+# ==============================================================================
+
+
+class PaintedPath(NamedTuple):
+    """A path together with the way it is painted.
+
+    The segments are tuples of a PDF path construction operator ('m', 'l', 'c' or 'h') and its coordinates (in points).
+    """
+
+    segments: tuple[tuple[str, tuple[float, ...]], ...]
+    stroke: bool = True
+    fill: tuple[float, float, float] | None = None
+
+
+class Icon(NamedTuple):
+    """A vector icon.
+
+    The coordinates are expressed in points, relative to the origin of the TikZ picture. The bounding box (in points as
+    well) determines the size of the icon on the labels.
+    """
+
+    paths: tuple[PaintedPath, ...]
+    color: tuple[float, float, float]
+    x_min: float
+    y_min: float
+    x_max: float
+    y_max: float
+
+    @property
+    def width(self) -> float:
+        """Width of the icon (in points)."""
+        return self.x_max - self.x_min
+
+    @property
+    def height(self) -> float:
+        """Height of the icon (in points)."""
+        return self.y_max - self.y_min
+
+    def to_pdf(self) -> str:
+        """Generate the PDF drawing operators for the icon."""
+        color = ' '.join(f'{value:g}' for value in self.color)
+        content = [f'{color} RG {_LINE_WIDTH} w']
+        for path in self.paths:
+            content.extend(
+                ' '.join([*(f'{value:.3f}' for value in coordinates), operator])
+                for operator, coordinates in path.segments
+            )
+            if path.fill is None:
+                content.append('S')
+            else:
+                content.append(' '.join(f'{value:g}' for value in path.fill) + (' rg B' if path.stroke else ' rg f'))
+        return '\n'.join(content)
+
+    def to_svg(self) -> str:
+        """Generate a standalone SVG image of the icon (with its natural size)."""
+
+        def svg_color(color: tuple[float, float, float]) -> str:
+            return '#' + ''.join(f'{round(255 * value):02x}' for value in color)
+
+        # NB: the y axis of SVG images points downwards
+        elements = []
+        for path in self.paths:
+            data = ' '.join(
+                ' '.join(
+                    [_SVG_COMMANDS[operator]]
+                    + [f'{value if i % 2 == 0 else -value:.3f}' for i, value in enumerate(coordinates)]
+                )
+                for operator, coordinates in path.segments
+            )
+            fill = 'none' if path.fill is None else svg_color(path.fill)
+            stroke = svg_color(self.color) if path.stroke else 'none'
+            elements.append(f'<path d="{data}" fill="{fill}" stroke="{stroke}" stroke-width="{_LINE_WIDTH}"/>')
+
+        # NB: the view box is slightly enlarged to avoid clipping the lines at the edges of the icons
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width:.3f}pt" height="{self.height:.3f}pt" '
+            f'viewBox="{self.x_min:.3f} {-self.y_max:.3f} {self.width:.3f} {self.height:.3f}" overflow="visible">'
+            + ''.join(elements)
+            + '</svg>'
+        )
+
+
+class _Path:
+    """Minimal equivalent of a TikZ path."""
+
+    def __init__(self, unit: float):
+        self._unit = unit
+        self._segments: list[tuple[str, tuple[float, ...]]] = []
+        self._points: list[tuple[float, float]] = []
+        self._current = (0.0, 0.0)
+
+    def _add(self, operator: str, *points: tuple[float, float]):
+        coordinates = []
+        for x, y in points:
+            self._points.append((x * self._unit, y * self._unit))
+            coordinates.extend((x * self._unit, y * self._unit))
+        self._segments.append((operator, tuple(coordinates)))
+        self._current = points[-1]
+
+    def move_to(self, x: float, y: float) -> _Path:
+        """Start a new subpath (TikZ: `(x, y)`)."""
+        self._add('m', (x, y))
+        return self
+
+    def line_to(self, x: float, y: float) -> _Path:
+        """Draw a straight line (TikZ: `-- (x, y)`)."""
+        self._add('l', (x, y))
+        return self
+
+    def line(self, *points: tuple[float, float]) -> _Path:
+        """Draw a polyline (TikZ: `(x0, y0) -- (x1, y1) -- ...`)."""
+        self.move_to(*points[0])
+        for point in points[1:]:
+            self.line_to(*point)
+        return self
+
+    def curve_to(self, control1: tuple[float, float], control2: tuple[float, float], end: tuple[float, float]) -> _Path:
+        """Draw a cubic Bézier curve (TikZ: `.. controls c1 and c2 .. end`)."""
+        self._add('c', control1, control2, end)
+        return self
+
+    def to(self, out_angle: float, in_angle: float, x: float, y: float) -> _Path:
+        """Draw a curve with given start and end angles (TikZ: `to[out=..., in=...] (x, y)`)."""
+        x0, y0 = self._current
+        distance = 0.3915 * math.hypot(x - x0, y - y0)  # TikZ default looseness
+        out_angle, in_angle = math.radians(out_angle), math.radians(in_angle)
+        return self.curve_to(
+            (x0 + distance * math.cos(out_angle), y0 + distance * math.sin(out_angle)),
+            (x + distance * math.cos(in_angle), y + distance * math.sin(in_angle)),
+            (x, y),
+        )
+
+    def arc(self, start: float, end: float, radius: float) -> _Path:
+        """Draw an arc starting at the current point (TikZ: `arc (start:end:radius)`)."""
+        x0, y0 = self._current
+        center_x = x0 - radius * math.cos(math.radians(start))
+        center_y = y0 - radius * math.sin(math.radians(start))
+
+        n_segments = max(1, math.ceil(abs(end - start) / _BEZIER_MAX_ANGLE))
+        step = math.radians(end - start) / n_segments
+        factor = 4 / 3 * math.tan(step / 4) * radius
+        angle = math.radians(start)
+        for _ in range(n_segments):
+            cos0, sin0 = math.cos(angle), math.sin(angle)
+            cos1, sin1 = math.cos(angle + step), math.sin(angle + step)
+            self.curve_to(
+                (center_x + radius * cos0 - factor * sin0, center_y + radius * sin0 + factor * cos0),
+                (center_x + radius * cos1 + factor * sin1, center_y + radius * sin1 - factor * cos1),
+                (center_x + radius * cos1, center_y + radius * sin1),
+            )
+            angle += step
+        return self
+
+    def circle(self, x: float, y: float, radius: float) -> _Path:
+        """Draw a full circle (TikZ: `(x, y) circle (radius)`)."""
+        self.move_to(x + radius, y).arc(0, 360, radius)
+        self._segments.append(('h', ()))
+        self._current = (x, y)
+        return self
+
+    def rectangle(self, x0: float, y0: float, x1: float, y1: float) -> _Path:
+        """Draw a rectangle (TikZ: `(x0, y0) rectangle (x1, y1)`).
+
+        NB: rectangles are always drawn counter-clockwise so that overlapping filled shapes do not cancel each other.
+        """
+        x0, x1 = sorted((x0, x1))
+        y0, y1 = sorted((y0, y1))
+        self.line((x0, y0), (x1, y0), (x1, y1), (x0, y1))
+        return self.close()
+
+    def polar_plot(
+        self, x: float, y: float, function: Callable[[float], tuple[float, float]], domain: float, samples: int = 100
+    ) -> _Path:
+        """Draw a plot in polar coordinates (TikZ: `plot ({angle r}: {radius})` with `shift={(x, y)}`)."""
+        points = []
+        for i in range(samples):
+            angle, radius = function(domain * i / (samples - 1))
+            points.append((x + radius * math.cos(angle), y + radius * math.sin(angle)))
+        return self.line(*points)
+
+    def close(self) -> _Path:
+        """Close the current subpath (TikZ: `-- cycle`)."""
+        self._segments.append(('h', ()))
+        return self
+
+    def paint(self, fill: tuple[float, float, float] | None = None, stroke: bool = True) -> PaintedPath:
+        r"""Paint the path (TikZ: `\draw`, `\fill` or `\filldraw`) and start a new one."""
+        path = PaintedPath(tuple(self._segments), stroke, fill)
+        self._segments = []
+        return path
+
+    @property
+    def points(self) -> list[tuple[float, float]]:
+        """All the points (including Bézier control points) of the path (in points)."""
+        return self._points
+
+
+def _make_icon(path: _Path, paths: list[PaintedPath], color: tuple[float, float, float] = BLACK) -> Icon:
+    """Create an icon from a path and its painted parts.
+
+    NB: similarly to TikZ, the bounding box includes the Bézier control points but not the line width.
+    """
+    xs = [x for x, _ in path.points]
+    ys = [y for _, y in path.points]
+    return Icon(tuple(paths), color, min(xs), min(ys), max(xs), max(ys))
+
+
+# ==============================================================================
+# Event icons
+
+
+def _icon_apero() -> Icon:
+    path = _Path(0.02 * CM)
+    content = [
+        path.circle(7.5, 10, 4).paint(),
+        path.line((0, 0), (-7.5, 10), (7.5, 10)).close().paint(fill=WHITE),
+        path.line((0, 0), (-5.1, 6.8), (5.1, 6.8)).close().line((0, 0), (0, -8.5), (-4, -8.5), (4, -8.5)).paint(),
+    ]
+    return _make_icon(path, content)
+
+
+def _icon_company_visit() -> Icon:
+    path = _Path(0.044 * CM)
+    for y in range(8):
+        path.line((0, y + 3), (4, y * 1.5))
+        path.line((8, y + 3), (4, y * 1.5))
+    path.line((4, 0), (4, 12)).line((0, 3), (0, 10)).line((8, 3), (8, 10))
+    path.line((2, 10.25), (2, 11.25), (4, 12), (6, 11.25), (6, 10.25))
+    return _make_icon(path, [path.paint()])
+
+
+def _mask(path: _Path, x: float, y: float):
+    """Outline of a theatre mask (without the mouth)."""
+    path.line((x, y + 6), (x, y + 8)).line((x + 5, y + 6), (x + 5, y + 8))
+    path.move_to(x, y + 6).arc(180, 253, 3.5)
+    path.move_to(x + 5, y + 6).arc(180, 106, -3.5)
+    path.move_to(x, y + 8).arc(115, 65, 5.9)
+    path.line((x + 1, y + 7), (x + 2, y + 7)).line((x + 4, y + 7), (x + 3, y + 7))
+
+
+def _icon_cultural_visit() -> Icon:
+    path = _Path(0.06 * CM)
+    _mask(path, 2.5, -2)
+    path.move_to(3.75, 2.5).arc(310, 230, -2)
+    content = [path.paint()]
+
+    path.move_to(5, 6).arc(180, 106, -3.5).line_to(2, 6).line_to(5, 8).close()
+    content.append(path.paint(fill=WHITE, stroke=False))
+
+    _mask(path, 0, 0)
+    path.move_to(1.25, 5).arc(230, 310, 2)
+    content.append(path.paint())
+    return _make_icon(path, content)
+
+
+def _icon_meal() -> Icon:
+    path = _Path(0.0048 * CM)
+    path.line((0, -35), (0, 0), (56, 0), (56, -35)).arc(0, -90, 24).line_to(32, -79).arc(-180, -90, 15).line_to(52, -94)
+    path.move_to(0, -35).arc(180, 270, 24).line_to(24, -79).arc(0, -90, 15).line_to(4, -94)
+    path.line((68, 0), (68, -26)).line((80, 0), (80, -26))
+    path.line((92, 0), (92, -30)).arc(0, -90, 12).line_to(80, -94)
+    return _make_icon(path, [path.paint()])
+
+
+def _icon_networking() -> Icon:
+    path = _Path(0.0125 * CM)
+    path.move_to(0, 5).arc(160, 20, 7)
+    path.circle(6.656, 13.6, 4)  # NB: (0, 5) arc (160:20:7) ++(-6.5, 8.6)
+    path.circle(6.5, 12.5, 10)
+    for angle in range(0, 360, 45):
+        cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+        # NB: the spokes along the diagonals are shorter (ie. ++(2, 2) instead of ++(0, 4))
+        spoke = 4 if angle % 90 == 0 else 2 * math.sqrt(2)
+        path.line((6.5 + 10 * cos, 12.5 + 10 * sin), (6.5 + (10 + spoke) * cos, 12.5 + (10 + spoke) * sin))
+        path.circle(6.5 + (12 + spoke) * cos, 12.5 + (12 + spoke) * sin, 2)
+    return _make_icon(path, [path.paint()])
+
+
+def _icon_tasting() -> Icon:
+    path = _Path(0.065 * CM)
+    path.circle(3, 3, 3)
+    path.move_to(1.5, 4).arc(160, 20, 0.5)
+    path.move_to(3.5, 4).arc(160, 20, 0.5)
+    path.move_to(1.75, 1.75).arc(230, 310, 2)
+    path.to(50, 0, 4.15, 2.55).to(180, 70, 3.3, 1.8).to(250, 50, 3, 1.3)
+    path.move_to(3.2, 1.3).arc(290, 350, 1.1)
+    return _make_icon(path, [path.paint()])
+
+
+# ------------------------------------------------------------------------------
+# Membership icons
+
+
+def _icon_committee() -> Icon:
+    path = _Path(0.01 * CM)
+    for x in (10, 30, 50):
+        path.move_to(x, 0).arc(180, 0, 10)
+        path.circle(x + 10, 15, 5)
+    path.rectangle(0, 0, 80, -10)
+    path.line((10, -11), (10, -30), (70, -30), (70, -11))
+    return _make_icon(path, [path.paint()], color=EPFL_RED)
+
+
+def _icon_contributor() -> Icon:
+    path = _Path(0.2 * MM)
+    path.line((0, 0), (0, 9)).line((2.6, 9), (2.6, 0)).line((-2.6, 9), (-2.6, 0))
+    path.line((-5.2, 0), (-5.2, 18)).line((5.2, 0), (5.2, 18))
+    path.line((-5.2, 11), (5.2, 11)).line((-5.2, 13.7), (5.2, 13.7))
+
+    domain = math.pi * 91 / 180 + 2 * math.pi
+    path.polar_plot(7.07, 18.3, lambda t: (t, 4.5 * t / domain), domain)
+    path.polar_plot(-7.07, 18.3, lambda t: (-t, -4.5 * t / domain), domain)
+    path.line((-7.05, 22.8), (7.05, 22.8))
+    return _make_icon(path, [path.paint()])
+
+
+def _member_outline(path: _Path):
+    path.move_to(0, 5).arc(180, 0, 7)
+    path.circle(7, 16, 4)
+    path.line((0, 5), (0, 0), (14, 0), (14, 5))
+
+
+def _icon_external() -> Icon:
+    path = _Path(0.02 * CM)
+    _member_outline(path)
+    content = [path.paint()]
+
+    path.circle(14, 3, 3)
+    path.line((12.5, 3), (15.5, 3)).line((14, 1.5), (14, 4.5))
+    content.append(path.paint(fill=WHITE))
+    return _make_icon(path, content)
+
+
+def _icon_member() -> Icon:
+    path = _Path(0.02 * CM)
+    _member_outline(path)
+    return _make_icon(path, [path.paint()])
+
+
+def _epfl_logo() -> Icon:
+    path = _Path(0.1 * CM)
+    # E
+    path.rectangle(0, 3.15, 1.167, 5.3).rectangle(1.167, 5.3, 3.817, 4.3)
+    path.rectangle(1.167, 2.15, 3.667, 3.15)
+    path.rectangle(3.817, 1, 0, 0).rectangle(0, 0, 1.167, 2.15)
+    # P
+    path.rectangle(4.8, 0, 5.967, 5.3).rectangle(5.967, 5.3, 7.517, 4.3)
+    path.rectangle(5.967, 2.15, 7.517, 3.15)
+    path.move_to(7.425, 2.15).arc(-90, 90, 1.575).line_to(7.425, 4.3).arc(90, -90, 0.575).line_to(7.425, 2.15).close()
+    # F
+    path.rectangle(9.75, 0, 10.917, 2.15).rectangle(10.917, 2.15, 13.367, 3.15)
+    path.rectangle(9.75, 3.15, 10.917, 5.3).rectangle(10.917, 5.3, 13.617, 4.3)
+    # L
+    path.rectangle(14.4, 5.3, 15.567, 0).rectangle(15.567, 0, 18.217, 1)
+    return _make_icon(path, [path.paint(fill=EPFL_RED, stroke=False)], color=EPFL_RED)
+
+
+# ==============================================================================
+
+EPFL_LOGO = _epfl_logo()
+
+ICON_COMMITTEE = _icon_committee()
+ICON_CONTRIBUTOR = _icon_contributor()
+ICON_EXTERNAL = _icon_external()
+ICON_MEMBER = _icon_member()
+
+EVENT_TYPE_ICONS = {
+    EventType.COMPANY_VISIT: _icon_company_visit(),
+    EventType.CULTURAL_VISIT: _icon_cultural_visit(),
+    EventType.TASTING: _icon_tasting(),
+    EventType.NETWORKING: _icon_networking(),
+}
+
+EVENT_FOOD_ICONS = {
+    EventFood.APERO: _icon_apero(),
+    EventFood.MEAL: _icon_meal(),
+}
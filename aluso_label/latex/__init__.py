@@ -16,16 +16,33 @@
 
 """LaTeX utilities."""
 
+from collections.abc import Iterable, Iterator
+
 from aluso_label.event import EventFood, EventType
 from aluso_label.people import Person
 
 from .label_properties import LABEL_PROPERTIES, Label, LabelProperties  # noqa: F401
-from .latex_document import LatexDocument
+from .latex_document import (  # noqa: F401
+    LatexDocument,
+    LatexPage,
+    escape_latex,
+    find_overflowing_names,
+    person_cache_info,
+    set_person_cache_size,
+)
 
 
 def generate_latex_document(
-    label_type: Label, event_type: EventType, event_food: EventFood, people: list[Person]
-) -> LatexDocument:
-    """Generate a LaTeX document."""
-    document = LatexDocument(label_type, event_type, event_food)
+    label_type: Label, event_type: EventType, event_food: EventFood, people: Iterable[Person], cache_icons: bool = False
+) -> str:
+    """Generate a LaTeX document (see `LatexDocument` for `cache_icons`)."""
+    document = LatexDocument(label_type, event_type, event_food, cache_icons)
     return document.generate(people)
+
+
+def iter_latex_document(
+    label_type: Label, event_type: EventType, event_food: EventFood, people: Iterable[Person], cache_icons: bool = False
+) -> Iterator[str]:
+    """Generate a LaTeX document as a stream of text chunks (see `LatexDocument` for `cache_icons`)."""
+    document = LatexDocument(label_type, event_type, event_food, cache_icons)
+    return document.iter_generate(people)
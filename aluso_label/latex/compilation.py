@@ -0,0 +1,503 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Local compilation of LaTeX documents into PDF files.
+
+Documents can either be compiled as a whole or page by page (see `LatexDocument.iter_pages()`), in which case the pages
+are cached individually and merged into a single PDF file. After an edit of the list of participants, only the pages
+that actually changed then need to be compiled again.
+"""
+
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import dataclasses
+import enum
+import hashlib
+import os
+import re
+import secrets
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+# ==============================================================================
+
+DEFAULT_ENGINE_COMMAND = ('xelatex', '-no-shell-escape', '-interaction=nonstopmode', '-halt-on-error')
+DEFAULT_MERGE_COMMAND = ('pdfunite',)
+DEFAULT_MAX_PENDING = 256
+DEFAULT_CACHE_MAX_SIZE = 1 << 30
+DEFAULT_CACHE_TTL = 7 * 24 * 3600
+
+# NB: paranoid mode of Kpathsea, ie. TeX files may not read or write files outside of the working directory (or
+#     hidden files) except for the ones found in the TeX distribution
+_ENGINE_ENVIRONMENT = {'openin_any': 'p', 'openout_any': 'p'}
+_JOB_ID_RE = re.compile(r'[0-9a-f]{64}')
+_CACHE_SUFFIXES = ('.pdf', '.tex', '.pages')
+_MAX_FAILED_JOBS = 256
+_EVICTION_INTERVAL = 60
+
+# ==============================================================================
+
+
+class CompilationError(RuntimeError):
+    """Exception raised when a LaTeX document fails to compile."""
+
+
+class QueueFullError(RuntimeError):
+    """Exception raised when too many compilation jobs are already pending."""
+
+
+class CommandEngine:
+    """TeX engine run as an external command (XeLaTeX by default)."""
+
+    def __init__(self, command: str | list[str] | tuple[str, ...] = DEFAULT_ENGINE_COMMAND, timeout: float = 300):
+        """Initialize a TeX engine.
+
+        Args:
+            command (str | list[str]): Command to run (the name of the .tex file is appended to it)
+            timeout (float): Maximum time in seconds allowed for a compilation
+
+        NB: the command is run with Kpathsea in paranoid mode (`openin_any=p`, `openout_any=p`), so that compiled
+            documents cannot read or write arbitrary files on the server.
+        """
+        self._command = shlex.split(command) if isinstance(command, str) else list(command)
+        self._timeout = timeout
+
+    def __call__(self, tex_path: Path) -> Path:
+        """Compile a LaTeX file and return the path to the generated PDF file.
+
+        Raises:
+            CompilationError: if the compilation fails
+        """
+        try:
+            result = subprocess.run(
+                [*self._command, tex_path.name],
+                cwd=tex_path.parent,
+                env={**os.environ, **_ENGINE_ENVIRONMENT},
+                capture_output=True,
+                timeout=self._timeout,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired) as err:
+            raise CompilationError(f'Unable to run TeX engine: {err}') from err
+
+        pdf_path = tex_path.with_suffix('.pdf')
+        if result.returncode != 0 or not pdf_path.exists():
+            log = result.stdout.decode('utf-8', errors='replace').splitlines()
+            raise CompilationError('\n'.join(log[-20:]))
+        return pdf_path
+
+
+class CommandMerger:
+    """PDF merger run as an external command (`pdfunite` from Poppler by default)."""
+
+    def __init__(self, command: str | list[str] | tuple[str, ...] = DEFAULT_MERGE_COMMAND, timeout: float = 60):
+        """Initialize a PDF merger.
+
+        Args:
+            command (str | list[str]): Command to run (the input files followed by the output file are appended to it)
+            timeout (float): Maximum time in seconds allowed for merging the files
+        """
+        self._command = shlex.split(command) if isinstance(command, str) else list(command)
+        self._timeout = timeout
+
+    def __call__(self, pdf_paths: list[Path], output_path: Path):
+        """Merge some PDF files into a single one.
+
+        Raises:
+            CompilationError: if the files cannot be merged
+        """
+        try:
+            result = subprocess.run(
+                [*self._command, *(str(path) for path in pdf_paths), str(output_path)],
+                capture_output=True,
+                timeout=self._timeout,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired) as err:
+            raise CompilationError(f'Unable to run PDF merger: {err}') from err
+
+        if result.returncode != 0 or not output_path.exists():
+            raise CompilationError(
+                result.stderr.decode('utf-8', errors='replace').strip() or 'Unable to merge PDF files'
+            )
+
+
+# ==============================================================================
+
+
+class JobStatus(enum.Enum):
+    """Status of a compilation job."""
+
+    PENDING = enum.auto()
+    RUNNING = enum.auto()
+    DONE = enum.auto()
+    FAILED = enum.auto()
+
+
+@dataclasses.dataclass(frozen=True)
+class QueueLimits:
+    """Limits of a compilation queue.
+
+    Attributes:
+        max_pending (int): Maximum number of pending or running jobs, further submissions are rejected
+        cache_max_size (int): Maximum total size in bytes of the files in the cache directory
+        cache_ttl (float): Time in seconds after which unused files are removed from the cache directory
+    """
+
+    max_pending: int = DEFAULT_MAX_PENDING
+    cache_max_size: int = DEFAULT_CACHE_MAX_SIZE
+    cache_ttl: float = DEFAULT_CACHE_TTL
+
+
+@dataclasses.dataclass
+class CompilationJob:
+    """A compilation job."""
+
+    job_id: str
+    status: JobStatus
+    error: str = ''
+
+
+class CompilationQueue:
+    """Queue of compilation jobs processed by a bounded pool of workers.
+
+    Jobs are identified by the SHA-256 hash of the LaTeX code to compile and the generated PDF files are cached on disk
+    using that same hash, so that identical documents are only ever compiled once.
+
+    Documents split into pages are first registered (see `register_pages()`), which stores the LaTeX code of each page
+    along with a list of the page hashes. Such a document is identified by the SHA-256 hash of that list, which is also
+    the ID of the job merging its pages. Documents can also be registered in the background under a random ID (see
+    `register_pages_in_background()`).
+
+    The number of pending jobs is bounded and so is the cache directory: the files that were not used for some time are
+    removed, followed by the least recently used ones if the cache is still too large. Failed jobs are only kept in
+    memory until `_MAX_FAILED_JOBS` newer jobs failed.
+    """
+
+    def __init__(
+        self,
+        engine: Callable[[Path], Path],
+        cache_dir: str | Path,
+        max_workers: int = 2,
+        merger: Callable[[list[Path], Path], None] | None = None,
+        limits: QueueLimits | None = None,
+    ):
+        """Initialize a compilation queue.
+
+        Args:
+            engine (Callable[[Path], Path]): TeX engine (takes the path to a .tex file and returns the path to the PDF)
+            cache_dir (str | Path): Directory where the PDF files are stored
+            max_workers (int): Maximum number of concurrent compilations
+            merger (Callable[[list[Path], Path], None]): PDF merger for documents compiled page by page (takes the
+                paths to the PDF files of the pages and the path to the output file)
+            limits (QueueLimits): Limits of the queue and of its cache directory (defaults if None)
+        """
+        self._engine = engine
+        self._merger = merger if merger is not None else CommandMerger()
+        self._cache_dir = Path(cache_dir)
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._registration_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._registrations: dict[str, concurrent.futures.Future] = {}
+        self._limits = limits if limits is not None else QueueLimits()
+        self._jobs: dict[str, CompilationJob] = {}
+        self._futures: dict[str, concurrent.futures.Future] = {}
+        self._failed_jobs: collections.deque[CompilationJob] = collections.deque()
+        self._lock = threading.Lock()
+        self._last_eviction = 0.0
+
+    def pdf_path(self, job_id: str) -> Path:
+        """Path to the (cached) PDF file of a job."""
+        return self._cache_dir / f'{job_id}.pdf'
+
+    def submit(self, latex_code: str) -> CompilationJob:
+        """Submit some LaTeX code for compilation (returns immediately if the PDF is already cached).
+
+        Raises:
+            QueueFullError: if too many jobs are already pending
+        """
+        data = latex_code.encode('utf-8')
+        job_id = hashlib.sha256(data).hexdigest()
+        self._check_pending(job_id)
+        return self._submit(job_id, self._run, data)
+
+    def register_pages(self, pages: Iterable[str]) -> str:
+        """Register a document split into pages (without compiling it).
+
+        Args:
+            pages (Iterable[str]): LaTeX code of each page (as a standalone LaTeX document)
+
+        Returns:
+            ID of the document to be used with `submit_pages()`
+        """
+        manifest = self._write_pages(pages)
+        document_id = hashlib.sha256(manifest).hexdigest()
+        self._write_manifest(document_id, manifest)
+        return document_id
+
+    def register_pages_in_background(self, pages: Iterable[str]) -> str:
+        """Register a document split into pages in the background (without compiling it).
+
+        The pages are only generated once a worker picks the registration up, so that generating a document does not
+        wait for its pages to be written into the cache directory. If too many registrations are already pending, the
+        document is registered immediately instead.
+
+        Args:
+            pages (Iterable[str]): LaTeX code of each page (as a standalone LaTeX document), only iterated by the worker
+
+        Returns:
+            Random ID of the document to be used with `submit_pages()`
+        """
+        document_id = secrets.token_hex(32)
+        with self._lock:
+            background = len(self._registrations) < self._limits.max_pending
+            if background:
+                future = self._registrations[document_id] = self._registration_executor.submit(
+                    self._register, document_id, pages
+                )
+        if not background:
+            self._register(document_id, pages)
+            return document_id
+
+        future.add_done_callback(lambda _: self._pop_registration(document_id))
+        return document_id
+
+    def submit_pages(self, document_id: str) -> CompilationJob | None:
+        """Submit a document registered with `register_pages()` for compilation.
+
+        Only the pages that are not already cached are compiled, the resulting PDF files are then merged.
+
+        Returns:
+            Compilation job of the whole document (None if no such document was registered)
+
+        Raises:
+            QueueFullError: if too many jobs are already pending
+        """
+        if not _JOB_ID_RE.fullmatch(document_id):
+            return None
+        with self._lock:
+            registration = self._registrations.get(document_id)
+        if registration is not None:
+            concurrent.futures.wait([registration])
+
+        manifest = self._read_file(self._cache_dir / f'{document_id}.pages')
+        if manifest is None:
+            return None
+        page_ids = manifest.decode().split()
+        job_id = hashlib.sha256(manifest).hexdigest()
+        # NB: the limit is only checked once per document, so that a document is never partially queued
+        self._check_pending(job_id)
+
+        page_futures = []
+        for page_id in page_ids:
+            if self._touch(self.pdf_path(page_id)):
+                continue
+            # NB: pages whose LaTeX code was evicted in the meantime are reported as missing by the merge job
+            data = self._read_file(self._cache_dir / f'{page_id}.tex')
+            if data is not None:
+                self._submit(page_id, self._run, data)
+            with self._lock:
+                future = self._futures.get(page_id)
+            if future is not None:
+                page_futures.append(future)
+
+        # NB: the worker pool processes the jobs in order, hence all the pages have already been picked up by some
+        #     worker by the time the merge job starts waiting for them (ie. this cannot dead-lock)
+        return self._submit(job_id, self._merge, page_ids, page_futures)
+
+    def get(self, job_id: str) -> CompilationJob | None:
+        """Retrieve a job (None if no such job exists)."""
+        if not _JOB_ID_RE.fullmatch(job_id):
+            return None
+
+        job = self._jobs.get(job_id)
+        if job is None and self.pdf_path(job_id).exists():
+            # NB: compiled by another process or before a restart
+            job = CompilationJob(job_id, JobStatus.DONE)
+        return job
+
+    def _write_pages(self, pages: Iterable[str]) -> bytes:
+        """Write the LaTeX code of the pages of a document into the cache directory and return its manifest."""
+        page_ids = []
+        for latex_code in pages:
+            data = latex_code.encode('utf-8')
+            page_id = hashlib.sha256(data).hexdigest()
+            page_ids.append(page_id)
+
+            tex_path = self._cache_dir / f'{page_id}.tex'
+            if not self._touch(self.pdf_path(page_id)) and not self._touch(tex_path):
+                self._write_file(tex_path, data)
+        return '\n'.join(page_ids).encode()
+
+    def _write_manifest(self, document_id: str, manifest: bytes):
+        """Write the manifest of a document (ie. the list of its page hashes) into the cache directory."""
+        manifest_path = self._cache_dir / f'{document_id}.pages'
+        if not self._touch(manifest_path):
+            self._write_file(manifest_path, manifest)
+
+    def _register(self, document_id: str, pages: Iterable[str]):
+        """Register a document under a given ID (see `register_pages_in_background()`)."""
+        self._write_manifest(document_id, self._write_pages(pages))
+
+    def _pop_registration(self, document_id: str):
+        """Forget about a finished background registration."""
+        with self._lock:
+            self._registrations.pop(document_id, None)
+
+    def _check_pending(self, job_id: str):
+        """Check that a job can be submitted without exceeding the maximum number of pending jobs."""
+        with self._lock:
+            job = self.get(job_id)
+            if (job is None or job.status == JobStatus.FAILED) and len(self._futures) >= self._limits.max_pending:
+                raise QueueFullError(f'Too many pending compilation jobs (at most {self._limits.max_pending})')
+
+    def _submit(self, job_id: str, task: Callable, *args: object) -> CompilationJob:
+        """Submit a job unless it is already cached, pending or running."""
+        with self._lock:
+            job = self.get(job_id)
+            if job is not None and job.status != JobStatus.FAILED:
+                return job
+
+            job = self._jobs[job_id] = CompilationJob(job_id, JobStatus.PENDING)
+            self._futures[job_id] = self._executor.submit(task, job, *args)
+        return job
+
+    def _run(self, job: CompilationJob, data: bytes):
+        """Compile the LaTeX code of a job."""
+        job.status = JobStatus.RUNNING
+        try:
+            with tempfile.TemporaryDirectory(dir=self._cache_dir) as tmp_dir:
+                tex_path = Path(tmp_dir) / 'labels.tex'
+                tex_path.write_bytes(data)
+                self._engine(tex_path).replace(self.pdf_path(job.job_id))
+        except (OSError, CompilationError) as err:
+            self._finish(job, str(err))
+        else:
+            self._finish(job)
+
+    def _merge(self, job: CompilationJob, page_ids: list[str], page_futures: list[concurrent.futures.Future]):
+        """Merge the PDF files of the pages of a document (once they are all compiled)."""
+        concurrent.futures.wait(page_futures)
+        job.status = JobStatus.RUNNING
+
+        for index, page_id in enumerate(page_ids):
+            if not self.pdf_path(page_id).exists():
+                page_job = self._jobs.get(page_id)
+                error = page_job.error if page_job is not None else 'missing LaTeX code'
+                self._finish(job, f'Page {index + 1}: {error}')
+                return
+
+        try:
+            with tempfile.TemporaryDirectory(dir=self._cache_dir) as tmp_dir:
+                output_path = Path(tmp_dir) / 'labels.pdf'
+                if len(page_ids) == 1:
+                    shutil.copyfile(self.pdf_path(page_ids[0]), output_path)
+                else:
+                    self._merger([self.pdf_path(page_id) for page_id in page_ids], output_path)
+                output_path.replace(self.pdf_path(job.job_id))
+        except (OSError, CompilationError) as err:
+            self._finish(job, str(err))
+        else:
+            self._finish(job)
+
+    def _finish(self, job: CompilationJob, error: str | None = None):
+        """Update the status of a finished job."""
+        with self._lock:
+            self._futures.pop(job.job_id, None)
+            if error is not None:
+                job.error = error
+                job.status = JobStatus.FAILED
+                self._failed_jobs.append(job)
+                if len(self._failed_jobs) > _MAX_FAILED_JOBS:
+                    failed_job = self._failed_jobs.popleft()
+                    # NB: the job might have been submitted again in the meantime
+                    if self._jobs.get(failed_job.job_id) is failed_job:
+                        del self._jobs[failed_job.job_id]
+            else:
+                job.status = JobStatus.DONE
+                # NB: finished jobs are looked up from the cache directory from now on
+                self._jobs.pop(job.job_id, None)
+
+            evict = time.monotonic() - self._last_eviction >= _EVICTION_INTERVAL
+            if evict:
+                self._last_eviction = time.monotonic()
+        if evict:
+            self.evict_cache()
+
+    def evict_cache(self):
+        """Remove the files of the cache directory that were not used recently or exceed the maximum cache size.
+
+        Files are considered used when they are created or looked up from the cache (see `_touch()`).
+        """
+        entries = []
+        for path in self._cache_dir.iterdir():
+            if path.suffix not in _CACHE_SUFFIXES:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # NB: least recently used files first
+        entries.sort()
+        expiry = time.time() - self._limits.cache_ttl
+        total_size = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if mtime >= expiry and total_size <= self._limits.cache_max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+    @staticmethod
+    def _touch(path: Path) -> bool:
+        """Mark a file of the cache directory as used (returns False if it does not exist)."""
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        return True
+
+    @classmethod
+    def _read_file(cls, path: Path) -> bytes | None:
+        """Read a file of the cache directory and mark it as used (returns None if it does not exist).
+
+        NB: the file may be evicted by another thread or process at any time, hence its existence is not checked first.
+        """
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        cls._touch(path)
+        return data
+
+    def _write_file(self, path: Path, data: bytes):
+        """Atomically write a file into the cache directory."""
+        with tempfile.NamedTemporaryFile(dir=self._cache_dir, delete=False) as tmp_file:
+            tmp_file.write(data)
+        Path(tmp_file.name).replace(path)
+
+    def shutdown(self):
+        """Wait for all pending registrations and jobs and stop the workers."""
+        self._registration_executor.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
@@ -33,6 +33,9 @@ class Margin(NamedTuple):
 
 _DEFAULT_LABEL_MARGIN = Margin(5, 5, 5, 5)
 
+# NB: this needs to match the value of \logoWidth within the LaTeX header (in millimeters)
+LOGO_WIDTH = 24
+
 
 class LabelProperties(NamedTuple):
     """Definition of a set of label properties."""
@@ -47,6 +50,25 @@ class LabelProperties(NamedTuple):
     inter_row: float
     label_margin: Margin = _DEFAULT_LABEL_MARGIN
 
+    @property
+    def labels_per_page(self) -> int:
+        """Number of labels on a page."""
+        return self.cols * self.rows
+
+    @property
+    def name_width(self) -> float:
+        """Width available for the names on a label (in millimeters), ie. the printable area minus the logo."""
+        return self.width - self.label_margin.left - self.label_margin.right - LOGO_WIDTH
+
+    def check_start_offset(self, start_offset: int):
+        """Check the number of labels to skip at the beginning of the first page (ie. already used labels).
+
+        Raises:
+            ValueError: if the offset is negative or not smaller than the number of labels on a page
+        """
+        if not 0 <= start_offset < self.labels_per_page:
+            raise ValueError(f'Invalid start offset: {start_offset} (must be less than {self.labels_per_page})')
+
     def __str__(self):
         """Generate the LaTeX code for a given label geometry."""
         return textwrap.dedent(
@@ -15,43 +15,188 @@
 
 """LaTeX utilities."""
 
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import itertools
+import math
+import re
 import textwrap
+import unicodedata
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
 
 from aluso_label.event import EventFood, EventType
+from aluso_label.metrics import get_name_width
 from aluso_label.people import EventParticipation, Person
 
 from .label_properties import LABEL_PROPERTIES, Label
 
 # ==============================================================================
 
+# NB: spaces (including non-breaking and other Unicode spaces) are rendered as thin spaces on the labels
+_SPACES = ' \t\n\r\u00a0\u202f\u205f' + ''.join(map(chr, range(0x2000, 0x200B)))
+_LATEX_ESCAPE_TABLE = str.maketrans(
+    {
+        '\\': r'\textbackslash{}',
+        '&': r'\&',
+        '%': r'\%',
+        '$': r'\$',
+        '#': r'\#',
+        '_': r'\_',
+        '{': r'\{',
+        '}': r'\}',
+        '~': r'\textasciitilde{}',
+        '^': r'\textasciicircum{}',
+        **dict.fromkeys(_SPACES, r'\,'),
+    }
+)
+_LATEX_SPECIAL_CHARS = re.compile('[' + re.escape(''.join(map(chr, _LATEX_ESCAPE_TABLE))) + ']')
 
-def apply_stretch_factor(string: str, ref_length: int, threshold: float = 0.5) -> str:
-    """Modify LaTeX string with a stretch factor if necessary.
 
-    This is mostly useful when handling very long names in order to make sure that the characters on the output label do
-    notgo out of bounds when printing the labels.
+def escape_latex(string: str) -> str:
+    r"""Escape a string so that it can be used as is within LaTeX code.
+
+    The string is first normalized (NFC) so that accented characters are typeset using precomposed glyphs, then all the
+    LaTeX special characters are escaped in a single pass. Spaces are rendered as thin spaces (`\,`).
+
+    NB: `str.translate()` is slower than it looks with multi-character replacements, so it is skipped for the (vast
+        majority of) strings without any special character.
+    """
+    string = unicodedata.normalize('NFC', string)
+    if _LATEX_SPECIAL_CHARS.search(string) is None:
+        return string
+    return string.translate(_LATEX_ESCAPE_TABLE)
+
+
+def get_stretch_factor(name: str, max_width: float, threshold: float = 0.5) -> float:
+    """Compute the horizontal stretch factor required for a name to fit on a label.
+
+    The width of the name is computed from the advance widths of its characters (see `get_name_width()`).
 
     Args:
-        string (str): Input string
-        ref_length (int): Reference length (ie. maximum allowed number of characters)
+        name (str): Input name (unescaped)
+        max_width (float): Width available for the name (in millimeters, see `LabelProperties.name_width`)
         threshold (float): Minimum value for the stretch factor before giving up
+
+    Returns:
+        Stretch factor (1 if the name does not need to be stretched), rounded down to 3 decimals
+
+    Raises:
+        RuntimeError: if the stretch factor would be smaller than the threshold
     """
-    if len(string) > ref_length:
-        stretch = ref_length / len(string)
+    width = get_name_width(name)
+    if width > max_width:
+        stretch = math.floor(max_width / width * 1000) / 1000
         if stretch < threshold:
-            raise RuntimeError(f'Too small stretch factor {stretch} for `{string}` given ref. length {ref_length}')
+            raise RuntimeError(f'Too small stretch factor {stretch} for `{name}` given max. width {max_width}mm')
+        return stretch
+    return 1
+
+
+def apply_stretch_factor(string: str, stretch: float) -> str:
+    """Modify LaTeX string with a stretch factor if necessary.
+
+    This is mostly useful when handling very long names in order to make sure that the characters on the output label do
+    not go out of bounds when printing the labels.
+
+    Args:
+        string (str): Input LaTeX string
+        stretch (float): Horizontal stretch factor (see `get_stretch_factor()`)
+    """
+    if stretch != 1:
         return rf'{{\addfontfeatures{{FakeStretch={stretch}}}{string}}}'
     return string
 
 
-def person_to_latex(person: Person, label_type: Label) -> str:
-    """Serialize a Person into LaTeX."""
-    ref_length = 13
-    if label_type in (Label.AVERY_64X36, Label.AVERY_646X338):
-        ref_length = 12
+def find_overflowing_names(people: Iterable[Person], label_type: Label, threshold: float = 0.5) -> list[str]:
+    """Find the names that cannot fit on a label, even when stretched as much as allowed.
+
+    This is meant to be run on the whole list of people before generating a document, so that all the problematic names
+    are reported at once (instead of failing in the middle of the generation).
+
+    Args:
+        people (Iterable[Person]): List of people
+        label_type (Label): Type of label
+        threshold (float): Minimum value allowed for the stretch factor
+    """
+    min_width = LABEL_PROPERTIES[label_type].name_width / threshold
+    names = list(itertools.chain.from_iterable((person.first_name, person.last_name) for person in people))
+    return [name for name, width in zip(names, map(get_name_width, names)) if width > min_width]
+
+
+class PersonKey(NamedTuple):
+    """Everything from a person that ends up on his/her label (used as the key of the LaTeX code cache)."""
+
+    first_name: str
+    last_name: str
+    is_member: bool
+    is_contributor: bool
+    is_committee: bool
+    participation_type: EventParticipation
+
 
-    first_name = apply_stretch_factor(person.first_name.replace(' ', r'\,'), ref_length)
-    last_name = apply_stretch_factor(person.last_name.replace(' ', r'\,'), ref_length)
+DEFAULT_PERSON_CACHE_SIZE = 4096
+
+
+def get_icon_codes(person: Person | PersonKey) -> tuple[str, str]:
+    """Short codes of the icons of a person when the icons are typeset once per document (see `cache_icons`).
+
+    Returns:
+        Tuple with the code of the member icons (E, M or C for external/member/contributor followed by K for committee
+        members) and the code of the event icons (V or N for the visit followed by P or N for the post-visit)
+    """
+    if person.is_contributor:
+        member_code = 'C'
+    elif person.is_member:
+        member_code = 'M'
+    else:
+        member_code = 'E'
+
+    if person.is_committee:
+        member_code += 'K'
+
+    visit_code = 'V' if EventParticipation.VISIT in person.participation_type else 'N'
+    post_visit_code = 'P' if EventParticipation.POST_VISIT in person.participation_type else 'N'
+    return member_code, visit_code + post_visit_code
+
+
+def person_to_latex(person: Person, label_type: Label, cache_icons: bool = False) -> str:
+    """Serialize a Person into LaTeX.
+
+    The same people show up at most events and the same list of people is often generated several times (e.g. with only
+    a different sort order), so the generated LaTeX code is kept within an LRU cache (see `set_person_cache_size()`).
+
+    Args:
+        person (Person): Person to serialize
+        label_type (Label): Type of label
+        cache_icons (bool): Whether the icons are referred to by their codes (see `get_icon_codes()`)
+    """
+    # NB: a plain tuple is used as key since it is much cheaper to create than a `PersonKey`
+    key = (
+        person.first_name,
+        person.last_name,
+        person.is_member,
+        person.is_contributor,
+        person.is_committee,
+        person.participation_type,
+    )
+    return _cached_person_to_latex(key, label_type, cache_icons)
+
+
+def _person_to_latex(key: tuple, label_type: Label, cache_icons: bool) -> str:
+    """Serialize a Person into LaTeX (without going through the cache, see `PersonKey` for the content of the key)."""
+    person = PersonKey._make(key)
+    max_width = LABEL_PROPERTIES[label_type].name_width
+
+    first_name = apply_stretch_factor(escape_latex(person.first_name), get_stretch_factor(person.first_name, max_width))
+    last_name = apply_stretch_factor(escape_latex(person.last_name), get_stretch_factor(person.last_name, max_width))
+
+    if cache_icons:
+        member_code, event_code = get_icon_codes(person)
+        return rf'\addPerson{{{first_name}}}{{{last_name}}}{{{member_code}}}{{{event_code}}}'
 
     if person.is_contributor:
         member_icon = r'\contribIcon'
@@ -70,9 +215,60 @@ def person_to_latex(person: Person, label_type: Label) -> str:
     return rf'\addPerson{{{first_name}}}{{{last_name}}}{{{member_icon}}}{{{visit_icon}}}{{{post_visit_icon}}}'
 
 
+_cached_person_to_latex = functools.lru_cache(maxsize=DEFAULT_PERSON_CACHE_SIZE)(_person_to_latex)
+
+
+def set_person_cache_size(maxsize: int | None):
+    """Change the maximum number of entries of the cache used by `person_to_latex()` (this also clears the cache).
+
+    Args:
+        maxsize (int | None): Maximum number of entries (0 to disable the cache, None for an unbounded cache)
+    """
+    global _cached_person_to_latex  # noqa: PLW0603
+    _cached_person_to_latex = functools.lru_cache(maxsize=maxsize)(_person_to_latex)
+
+
+def person_cache_info() -> functools._CacheInfo:
+    """Hit/miss statistics of the cache used by `person_to_latex()` (see `functools.lru_cache`)."""
+    return _cached_person_to_latex.cache_info()
+
+
+# ==============================================================================
+
+_DOCUMENT_BEGIN = textwrap.dedent(
+    r'''
+        \begin{document}
+          \begin{labels}
+'''
+)
+
+# NB: labels that are already used on the first sheet are skipped using empty labels
+_EMPTY_LABEL = '    ~\n\n'
+
+_DOCUMENT_END = r'''  \end{labels}
+\end{document}
+
+% Local Variables:
+% TeX-engine: xetex
+% End:
+'''
+
 # ==============================================================================
 
 
+@dataclasses.dataclass(frozen=True)
+class LatexPage:
+    """A page of labels as a standalone LaTeX document.
+
+    The content hash only depends on the LaTeX code of the page, so that pages that are unchanged after an edit of the
+    list of participants keep the same hash (which is also the job ID used by `CompilationQueue`).
+    """
+
+    index: int
+    latex: str
+    content_hash: str
+
+
 class LatexDocument:
     """A LaTeX document."""
 
@@ -90,42 +286,90 @@ class LatexDocument:
     ICON_TASTING = ''
     ICON_VISIT = ''
 
-    def __init__(self, label: Label, event_type: EventType, event_food: EventFood):
+    def __init__(self, label: Label, event_type: EventType, event_food: EventFood, cache_icons: bool = False):
         """Initialize a LaTeX document instance.
 
         Args:
             label (Label): Type of label to generate
             event_type (EventType): Type of event
             event_food (EventFood): Type of food provided (if any)
+            cache_icons (bool): Whether to typeset the logo and the icons only once per document (into saveboxes)
+                instead of once per label. This makes the documents smaller and significantly faster to compile.
         """
         self._label_type = label
         self._event_type = event_type
         self._event_food = event_food
+        self._cache_icons = cache_icons
 
         self._generate_header()
 
-    def generate(self, people: list[Person]) -> str:
+    def iter_generate(self, people: Iterable[Person], start_offset: int = 0) -> Iterator[str]:
+        """Generate a LaTeX document chunk by chunk.
+
+        The header is yielded first, followed by one chunk per person and finally the document footer. This allows
+        callers to stream the document to its destination without ever holding the complete string in memory.
+
+        Args:
+            people (Iterable[Person]): Participants to generate a label for
+            start_offset (int): Number of labels to skip on the first page (e.g. to reuse a partially used sheet)
+
+        Raises:
+            ValueError: if the start offset is invalid
+        """
+        # NB: the start offset is checked before the generation actually starts
+        LABEL_PROPERTIES[self._label_type].check_start_offset(start_offset)
+        return self._iter_document(people, start_offset)
+
+    def generate(self, people: Iterable[Person], start_offset: int = 0) -> str:
         """Generate a LaTeX document."""
-        text = f'{self._header}' + textwrap.dedent(
-            r'''
-        \begin{document}
-          \begin{labels}
-'''
-        )
+        return ''.join(self.iter_generate(people, start_offset))
 
-        for person in people:
-            text += f'    {person_to_latex(person, self._label_type)}\n\n'
+    def iter_pages(self, people: Iterable[Person], start_offset: int = 0) -> Iterator[LatexPage]:
+        """Generate a LaTeX document split into pages.
 
-        return (
-            text
-            + r'''  \end{labels}
-\end{document}
+        Each page holds `cols * rows` labels (following the order of `people`) and is a standalone LaTeX document, so
+        that pages can be compiled separately and merged afterwards.
 
-% Local Variables:
-% TeX-engine: xetex
-% End:
-'''
-        )
+        Args:
+            people (Iterable[Person]): Participants to generate a label for
+            start_offset (int): Number of labels to skip on the first page (e.g. to reuse a partially used sheet)
+
+        Raises:
+            ValueError: if the start offset is invalid
+        """
+        properties = LABEL_PROPERTIES[self._label_type]
+        properties.check_start_offset(start_offset)
+
+        people = iter(people)
+        for index in itertools.count():
+            page_offset = start_offset if index == 0 else 0
+            page_people = list(itertools.islice(people, properties.labels_per_page - page_offset))
+            if not page_people:
+                break
+
+            latex = ''.join(
+                [
+                    self._header,
+                    _DOCUMENT_BEGIN,
+                    _EMPTY_LABEL * page_offset,
+                    *self._iter_labels(page_people),
+                    _DOCUMENT_END,
+                ]
+            )
+            yield LatexPage(index, latex, hashlib.sha256(latex.encode('utf-8')).hexdigest())
+
+    def _iter_document(self, people: Iterable[Person], start_offset: int) -> Iterator[str]:
+        """Generate a LaTeX document chunk by chunk (see `iter_generate()`)."""
+        yield self._header
+        yield _DOCUMENT_BEGIN
+        yield _EMPTY_LABEL * start_offset
+        yield from self._iter_labels(people)
+        yield _DOCUMENT_END
+
+    def _iter_labels(self, people: Iterable[Person]) -> Iterator[str]:
+        """Generate the LaTeX code of the labels (one chunk per person)."""
+        for person in people:
+            yield f'    {person_to_latex(person, self._label_type, self._cache_icons)}\n\n'
 
     @property
     def event_type(self) -> EventType:
@@ -157,30 +401,79 @@ class LatexDocument:
         self._label_type = new_type
         self._generate_header()
 
+    @property
+    def cache_icons(self) -> bool:
+        """Getter for the icon caching option."""
+        return self._cache_icons
+
+    @cache_icons.setter
+    def cache_icons(self, cache_icons: bool):
+        self._cache_icons = cache_icons
+        self._generate_header()
+
     def _generate_header(self):
         """Generate LaTeX header."""
+        self._header = LatexDocument._build_header(
+            self._label_type, self._event_type, self._event_food, self._cache_icons
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _build_header(label_type: Label, event_type: EventType, event_food: EventFood, cache_icons: bool) -> str:
+        """Build the LaTeX header for a given combination of label, event type, event food and icon caching option.
+
+        There are only a handful of such combinations, so the headers are cached for the lifetime of the process.
+        """
         visit_icon = r'\emptyIcon'
-        if self._event_type == EventType.COMPANY_VISIT:
+        if event_type == EventType.COMPANY_VISIT:
             visit_icon = LatexDocument.ICON_COMPANY_VISIT
-        elif self._event_type == EventType.CULTURAL_VISIT:
+        elif event_type == EventType.CULTURAL_VISIT:
             visit_icon = LatexDocument.ICON_CULTURAL_VISIT
-        elif self._event_type == EventType.TASTING:
+        elif event_type == EventType.TASTING:
             visit_icon = LatexDocument.ICON_TASTING
-        elif self._event_type == EventType.NETWORKING:
+        elif event_type == EventType.NETWORKING:
             visit_icon = LatexDocument.ICON_NETWORKING
 
         post_visit_icon = r'\emptyIcon'
-        if self._event_food == EventFood.APERO:
+        if event_food == EventFood.APERO:
             post_visit_icon = LatexDocument.ICON_APERO
-        elif self._event_food == EventFood.MEAL:
+        elif event_food == EventFood.MEAL:
             post_visit_icon = LatexDocument.ICON_MEAL
 
-        self._header = LatexDocument.HEADER.format(
-            label_type=LABEL_PROPERTIES[self._label_type], visit=visit_icon, post_visit=post_visit_icon
+        header = LatexDocument.HEADER.format(
+            label_type=LABEL_PROPERTIES[label_type], visit=visit_icon, post_visit=post_visit_icon
         )
 
-        self._header += textwrap.dedent(
-            r'''
+        if event_type == EventType.MEAL_ONLY:
+            event_icons = r'#5'  # skip 'visit' icon
+        elif event_food != EventFood.NOTHING:
+            event_icons = r'#4\ #5'
+        else:
+            event_icons = r'#4'  # skip 'food' icon
+
+        if cache_icons:
+            header += LatexDocument._build_icon_boxes(event_icons)
+            header += textwrap.dedent(
+                r'''
+    % Label macros
+    \newcommand{\addPerson}[4]{%
+      % Arguments: <first_name> <last_name> <member_icons_code> <event_icons_code>
+      \insertEPFLAlumniLogo%
+      \begin{minipage}{\personDataWidth}
+        \large #1\\#2
+      \end{minipage}
+
+      \vspace{.5ex}
+
+      \begin{minipage}[b]{\logoWidth}
+        \usebox{\csname memberIcons#3\endcsname}
+      \end{minipage}%
+      \begin{minipage}[b]{\personDataWidth}
+        \usebox{\csname eventIcons#4\endcsname}'''
+            )
+        else:
+            header += textwrap.dedent(
+                r'''
     % Label macros
     \newcommand{\addPerson}[5]{%
       % Arguments: <first_name> <last_name> <member_icons> <visit_icon> <post_visit_icon>
@@ -196,16 +489,10 @@ class LatexDocument:
       \end{minipage}%
       \begin{minipage}[b]{\personDataWidth}
         '''
-        )
+            )
+            header += f'    {event_icons}'
 
-        if self._event_type == EventType.MEAL_ONLY:
-            self._header += r'    #5'  # skip 'visit' icon
-        elif self._event_food != EventFood.NOTHING:
-            self._header += r'    #4\ #5'
-        else:
-            self._header += r'    #4'  # skip 'food' icon
-
-        self._header += textwrap.dedent(
+        header += textwrap.dedent(
             r'''
       \end{minipage}
     }
@@ -214,6 +501,49 @@ class LatexDocument:
 '''
         )
 
+        return header
+
+    @staticmethod
+    def _build_icon_boxes(event_icons: str) -> str:
+        """Build the LaTeX code typesetting the logo and every combination of icons once into saveboxes.
+
+        Args:
+            event_icons (str): Layout of the event icons with #4 and #5 standing for the visit and post-visit icons
+        """
+        member_icons = {
+            'E': r'\externalIcon',
+            'M': r'\memberIcon',
+            'C': r'\contribIcon',
+        }
+        member_icons.update({f'{code}K': rf'{icons}\ \committeeIcon' for code, icons in member_icons.items()})
+
+        event_icons = {
+            visit_code + post_visit_code: event_icons.replace('#4', visit_icon).replace('#5', post_visit_icon)
+            for visit_code, visit_icon in (('V', r'\visitIcon'), ('N', r'\emptyIcon'))
+            for post_visit_code, post_visit_icon in (('P', r'\postVisitIcon'), ('N', r'\emptyIcon'))
+        }
+
+        boxes = [('epflLogoBox', r'\epflLogo')]
+        boxes.extend((f'memberIcons{code}', icons) for code, icons in member_icons.items())
+        boxes.extend((f'eventIcons{code}', icons) for code, icons in event_icons.items())
+
+        lines = [
+            '',
+            '% Logo and icons typeset only once (see `\\addPerson`)',
+            *(rf'\newsavebox{{\{name}}}' for name, _ in boxes),
+            r'\AtBeginDocument{%',
+            *(rf'  \sbox{{\{name}}}{{{content}}}%' for name, content in boxes),
+            '}',
+            r'\renewcommand{\insertEPFLAlumniLogo}{%',
+            r'  \begin{minipage}{\logoWidth}',
+            r'    \usebox{\epflLogoBox}',
+            r'  \end{minipage}%',
+            '}',
+            '',
+            '% ==============================================================================',
+        ]
+        return '\n'.join(lines)
+
 
 # ==============================================================================
 # NB: These icons do not need to have the '{' and '}' protected
@@ -0,0 +1,94 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Font metrics used to decide whether the names fit on the labels.
+
+The labels are typeset using Arial (or Helvetica, which is metric-compatible), whose advance widths are bundled below
+for the Latin-1 characters. Other characters are measured using their base character (e.g. 'ă' -> 'a') if there is one,
+or using an average (or full-width) width otherwise.
+"""
+
+from __future__ import annotations
+
+import functools
+import unicodedata
+from array import array
+
+# ==============================================================================
+
+NAME_FONT_SIZE = 14.4  # \large within a 12pt document (in TeX points)
+THIN_SPACE_WIDTH = 1000 / 6  # \, (in thousandths of an em)
+
+_MM_PER_PT = 25.4 / 72.27
+_DEFAULT_WIDTH = 556
+_WIDE_CHAR_WIDTH = 1000  # e.g. CJK characters
+_FIRST_CHAR = 0x20
+
+# Advance widths (in thousandths of an em) of the characters from U+0020 to U+00FF (0 for control characters)
+# fmt: off
+_ARIAL_WIDTHS = array(
+    'H',
+    [
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584, 0,
+        0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+        0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+        278, 333, 556, 556, 556, 556, 260, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+        400, 584, 333, 333, 333, 556, 537, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+        667, 667, 667, 667, 667, 667, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+        722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+        556, 556, 556, 556, 556, 556, 889, 500, 556, 556, 556, 556, 278, 278, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 584, 611, 556, 556, 556, 556, 500, 556, 500,
+    ],
+)
+# fmt: on
+
+# Characters outside of Latin-1 without any decomposition into a base character
+_EXTRA_WIDTHS = {'Œ': 1000, 'œ': 944, 'Ł': 556, 'ł': 222, 'ı': 278, 'Đ': 722, 'đ': 556}  # noqa: RUF001
+
+# ==============================================================================
+
+
+@functools.lru_cache(maxsize=1024)
+def get_char_width(char: str) -> float:
+    """Advance width of a character (in thousandths of an em).
+
+    NB: all the kinds of spaces are rendered as thin spaces on the labels (see `escape_latex()`)
+    """
+    if char.isspace():
+        return THIN_SPACE_WIDTH
+
+    code = ord(char) - _FIRST_CHAR
+    if 0 <= code < len(_ARIAL_WIDTHS) and _ARIAL_WIDTHS[code]:
+        return _ARIAL_WIDTHS[code]
+    if char in _EXTRA_WIDTHS:
+        return _EXTRA_WIDTHS[char]
+
+    decomposition = unicodedata.normalize('NFKD', char)
+    if decomposition != char:
+        return sum(get_char_width(base) for base in decomposition if not unicodedata.combining(base))
+    if unicodedata.east_asian_width(char) in {'W', 'F'}:
+        return _WIDE_CHAR_WIDTH
+    return _DEFAULT_WIDTH
+
+
+@functools.lru_cache(maxsize=8192)
+def get_name_width(name: str) -> float:
+    """Width of a name as typeset on the labels (in millimeters, without any horizontal stretching)."""
+    return sum(map(get_char_width, unicodedata.normalize('NFC', name))) / 1000 * NAME_FONT_SIZE * _MM_PER_PT
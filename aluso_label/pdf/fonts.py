@@ -0,0 +1,346 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Fonts for PDF documents.
+
+Two kinds of fonts are supported:
+  - `StandardFont`: Helvetica (metric-compatible with Arial), which every PDF viewer provides so that nothing needs to
+    be embedded. Only the characters of the Windows-1252 code page can be represented.
+  - `TrueTypeFont`: any TrueType font file, of which only the glyphs actually used in the document are embedded.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from collections.abc import Iterable
+from pathlib import Path
+
+from .writer import PdfWriter
+
+# ==============================================================================
+
+_COMPOSITE_ARGS_ARE_WORDS = 0x0001
+_COMPOSITE_HAS_SCALE = 0x0008
+_COMPOSITE_MORE_COMPONENTS = 0x0020
+_COMPOSITE_HAS_XY_SCALE = 0x0040
+_COMPOSITE_HAS_2X2 = 0x0080
+
+_SUBSET_TABLES = ('cvt ', 'fpgm', 'glyf', 'head', 'hhea', 'hmtx', 'loca', 'maxp', 'prep')
+
+_TO_UNICODE_HEADER = b'''/CIDInit /ProcSet findresource begin
+12 dict begin
+begincmap
+/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def
+/CMapName /Adobe-Identity-UCS def
+/CMapType 2 def
+1 begincodespacerange
+<0000> <FFFF>
+endcodespacerange
+'''
+
+_TO_UNICODE_FOOTER = b'''endcmap
+CMapName currentdict /CMap defineresource pop
+end
+end
+'''
+
+# ==============================================================================
+
+
+def _checksum(data: bytes) -> int:
+    """Compute the checksum of a TrueType table."""
+    data += b'\0' * (-len(data) % 4)
+    return sum(struct.unpack(f'>{len(data) // 4}I', data)) & 0xFFFFFFFF
+
+
+class StandardFont:
+    """Helvetica font (one of the standard 14 PDF fonts, which are never embedded)."""
+
+    name = 'Helvetica'
+    ascent = 718
+    descent = -207
+
+    encoding = 'cp1252'
+
+    def encode(self, text: str) -> bytes:
+        """Encode some text for a PDF string (characters not available are replaced by '?')."""
+        return text.encode(self.encoding, errors='replace')
+
+    def find_unsupported(self, strings: Iterable[str]) -> list[str]:
+        """Find the strings with characters that are not available in the font (each string is only reported once)."""
+        unsupported = {}
+        for string in strings:
+            try:
+                string.encode(self.encoding)
+            except UnicodeEncodeError:
+                unsupported[string] = None
+        return list(unsupported)
+
+    def write(self, writer: PdfWriter, obj_num: int):
+        """Write the font objects to a PDF file."""
+        writer.write_object(
+            obj_num, f'<< /Type /Font /Subtype /Type1 /BaseFont /{self.name} /Encoding /WinAnsiEncoding >>'.encode()
+        )
+
+
+class TrueTypeFont:
+    """TrueType font embedded as a subset (ie. only with the glyphs used in a document)."""
+
+    def __init__(self, path: str | Path):
+        """Load a TrueType font file.
+
+        Raises:
+            ValueError: if the file is not a valid TrueType font
+        """
+        try:
+            self._load(Path(path))
+        except (struct.error, KeyError, IndexError) as err:
+            raise ValueError(f'Invalid TrueType font file: {path}') from err
+        self._used: dict[int, str] = {0: ''}
+
+    def _load(self, path: Path):
+        """Parse the tables of a TrueType font file."""
+        data = path.read_bytes()
+        version, num_tables = struct.unpack_from('>IH', data)
+        if version not in (0x00010000, 0x74727565):
+            raise ValueError(f'Unsupported font file (only TrueType outlines are supported): {path}')
+
+        self._tables = {}
+        for i in range(num_tables):
+            tag, _, offset, length = struct.unpack_from('>4sIII', data, 12 + 16 * i)
+            self._tables[tag.decode('latin-1')] = data[offset : offset + length]
+
+        head = self._tables['head']
+        self._units_per_em = struct.unpack_from('>H', head, 18)[0]
+        self._bbox = [self._scale(value) for value in struct.unpack_from('>hhhh', head, 36)]
+        loca_format = struct.unpack_from('>h', head, 50)[0]
+
+        ascent, descent = struct.unpack_from('>hh', self._tables['hhea'], 4)
+        self.ascent = self._scale(ascent)
+        self.descent = self._scale(descent)
+
+        n_glyphs = struct.unpack_from('>H', self._tables['maxp'], 4)[0]
+        n_metrics = struct.unpack_from('>H', self._tables['hhea'], 34)[0]
+        advances = [adv for adv, _ in struct.iter_unpack('>Hh', self._tables['hmtx'][: 4 * n_metrics])]
+        self._advances = advances + [advances[-1]] * (n_glyphs - n_metrics)
+
+        if loca_format == 0:
+            self._loca = [2 * offset for offset in struct.unpack_from(f'>{n_glyphs + 1}H', self._tables['loca'])]
+        else:
+            self._loca = list(struct.unpack_from(f'>{n_glyphs + 1}I', self._tables['loca']))
+
+        self._cmap = self._parse_cmap(self._tables['cmap'])
+        self.name = self._parse_postscript_name(self._tables.get('name', b'')) or path.stem.replace(' ', '')
+
+        post = self._tables.get('post', b'')
+        self._italic_angle = struct.unpack_from('>i', post, 4)[0] / 65536 if len(post) >= 8 else 0  # noqa: PLR2004
+        self._cap_height = self.ascent
+        os2 = self._tables.get('OS/2', b'')
+        if len(os2) >= 90 and struct.unpack_from('>H', os2)[0] >= 2:  # noqa: PLR2004
+            self._cap_height = self._scale(struct.unpack_from('>h', os2, 88)[0])
+
+    def _scale(self, value: int) -> int:
+        """Convert font units into thousandths of an em."""
+        return round(value * 1000 / self._units_per_em)
+
+    @staticmethod
+    def _parse_cmap(cmap: bytes) -> dict[int, int]:
+        """Parse the Unicode character to glyph mapping of a font."""
+        subtables = {}
+        for i in range(struct.unpack_from('>H', cmap, 2)[0]):
+            platform_id, encoding_id, offset = struct.unpack_from('>HHI', cmap, 4 + 8 * i)
+            subtables[platform_id, encoding_id] = offset
+
+        for key in ((3, 10), (0, 4), (3, 1), (0, 3)):
+            if key not in subtables:
+                continue
+            offset = subtables[key]
+            fmt = struct.unpack_from('>H', cmap, offset)[0]
+            if fmt == 12:  # noqa: PLR2004
+                return TrueTypeFont._parse_cmap_format_12(cmap, offset)
+            if fmt == 4:  # noqa: PLR2004
+                return TrueTypeFont._parse_cmap_format_4(cmap, offset)
+        raise ValueError('No supported Unicode character map found in font')
+
+    @staticmethod
+    def _parse_cmap_format_12(cmap: bytes, offset: int) -> dict[int, int]:
+        """Parse a format 12 (segmented coverage) character map subtable."""
+        mapping = {}
+        n_groups = struct.unpack_from('>I', cmap, offset + 12)[0]
+        for start, end, glyph in struct.iter_unpack('>III', cmap[offset + 16 : offset + 16 + 12 * n_groups]):
+            for char in range(start, end + 1):
+                mapping[char] = glyph + char - start
+        return mapping
+
+    @staticmethod
+    def _parse_cmap_format_4(cmap: bytes, offset: int) -> dict[int, int]:
+        """Parse a format 4 (segment mapping to delta values) character map subtable."""
+        mapping = {}
+        n_segments = struct.unpack_from('>H', cmap, offset + 6)[0] // 2
+        ends = struct.unpack_from(f'>{n_segments}H', cmap, offset + 14)
+        starts_offset = offset + 16 + 2 * n_segments
+        starts = struct.unpack_from(f'>{n_segments}H', cmap, starts_offset)
+        deltas = struct.unpack_from(f'>{n_segments}h', cmap, starts_offset + 2 * n_segments)
+        ranges_offset = starts_offset + 4 * n_segments
+        ranges = struct.unpack_from(f'>{n_segments}H', cmap, ranges_offset)
+        for i, (start, end, delta, range_offset) in enumerate(zip(starts, ends, deltas, ranges)):
+            for char in range(start, min(end, 0xFFFE) + 1):
+                if range_offset == 0:
+                    glyph = (char + delta) & 0xFFFF
+                else:
+                    glyph = struct.unpack_from('>H', cmap, ranges_offset + 2 * i + range_offset + 2 * (char - start))[0]
+                    if glyph:
+                        glyph = (glyph + delta) & 0xFFFF
+                if glyph:
+                    mapping[char] = glyph
+        return mapping
+
+    @staticmethod
+    def _parse_postscript_name(name: bytes) -> str | None:
+        """Extract the PostScript name of a font from its 'name' table."""
+        if not name:
+            return None
+        count, strings_offset = struct.unpack_from('>HH', name, 2)
+        for i in range(count):
+            platform_id, _, _, name_id, length, offset = struct.unpack_from('>6H', name, 6 + 12 * i)
+            if name_id == 6:  # noqa: PLR2004
+                value = name[strings_offset + offset : strings_offset + offset + length]
+                return value.decode('utf-16-be' if platform_id in (0, 3) else 'latin-1')
+        return None
+
+    def encode(self, text: str) -> bytes:
+        """Encode some text for a PDF string (ie. as a sequence of 2-byte glyph indices)."""
+        glyphs = []
+        for char in text:
+            glyph = self._cmap.get(ord(char), 0)
+            self._used.setdefault(glyph, char)
+            glyphs.append(glyph)
+        return struct.pack(f'>{len(glyphs)}H', *glyphs)
+
+    def _glyph_data(self, glyph: int) -> bytes:
+        return self._tables['glyf'][self._loca[glyph] : self._loca[glyph + 1]]
+
+    def _glyph_closure(self) -> set[int]:
+        """Set of the glyphs used in the document, including the components of composite glyphs."""
+        glyphs = set()
+        pending = list(self._used)
+        while pending:
+            glyph = pending.pop()
+            if glyph in glyphs:
+                continue
+            glyphs.add(glyph)
+
+            data = self._glyph_data(glyph)
+            if len(data) < 10 or struct.unpack_from('>h', data)[0] >= 0:  # noqa: PLR2004
+                continue
+            offset = 10
+            while True:
+                flags, component = struct.unpack_from('>HH', data, offset)
+                pending.append(component)
+                offset += 8 if flags & _COMPOSITE_ARGS_ARE_WORDS else 6
+                if flags & _COMPOSITE_HAS_SCALE:
+                    offset += 2
+                elif flags & _COMPOSITE_HAS_XY_SCALE:
+                    offset += 4
+                elif flags & _COMPOSITE_HAS_2X2:
+                    offset += 8
+                if not flags & _COMPOSITE_MORE_COMPONENTS:
+                    break
+        return glyphs
+
+    def subset(self) -> bytes:
+        """Generate a TrueType font file with only the outlines of the glyphs used so far.
+
+        NB: glyph indices are preserved (the outlines of unused glyphs are simply left empty), so that the text encoded
+            using `encode()` remains valid.
+        """
+        glyphs = self._glyph_closure()
+        glyf = bytearray()
+        loca = []
+        for glyph in range(len(self._loca) - 1):
+            loca.append(len(glyf))
+            if glyph in glyphs:
+                glyf += self._glyph_data(glyph)
+                glyf += b'\0' * (-len(glyf) % 4)
+        loca.append(len(glyf))
+
+        head = bytearray(self._tables['head'])
+        head[8:12] = b'\0\0\0\0'  # checkSumAdjustment
+        head[50:52] = struct.pack('>h', 1)  # long loca format
+
+        tables = {tag: self._tables[tag] for tag in _SUBSET_TABLES if tag in self._tables}
+        tables.update(head=bytes(head), glyf=bytes(glyf), loca=struct.pack(f'>{len(loca)}I', *loca))
+
+        n_tables = len(tables)
+        entry_selector = n_tables.bit_length() - 1
+        search_range = 16 * 2**entry_selector
+        header = struct.pack('>IHHHH', 0x00010000, n_tables, search_range, entry_selector, 16 * n_tables - search_range)
+
+        directory = bytearray()
+        body = bytearray()
+        offset = len(header) + 16 * n_tables
+        head_offset = 0
+        for tag, data in sorted(tables.items()):
+            if tag == 'head':
+                head_offset = offset + len(body)
+            directory += struct.pack('>4sIII', tag.encode('latin-1'), _checksum(data), offset + len(body), len(data))
+            body += data + b'\0' * (-len(data) % 4)
+
+        font = bytearray(header + directory + body)
+        font[head_offset + 8 : head_offset + 12] = struct.pack('>I', (0xB1B0AFBA - _checksum(bytes(font))) & 0xFFFFFFFF)
+        return bytes(font)
+
+    def _to_unicode(self) -> bytes:
+        """Generate the CMap used by PDF viewers to map glyphs back to Unicode (e.g. for copy & paste)."""
+        entries = [
+            f'<{glyph:04X}> <{char.encode("utf-16-be").hex().upper()}>'.encode()
+            for glyph, char in sorted(self._used.items())
+            if char
+        ]
+        cmap = bytearray(_TO_UNICODE_HEADER)
+        for i in range(0, len(entries), 100):
+            block = entries[i : i + 100]
+            cmap += b'%d beginbfchar\n' % len(block) + b'\n'.join(block) + b'\nendbfchar\n'
+        return bytes(cmap + _TO_UNICODE_FOOTER)
+
+    def write(self, writer: PdfWriter, obj_num: int):
+        """Write the font objects to a PDF file."""
+        font_file = self.subset()
+        tag = ''.join(chr(ord('A') + byte % 26) for byte in hashlib.sha256(font_file).digest()[:6])
+        base_font = f'{tag}+{self.name}'
+
+        cid_font, descriptor, font_file_obj, to_unicode = (writer.reserve() for _ in range(4))
+        widths = ' '.join(f'{glyph} [{self._scale(self._advances[glyph])}]' for glyph in sorted(self._used))
+
+        writer.write_object(
+            obj_num,
+            f'<< /Type /Font /Subtype /Type0 /BaseFont /{base_font} /Encoding /Identity-H '
+            f'/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>'.encode(),
+        )
+        writer.write_object(
+            cid_font,
+            f'<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{base_font} '
+            f'/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> '
+            f'/FontDescriptor {descriptor} 0 R /CIDToGIDMap /Identity /W [{widths}] >>'.encode(),
+        )
+        writer.write_object(
+            descriptor,
+            f'<< /Type /FontDescriptor /FontName /{base_font} /Flags 32 /FontBBox [{" ".join(map(str, self._bbox))}] '
+            f'/ItalicAngle {self._italic_angle:g} /Ascent {self.ascent} /Descent {self.descent} '
+            f'/CapHeight {self._cap_height} /StemV 80 /FontFile2 {font_file_obj} 0 R >>'.encode(),
+        )
+        writer.write_stream(font_file_obj, f'/Length1 {len(font_file)}', font_file)
+        writer.write_stream(to_unicode, '', self._to_unicode())
@@ -0,0 +1,245 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""PDF document generation."""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Iterable
+from pathlib import Path
+
+from aluso_label.event import EventFood, EventType
+from aluso_label.icons import (
+    CM,
+    EPFL_LOGO,
+    EVENT_FOOD_ICONS,
+    EVENT_TYPE_ICONS,
+    ICON_COMMITTEE,
+    ICON_CONTRIBUTOR,
+    ICON_EXTERNAL,
+    ICON_MEMBER,
+    MM,
+    Icon,
+)
+from aluso_label.latex import LABEL_PROPERTIES, Label
+from aluso_label.latex.latex_document import get_stretch_factor
+from aluso_label.people import EventParticipation, Person
+
+from .fonts import StandardFont, TrueTypeFont
+from .writer import PdfWriter
+
+# ==============================================================================
+# NB: the dimensions below mimic the LaTeX document (12pt article class, A4 paper)
+
+_PAGE_WIDTH = 210 * MM
+_PAGE_HEIGHT = 297 * MM
+
+_NAME_FONT_SIZE = 14.4  # \large
+_NAME_LEADING = 18
+_THIN_SPACE = 1000 / 6  # \, (in thousandths of an em)
+_LOGO_WIDTH = 2.4 * CM
+_INTERWORD_SPACE = 0.278 * 12
+_EMPTY_ICON_WIDTH = 5.4 * MM + _INTERWORD_SPACE  # \hspace*{5.4mm} followed by a space
+_ROW_SEPARATION = 0.5 * 0.519 * 12 + 1  # \vspace{.5ex} + \lineskip
+
+_ICONS = {
+    'Logo': EPFL_LOGO,
+    'Committee': ICON_COMMITTEE,
+    'Contrib': ICON_CONTRIBUTOR,
+    'External': ICON_EXTERNAL,
+    'Member': ICON_MEMBER,
+}
+
+# ==============================================================================
+
+
+class PdfDocument:
+    """A PDF document with one label per person.
+
+    The layout of the labels follows the one of the LaTeX documents (see `LatexDocument`), without requiring a TeX
+    installation to produce the final PDF file.
+    """
+
+    def __init__(self, label: Label, event_type: EventType, event_food: EventFood, font_path: str | Path | None = None):
+        """Initialize a PDF document instance.
+
+        Args:
+            label (Label): Type of label to generate
+            event_type (EventType): Type of event
+            event_food (EventFood): Type of food provided (if any)
+            font_path (str | Path): Path to a TrueType font file to embed (Helvetica is used if not specified)
+        """
+        self._label_type = label
+        self._event_type = event_type
+        self._event_food = event_food
+        self._font_path = font_path
+
+        self._icons = dict(_ICONS)
+        if event_type in EVENT_TYPE_ICONS:
+            self._icons['Visit'] = EVENT_TYPE_ICONS[event_type]
+        if event_food in EVENT_FOOD_ICONS:
+            self._icons['PostVisit'] = EVENT_FOOD_ICONS[event_food]
+
+    def generate(self, people: Iterable[Person], start_offset: int = 0) -> bytes:
+        """Generate a PDF document.
+
+        Args:
+            people (Iterable[Person]): Participants to generate a label for
+            start_offset (int): Number of labels to skip on the first page (e.g. to reuse a partially used sheet)
+
+        Raises:
+            ValueError: if the start offset is invalid or if some names cannot be represented using the standard font
+            RuntimeError: if a name is too long to fit on a label
+        """
+        properties = LABEL_PROPERTIES[self._label_type]
+        properties.check_start_offset(start_offset)
+        labels_per_page = properties.labels_per_page
+        font = StandardFont() if self._font_path is None else TrueTypeFont(self._font_path)
+
+        if isinstance(font, StandardFont):
+            # NB: all the names are checked at once instead of silently replacing the missing characters by '?'
+            people = list(people)
+            unsupported = font.find_unsupported(
+                itertools.chain.from_iterable((person.first_name, person.last_name) for person in people)
+            )
+            if unsupported:
+                raise ValueError(
+                    f'Names with characters not supported by the {font.name} font: {", ".join(unsupported)} '
+                    '(use a TrueType font covering these characters instead, e.g. with `--font path/to/font.ttf`)'
+                )
+
+        writer = PdfWriter()
+        catalog, pages, resources, font_obj = (writer.reserve() for _ in range(4))
+        icon_objs = {name: writer.reserve() for name in self._icons}
+
+        page_objs = []
+        people = iter(people)
+        page_offset = start_offset
+        while True:
+            page_people = list(itertools.islice(people, labels_per_page - page_offset))
+            if not page_people:
+                break
+
+            content = []
+            for index, person in enumerate(page_people, page_offset):
+                row, col = divmod(index, properties.cols)
+                x = (properties.page_margin.left + col * (properties.width + properties.inter_col)) * MM
+                y = _PAGE_HEIGHT - (properties.page_margin.top + row * (properties.height + properties.inter_row)) * MM
+                content.append(
+                    self._label_content(
+                        font, person, x + properties.label_margin.left * MM, y - properties.label_margin.top * MM
+                    )
+                )
+
+            page, page_content = writer.reserve(), writer.reserve()
+            writer.write_stream(page_content, '', '\n'.join(content).encode('latin-1'))
+            writer.write_object(
+                page,
+                f'<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {_PAGE_WIDTH:.3f} {_PAGE_HEIGHT:.3f}] '
+                f'/Resources {resources} 0 R /Contents {page_content} 0 R >>'.encode(),
+            )
+            page_objs.append(page)
+            page_offset = 0
+
+        for name, icon in self._icons.items():
+            # NB: the bounding box is slightly enlarged to avoid clipping the lines at the edges of the icons
+            writer.write_stream(
+                icon_objs[name],
+                f'/Type /XObject /Subtype /Form /BBox [{icon.x_min - 1:.3f} {icon.y_min - 1:.3f} '
+                f'{icon.x_max + 1:.3f} {icon.y_max + 1:.3f}]',
+                icon.to_pdf().encode('latin-1'),
+            )
+        font.write(writer, font_obj)
+
+        xobjects = ' '.join(f'/{name} {obj} 0 R' for name, obj in icon_objs.items())
+        writer.write_object(resources, f'<< /Font << /F1 {font_obj} 0 R >> /XObject << {xobjects} >> >>'.encode())
+        kids = ' '.join(f'{page} 0 R' for page in page_objs)
+        writer.write_object(pages, f'<< /Type /Pages /Kids [{kids}] /Count {len(page_objs)} >>'.encode())
+        writer.write_object(catalog, f'<< /Type /Catalog /Pages {pages} 0 R >>'.encode())
+        return writer.finish(catalog)
+
+    def _label_content(self, font: StandardFont | TrueTypeFont, person: Person, left: float, top: float) -> str:
+        """Generate the content stream operators for the label of a person.
+
+        Args:
+            font (StandardFont | TrueTypeFont): Font used for the names
+            person (Person): Person to generate the label for
+            left (float): Left of the printable area of the label (in points)
+            top (float): Top of the printable area of the label (in points)
+        """
+        max_width = LABEL_PROPERTIES[self._label_type].name_width
+        first_baseline = top - font.ascent / 1000 * _NAME_FONT_SIZE
+        second_baseline = first_baseline - _NAME_LEADING
+        bottom = second_baseline + font.descent / 1000 * _NAME_FONT_SIZE
+
+        content = [
+            self._place_icon('Logo', left, (top + bottom - self._icons['Logo'].height) / 2),
+            self._name_content(font, person.first_name, max_width, left + _LOGO_WIDTH, first_baseline),
+            self._name_content(font, person.last_name, max_width, left + _LOGO_WIDTH, second_baseline),
+        ]
+
+        if person.is_contributor:
+            member_icons = ['Contrib']
+        elif person.is_member:
+            member_icons = ['Member']
+        else:
+            member_icons = ['External']
+        if person.is_committee:
+            member_icons.append('Committee')
+
+        visit_icon = 'Visit' if EventParticipation.VISIT in person.participation_type else None
+        post_visit_icon = 'PostVisit' if EventParticipation.POST_VISIT in person.participation_type else None
+        if self._event_type == EventType.MEAL_ONLY:
+            event_icons = [post_visit_icon]
+        elif self._event_food != EventFood.NOTHING:
+            event_icons = [visit_icon, post_visit_icon]
+        else:
+            event_icons = [visit_icon]
+        event_icons = [name if name in self._icons else None for name in event_icons]
+
+        # NB: the icons are aligned on their bottom edge (like [b] minipages)
+        icons = [self._icons[name] for name in member_icons + event_icons if name is not None]
+        baseline = bottom - _ROW_SEPARATION - max(icon.height for icon in icons)
+        content.extend(self._icon_row(member_icons, left, baseline))
+        content.extend(self._icon_row(event_icons, left + _LOGO_WIDTH, baseline))
+        return '\n'.join(content)
+
+    def _icon_row(self, names: list[str | None], x: float, y: float) -> list[str]:
+        """Place a row of icons separated by an interword space (None corresponds to an empty icon)."""
+        content = []
+        for name in names:
+            if name is None:
+                x += _EMPTY_ICON_WIDTH + _INTERWORD_SPACE
+            else:
+                content.append(self._place_icon(name, x, y))
+                x += self._icons[name].width + _INTERWORD_SPACE
+        return content
+
+    def _place_icon(self, name: str, x: float, y: float) -> str:
+        """Draw an icon with the bottom-left corner of its bounding box at some position."""
+        icon: Icon = self._icons[name]
+        return f'q 1 0 0 1 {x - icon.x_min:.3f} {y - icon.y_min:.3f} cm /{name} Do Q'
+
+    @staticmethod
+    def _name_content(font: StandardFont | TrueTypeFont, name: str, max_width: float, x: float, y: float) -> str:
+        """Draw a (possibly horizontally stretched) name.
+
+        NB: spaces are rendered as thin spaces and the stretch factor is computed from the Arial font metrics (see
+            `get_stretch_factor()`) so that the labels look the same as the LaTeX documents.
+        """
+        stretch = get_stretch_factor(name, max_width)
+        words = f' {-_THIN_SPACE:.3f} '.join(f'<{font.encode(word).hex()}>' for word in name.split(' '))
+        return f'BT /F1 {_NAME_FONT_SIZE} Tf {100 * stretch:.3f} Tz 1 0 0 1 {x:.3f} {y:.3f} Tm [{words}] TJ ET'
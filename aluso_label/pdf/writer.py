@@ -0,0 +1,80 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Low-level PDF file writer."""
+
+from __future__ import annotations
+
+import zlib
+
+# ==============================================================================
+
+
+class PdfWriter:
+    """Minimal PDF file writer.
+
+    Object numbers are reserved upfront (so that objects can reference objects written later on) and the objects are
+    then written in any order.
+    """
+
+    def __init__(self):
+        """Initialize a PDF writer."""
+        self._chunks = [b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n']
+        self._size = len(self._chunks[0])
+        self._offsets: dict[int, int] = {}
+        self._n_objects = 0
+
+    def reserve(self) -> int:
+        """Reserve an object number."""
+        self._n_objects += 1
+        return self._n_objects
+
+    def _write(self, data: bytes):
+        self._chunks.append(data)
+        self._size += len(data)
+
+    def write_object(self, obj_num: int, body: bytes):
+        """Write an object."""
+        self._offsets[obj_num] = self._size
+        self._write(b'%d 0 obj\n%s\nendobj\n' % (obj_num, body))
+
+    def write_stream(self, obj_num: int, dictionary: str, data: bytes):
+        """Write a (compressed) stream object.
+
+        Args:
+            obj_num (int): Object number
+            dictionary (str): Entries of the stream dictionary (without the length and filter)
+            data (bytes): Uncompressed stream data
+        """
+        data = zlib.compress(data)
+        self.write_object(
+            obj_num,
+            b'<< /Length %d /Filter /FlateDecode %s >>\nstream\n%s\nendstream' % (len(data), dictionary.encode(), data),
+        )
+
+    def finish(self, root: int) -> bytes:
+        """Write the cross-reference table and return the complete PDF file.
+
+        Args:
+            root (int): Object number of the document catalog
+        """
+        xref_offset = self._size
+        entries = [b'0000000000 65535 f \n']
+        entries.extend(b'%010d 00000 n \n' % self._offsets[obj_num] for obj_num in range(1, self._n_objects + 1))
+        self._write(b'xref\n0 %d\n%s' % (self._n_objects + 1, b''.join(entries)))
+        self._write(
+            b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (self._n_objects + 1, root, xref_offset)
+        )
+        return b''.join(self._chunks)
@@ -17,6 +17,8 @@
 
 import dataclasses
 import enum
+import unicodedata
+from collections.abc import Iterable
 from typing import ClassVar
 
 
@@ -33,7 +35,7 @@ class EventParticipation(enum.Flag):
 class Person:
     """A person."""
 
-    aluso_uid: dataclasses.InitVar[str]
+    aluso_uid: str
     first_name: str
     last_name: str
     is_member: bool
@@ -44,9 +46,9 @@ class Person:
     # NB: This is to be initialized via an environment variable: FLASK_COMMITTEE_LIST
     COMMITTEE_LIST: ClassVar[dict[str, str]] = {}
 
-    def __post_init__(self, aluso_uid):
+    def __post_init__(self):
         """Post-initialization routine."""
-        self.is_committee = aluso_uid in Person.COMMITTEE_LIST
+        self.is_committee = self.aluso_uid in Person.COMMITTEE_LIST
 
         if not self.is_member and self.is_committee:
             raise RuntimeError('Cannot have a non-member as part of the committee!')
@@ -57,7 +59,7 @@ class Person:
     def from_dict(args):
         """Initialize from a dictionary."""
         person = Person(
-            '',
+            args.get('aluso_uid', ''),
             args['first_name'],
             args['last_name'],
             args['is_member'],
@@ -66,3 +68,86 @@ class Person:
         )
         person.is_committee = args['is_committee']
         return person
+
+
+# ==============================================================================
+
+
+def get_participation_type(visit: bool, post_visit: bool) -> EventParticipation:
+    """Compute the participation type for a ticket based on its options."""
+    participation_type = EventParticipation.NOTHING
+    if visit:
+        participation_type |= EventParticipation.VISIT
+    if post_visit:
+        participation_type |= EventParticipation.POST_VISIT
+
+    return participation_type ^ EventParticipation.NOTHING
+
+
+def get_name_key(name: str) -> str:
+    """Normalize a name for accent and case-insensitive comparisons (e.g. 'Élodie' -> 'elodie')."""
+    return ''.join(char for char in unicodedata.normalize('NFKD', name) if not unicodedata.combining(char)).casefold()
+
+
+SORT_TYPES = {
+    'last_name': 'Last name',
+    'first_name': 'First name',
+    'ticket': 'Ticket',
+    'membership': 'Membership (committee, contributors, members, non-members)',
+}
+
+
+def _membership_tier(person: Person) -> int:
+    """Rank of a person when sorting by membership."""
+    if person.is_committee:
+        return 0
+    if person.is_contributor:
+        return 1
+    if person.is_member:
+        return 2
+    return 3
+
+
+def get_sort_orders(people: list[Person], sort_types: Iterable[str] = SORT_TYPES) -> dict[str, list[int]]:
+    """Compute the order of a list of people for several sort types.
+
+    The names are compared using accent and case-insensitive collation keys (see `get_name_key()`), which are computed
+    only once for all the sort types. Ties are broken by last name and first name (or the other way round when sorting
+    by first name). Unknown sort types fall back to sorting by last name.
+
+    NB: this needs to be called while the participation type of the people is still the ticket name, so that they can be
+        sorted by ticket. The orders can then be stored along with the people (e.g. with the parsed CSV data) so that
+        sorting later on is a simple permutation.
+
+    Args:
+        people (list[Person]): List of people
+        sort_types (Iterable[str]): Sort types to compute the order for (see `SORT_TYPES`)
+
+    Returns:
+        Mapping of each sort type to the list of indices of the people in sorted order
+    """
+    name_keys = [(get_name_key(p.last_name), get_name_key(p.first_name), p.last_name, p.first_name) for p in people]
+    by_last_name = sorted(range(len(people)), key=name_keys.__getitem__)
+
+    # NB: the other sort types only need a cheap key array since Python's sort is stable, ie. sorting the order by last
+    #     name keeps the people with the same key sorted by last name
+    def _sort_by(keys: list) -> list[int]:
+        return sorted(by_last_name, key=keys.__getitem__)
+
+    orders = {}
+    for sort_type in sort_types:
+        if sort_type == 'first_name':
+            orders[sort_type] = _sort_by([key[1] for key in name_keys])
+        elif sort_type == 'ticket':
+            ticket_keys = {ticket: get_name_key(str(ticket)) for ticket in {p.participation_type for p in people}}
+            orders[sort_type] = _sort_by([ticket_keys[p.participation_type] for p in people])
+        elif sort_type == 'membership':
+            orders[sort_type] = _sort_by([_membership_tier(p) for p in people])
+        else:
+            orders[sort_type] = by_last_name
+    return orders
+
+
+def sort_people(people: list[Person], sort_type: str) -> list[Person]:
+    """Sort a list of people (see `SORT_TYPES` and `get_sort_orders()`)."""
+    return [people[idx] for idx in get_sort_orders(people, [sort_type])[sort_type]]
@@ -0,0 +1,250 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""CSV to document (LaTeX, Typst or PDF) generation pipeline."""
+
+from __future__ import annotations
+
+import enum
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from .backends import DocumentBackend, LatexBackend, PdfBackend
+from .csv_import import read_people
+from .event import EventFood, EventType, guess_ticket_options
+from .latex import LABEL_PROPERTIES, Label, find_overflowing_names
+from .people import SORT_TYPES, Person, get_participation_type, get_sort_orders
+
+# ==============================================================================
+
+_TICKET_OPTIONS = frozenset(('visit', 'post_visit'))
+
+# ==============================================================================
+
+
+def parse_enum(enum_type: type[enum.Enum], value: str) -> enum.Enum:
+    """Convert a string (e.g. 'Label.AVERY_70X36' or 'AVERY_70X36') into an enumeration value.
+
+    Raises:
+        ValueError: if the value is not a string or does not correspond to any enumeration value
+    """
+    valid_values = ', '.join(item.name for item in enum_type)
+    if not isinstance(value, str):
+        raise ValueError(f'Invalid value for {enum_type.__name__}: {value!r} (valid values: {valid_values})')
+    try:
+        return enum_type[value.replace(f'{enum_type.__name__}.', '')]
+    except KeyError:
+        raise ValueError(f'Invalid value for {enum_type.__name__}: {value} (valid values: {valid_values})') from None
+
+
+def parse_start_offset(value: object) -> int:
+    """Convert a number of labels to skip on the first page into an integer.
+
+    NB: the value usually comes from JSON or form data provided by users, hence only integers (but not booleans) and
+        strings of digits are accepted. The upper bound depends on the label type (see `LabelProperties`).
+
+    Raises:
+        ValueError: if the value is neither a non-negative integer nor a string of digits
+    """
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    raise ValueError(f'Invalid start offset: {value!r} (expected a non-negative integer)')
+
+
+def check_ticket_options(tickets: object):
+    """Check that some ticket options are a mapping of ticket names to `{'visit': bool, 'post_visit': bool}`.
+
+    NB: the options usually come from JSON data provided by users, hence any type of value needs to be handled. Only
+        real booleans are accepted since e.g. the string "false" would otherwise be considered as true.
+
+    Raises:
+        ValueError: if the ticket options are not a mapping of ticket names to mappings of the known options to booleans
+    """
+    if not isinstance(tickets, dict) or not all(
+        isinstance(option, dict)
+        and set(option) <= _TICKET_OPTIONS
+        and all(isinstance(value, bool) for value in option.values())
+        for option in tickets.values()
+    ):
+        raise ValueError(
+            'Invalid ticket options (expected a mapping of ticket names to {"visit": bool, "post_visit": bool})'
+        )
+
+
+def assign_participation_types(people: list[Person], tickets: dict[str, dict[str, bool]] | None = None) -> EventFood:
+    """Replace the ticket name of each person by the corresponding participation type.
+
+    Args:
+        people (list[Person]): List of people (with the ticket name as participation type)
+        tickets (dict[str, dict[str, bool]]): Mapping of ticket names to `{'visit': bool, 'post_visit': bool}`. Missing
+            tickets or options are guessed from the ticket names.
+
+    Returns:
+        Type of food provided at the event as guessed from the ticket names
+    """
+    if tickets is None:
+        tickets = {}
+
+    ticket_names = sorted({person.participation_type for person in people})
+    post_visit, event_food = guess_ticket_options(ticket_names)
+
+    ticket_data = {}
+    for ticket, default_post_visit in zip(ticket_names, post_visit):
+        ticket_option = tickets.get(ticket, {})
+        ticket_data[ticket] = get_participation_type(
+            bool(ticket_option.get('visit', True)), bool(ticket_option.get('post_visit', default_post_visit))
+        )
+
+    for person in people:
+        person.participation_type = ticket_data[person.participation_type]
+
+    return event_food
+
+
+def parse_options(options: dict) -> tuple[Label, EventType, EventFood | None, str]:
+    """Parse the generation options that do not depend on the CSV data (see `prepare_document()`).
+
+    Returns:
+        Tuple with the label type, event type, event food (None if it should be guessed from the ticket names) and sort
+        type
+
+    Raises:
+        ValueError: if some options are missing or invalid
+    """
+    if 'label_type' not in options:
+        raise ValueError('Missing label type (`label_type`)')
+
+    label_type = parse_enum(Label, options['label_type'])
+    event_type = parse_enum(EventType, options.get('event_type', EventType.COMPANY_VISIT.name))
+    event_food = parse_enum(EventFood, options['event_food']) if options.get('event_food') else None
+    sort_type = options.get('sort_type', 'last_name')
+    if not isinstance(sort_type, str) or sort_type not in SORT_TYPES:
+        raise ValueError(f'Invalid sort type: {sort_type!r} (valid values: {", ".join(SORT_TYPES)})')
+    if options.get('tickets') is not None:
+        check_ticket_options(options['tickets'])
+    return label_type, event_type, event_food, sort_type
+
+
+def get_start_offset(options: dict) -> int:
+    """Number of labels to skip on the first page (`start_offset` option, defaults to 0).
+
+    Raises:
+        ValueError: if the start offset is invalid (see `parse_start_offset()`)
+    """
+    start_offset = options.get('start_offset')
+    return 0 if start_offset in (None, '') else parse_start_offset(start_offset)
+
+
+def check_options(options: dict):
+    """Check some generation options (see `generate_document_from_csv()`) before any CSV data is available.
+
+    Raises:
+        ValueError: if some options are missing or invalid
+    """
+    label_type = parse_options(options)[0]
+    LABEL_PROPERTIES[label_type].check_start_offset(get_start_offset(options))
+
+
+def prepare_document(stream: BinaryIO, options: dict) -> tuple[Label, EventType, EventFood, list[Person]]:
+    """Parse EPFL Alumni CSV data and some generation options.
+
+    Args:
+        stream (BinaryIO): Binary input stream with the CSV data
+        options (dict): Generation options:
+            - label_type: type of label (required, see `Label`)
+            - event_type: type of event (see `EventType`, defaults to COMPANY_VISIT)
+            - event_food: type of food provided at the event (see `EventFood`, guessed from the ticket names by default)
+            - sort_type: either 'last_name' (default), 'first_name', 'ticket' or 'membership' (see `SORT_TYPES`)
+            - tickets: mapping of ticket names to `{"visit": bool, "post_visit": bool}` (see
+              `assign_participation_types()`)
+
+    Returns:
+        Tuple with the label type, event type, event food and the sorted list of people
+
+    Raises:
+        MissingFieldError: if a required field cannot be found within the CSV header
+        ValueError: if some options are missing or invalid, or if some names are too long to fit on a label
+    """
+    label_type, event_type, event_food, sort_type = parse_options(options)
+
+    people = list(read_people(stream))
+    overflowing_names = find_overflowing_names(people, label_type)
+    if overflowing_names:
+        raise ValueError(f'Names too long to fit on a label: {", ".join(overflowing_names)}')
+
+    # NB: the order needs to be computed while the participation type is still the ticket name
+    order = get_sort_orders(people, [sort_type])[sort_type]
+
+    guessed_food = assign_participation_types(people, options.get('tickets'))
+    if event_food is None:
+        event_food = guessed_food
+
+    return label_type, event_type, event_food, [people[idx] for idx in order]
+
+
+def generate_document_from_csv(
+    stream: BinaryIO, options: dict, backend: DocumentBackend
+) -> Iterator[str] | Iterator[bytes]:
+    """Generate a document from EPFL Alumni CSV data using some document backend.
+
+    The CSV data and the options are fully processed before this function returns so that any error is raised
+    immediately. The document itself is then generated lazily, chunk by chunk.
+
+    Args:
+        stream (BinaryIO): Binary input stream with the CSV data
+        options (dict): Generation options (see `prepare_document()`), as well as `start_offset`: number of labels to
+            skip on the first page (defaults to 0)
+        backend (DocumentBackend): Backend used to generate the document (see `get_backend()`)
+
+    Raises:
+        MissingFieldError: if a required field cannot be found within the CSV header
+        ValueError: if some options are missing or invalid, or if some names are too long to fit on a label
+    """
+    start_offset = get_start_offset(options)
+    label_type, event_type, event_food, people = prepare_document(stream, options)
+    LABEL_PROPERTIES[label_type].check_start_offset(start_offset)
+    return backend.iter_generate(label_type, event_type, event_food, people, start_offset)
+
+
+def generate_latex_from_csv(stream: BinaryIO, options: dict) -> Iterator[str]:
+    """Generate a LaTeX document from EPFL Alumni CSV data.
+
+    Args:
+        stream (BinaryIO): Binary input stream with the CSV data
+        options (dict): Generation options (see `prepare_document()`)
+
+    Raises:
+        MissingFieldError: if a required field cannot be found within the CSV header
+        ValueError: if some options are missing or invalid, or if some names are too long to fit on a label
+    """
+    return generate_document_from_csv(stream, options, LatexBackend())
+
+
+def generate_pdf_from_csv(stream: BinaryIO, options: dict, font_path: str | Path | None = None) -> bytes:
+    """Generate a PDF document from EPFL Alumni CSV data (without going through LaTeX).
+
+    Args:
+        stream (BinaryIO): Binary input stream with the CSV data
+        options (dict): Generation options (see `prepare_document()`)
+        font_path (str | Path): Path to a TrueType font file to embed (Helvetica is used if not specified)
+
+    Raises:
+        MissingFieldError: if a required field cannot be found within the CSV header
+        ValueError: if some options are missing or invalid, or if some names are too long to fit on a label
+    """
+    return b''.join(generate_document_from_csv(stream, options, PdfBackend(font_path)))
@@ -0,0 +1,356 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Columnar storage of a list of participants (roster).
+
+Instead of one `Person` object per participant, a `Roster` stores each column of strings (user IDs, first and last
+names) as a single NUL-separated string and packs the membership/contributor/committee flags
+together with the index of the ticket name into a single integer per participant. The participation types are kept per
+ticket name, so that mapping the ticket names to participation types only touches one entry per ticket.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import operator
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from typing import NamedTuple
+
+from .people import SORT_TYPES, EventParticipation, Person, get_sort_orders
+
+# ==============================================================================
+
+_FLAG_MEMBER = 0b001
+_FLAG_CONTRIBUTOR = 0b010
+_FLAG_COMMITTEE = 0b100
+_FLAG_BITS = 3
+
+# ==============================================================================
+
+
+class StringColumn:
+    """Immutable column of strings stored as a single NUL-separated string.
+
+    NB: like the cookie-based roster storage, this assumes that the strings do not contain any NUL character (which is
+        not expected within CSV fields anyway).
+    """
+
+    __slots__ = ('_data', '_length', '_offsets')
+
+    def __init__(self, strings: Iterable[str] = ()):
+        """Initialize a column of strings.
+
+        Args:
+            strings (Iterable[str]): Items of the column
+
+        Raises:
+            ValueError: if some strings contain NUL characters
+        """
+        strings = list(strings)
+        self._data = '\0'.join(strings)
+        self._length = len(strings)
+        self._offsets: array | None = None
+        if self._data.count('\0') != max(self._length - 1, 0):
+            raise ValueError('Strings containing NUL characters cannot be stored within a column')
+
+    @classmethod
+    def from_string(cls, data: str, length: int) -> StringColumn:
+        """Create a column from its NUL-separated string (see `to_string()`) without splitting it.
+
+        Args:
+            data (str): NUL-separated items of the column
+            length (int): Number of items (needed to distinguish an empty column from a single empty string)
+
+        Raises:
+            ValueError: if the number of items does not match the string
+        """
+        if data.count('\0') != max(length - 1, 0) or (length == 0 and data):
+            raise ValueError(f'NUL-separated string does not contain {length} items')
+        column: StringColumn = cls.__new__(cls)
+        column._data = data
+        column._length = length
+        column._offsets = None
+        return column
+
+    def __len__(self) -> int:
+        """Number of items."""
+        return self._length
+
+    def __getitem__(self, idx: int) -> str:
+        """Retrieve the item at some (non-negative) index.
+
+        NB: the offsets of the items are only computed on the first access by index, since the columns are usually only
+            iterated over. They are the cumulative lengths of the items (without the separators), so that they are
+            computed without any Python-level loop.
+        """
+        if self._offsets is None:
+            offsets = array('I', [0])
+            offsets.extend(itertools.accumulate(map(len, self.tolist())))
+            self._offsets = offsets
+        start = self._offsets[idx] + idx
+        return self._data[start : start + self._offsets[idx + 1] - self._offsets[idx]]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the items."""
+        return iter(self.tolist())
+
+    def tolist(self) -> list[str]:
+        """Convert the column into a list of strings."""
+        return self._data.split('\0') if self._length else []
+
+    def to_string(self) -> str:
+        """NUL-separated string of the items of the column."""
+        return self._data
+
+
+class PersonRow(NamedTuple):
+    """Read-only row of a roster.
+
+    It has the same attributes as `Person`, so that it can be used anywhere a person is only read (e.g. with
+    `person_to_latex()` or the document backends).
+    """
+
+    aluso_uid: str
+    first_name: str
+    last_name: str
+    is_member: bool
+    is_contributor: bool
+    participation_type: EventParticipation | str
+    is_committee: bool
+
+    def to_person(self) -> Person:
+        """Copy the row into a `Person` instance."""
+        return Person.from_dict(self._asdict())
+
+
+# ==============================================================================
+
+
+class Roster:
+    """Columnar list of participants.
+
+    The rosters returned by `take()` and `filter()` share the columns of the original roster and only store the indices
+    of their participants, but not the participation types of the tickets (see `map_participation_types()`).
+
+    Attributes:
+        uids (StringColumn): User ID of each participant
+        first_names (StringColumn): First name of each participant
+        last_names (StringColumn): Last name of each participant
+        flags (array): Membership/contributor/committee flags of each participant, packed with the index of the ticket
+        indices (array | None): Indices of the participants within the columns (None for all of them in column order)
+        ticket_names (list[str]): Ticket names of the participants (in order of first appearance)
+        participation_types (list[EventParticipation | str]): Participation type of each ticket (initially the ticket
+            name, see `map_participation_types()`)
+    """
+
+    __slots__ = ('first_names', 'flags', 'indices', 'last_names', 'participation_types', 'ticket_names', 'uids')
+
+    def __init__(self, people: Iterable[Person | PersonRow] = ()):
+        """Initialize a roster.
+
+        Args:
+            people (Iterable[Person | PersonRow]): Participants (the participation type of which being the ticket name)
+        """
+        people = list(people)
+        self._init_columns(
+            [person.aluso_uid for person in people],
+            [person.first_name for person in people],
+            [person.last_name for person in people],
+            [person.participation_type for person in people],
+            [_pack_flags(person.is_member, person.is_contributor, person.is_committee) for person in people],
+        )
+
+    @classmethod
+    def from_dicts(cls, people: Iterable[dict]) -> Roster:
+        """Create a roster from a list of people as dictionaries (see `Person.from_dict()`)."""
+        people = list(people)
+        roster: Roster = cls.__new__(cls)
+        roster._init_columns(
+            [person.get('aluso_uid', '') for person in people],
+            [person['first_name'] for person in people],
+            [person['last_name'] for person in people],
+            [person['participation_type'] for person in people],
+            [_pack_flags(person['is_member'], person['is_contributor'], person['is_committee']) for person in people],
+        )
+        return roster
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> Roster:
+        """Create a roster from its columns (see `to_columns()`), without creating any per-participant object.
+
+        Raises:
+            ValueError: if the columns do not have the same length
+        """
+        roster: Roster = cls.__new__(cls)
+        roster.flags = array('I', columns['flags'])
+        roster.uids, roster.first_names, roster.last_names = (
+            StringColumn.from_string(columns[name], len(roster.flags)) for name in ('uids', 'first_names', 'last_names')
+        )
+        roster.indices = None
+        roster.ticket_names = list(columns['ticket_names'])
+        roster.participation_types = list(roster.ticket_names)
+        return roster
+
+    def _init_columns(
+        self, uids: list[str], first_names: list[str], last_names: list[str], tickets: list[str], flags: list[int]
+    ):
+        """Fill the columns of the roster (the flags being packed using `_pack_flags()`)."""
+        ticket_index = {ticket_name: idx for idx, ticket_name in enumerate(dict.fromkeys(tickets))}
+        self.uids = StringColumn(uids)
+        self.first_names = StringColumn(first_names)
+        self.last_names = StringColumn(last_names)
+        self.flags = array('I', map(operator.or_, (ticket_index[ticket] << _FLAG_BITS for ticket in tickets), flags))
+        self.indices = None
+        self.ticket_names = list(ticket_index)
+        self.participation_types = list(self.ticket_names)
+
+    # --------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        """Number of participants."""
+        return len(self.flags if self.indices is None else self.indices)
+
+    def __getitem__(self, idx: int) -> PersonRow:
+        """Row of the participant at some index."""
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('roster index out of range')
+        if self.indices is not None:
+            idx = self.indices[idx]
+
+        is_member, is_contributor, participation_type, is_committee = self._decode_flags(self.flags[idx])
+        return PersonRow(
+            self.uids[idx],
+            self.first_names[idx],
+            self.last_names[idx],
+            is_member,
+            is_contributor,
+            participation_type,
+            is_committee,
+        )
+
+    def __iter__(self) -> Iterator[PersonRow]:
+        """Iterate over the rows of the participants."""
+        if not len(self):
+            return iter(())
+
+        uids, first_names, last_names, flags = (
+            self._select(column)
+            for column in (self.uids.tolist(), self.first_names.tolist(), self.last_names.tolist(), self.flags)
+        )
+        # NB: the flags are decoded once per distinct value and the rows are created without any Python-level loop
+        decoded = {value: self._decode_flags(value) for value in set(flags)}
+        is_member, is_contributor, participation_type, is_committee = zip(*map(decoded.__getitem__, flags))
+        return map(
+            _make_row,
+            zip(uids, first_names, last_names, is_member, is_contributor, participation_type, is_committee),
+        )
+
+    def _select(self, column: list | array) -> list | array:
+        """Select the items of a column that belong to the roster (in order)."""
+        if self.indices is None:
+            return column
+        return list(map(column.__getitem__, self.indices))
+
+    def _decode_flags(self, flags: int) -> tuple[bool, bool, EventParticipation | str, bool]:
+        """Decode the packed flags of a participant into its membership, contributor, participation and committee."""
+        return (
+            bool(flags & _FLAG_MEMBER),
+            bool(flags & _FLAG_CONTRIBUTOR),
+            self.participation_types[flags >> _FLAG_BITS],
+            bool(flags & _FLAG_COMMITTEE),
+        )
+
+    def to_dicts(self) -> list[dict]:
+        """Convert the roster into a list of people as dictionaries (see `Person.from_dict()`)."""
+        return [row._asdict() for row in self]
+
+    def to_columns(self) -> dict:
+        """Convert the roster into JSON-serializable columns (see `from_columns()`).
+
+        The string columns are kept as NUL-separated strings and the packed flags as a list of integers, along with the
+        ticket names. The participation types are not part of the columns (see `map_participation_types()`).
+        """
+        if self.indices is None:
+            uids, first_names, last_names = self.uids, self.first_names, self.last_names
+        else:
+            uids, first_names, last_names = (
+                StringColumn(self._select(column.tolist())) for column in (self.uids, self.first_names, self.last_names)
+            )
+        return {
+            'uids': uids.to_string(),
+            'first_names': first_names.to_string(),
+            'last_names': last_names.to_string(),
+            'flags': list(self._select(self.flags)),
+            'ticket_names': list(self.ticket_names),
+        }
+
+    # --------------------------------------------------------------------------
+
+    def map_participation_types(self, ticket_data: dict[str, EventParticipation]):
+        """Replace the ticket names by participation types (in-place, only one lookup per ticket name).
+
+        Args:
+            ticket_data (dict[str, EventParticipation]): Mapping of the ticket names to participation types
+
+        Raises:
+            KeyError: if a ticket name is missing from the mapping
+        """
+        self.participation_types = [ticket_data[ticket_name] for ticket_name in self.ticket_names]
+
+    def take(self, indices: Iterable[int]) -> Roster:
+        """Create a new roster with the participants at some indices (e.g. an order from `sort_orders()`)."""
+        roster: Roster = Roster.__new__(Roster)
+        roster.uids = self.uids
+        roster.first_names = self.first_names
+        roster.last_names = self.last_names
+        roster.flags = self.flags
+        roster.indices = array('I', indices if self.indices is None else map(self.indices.__getitem__, indices))
+        roster.ticket_names = self.ticket_names
+        roster.participation_types = list(self.participation_types)
+        return roster
+
+    def filter(self, predicate: Callable[[PersonRow], bool]) -> Roster:
+        """Create a new roster with the participants for which a predicate is true."""
+        return self.take(idx for idx, person in enumerate(self) if predicate(person))
+
+    def filter_tickets(self, ticket_names: Iterable[str]) -> Roster:
+        """Create a new roster with the participants that registered with some tickets.
+
+        NB: this only compares the ticket indices packed with the flags, so no name is looked up.
+        """
+        ticket_names = set(ticket_names)
+        tickets = {idx for idx, ticket_name in enumerate(self.ticket_names) if ticket_name in ticket_names}
+        return self.take(idx for idx, flags in enumerate(self._select(self.flags)) if flags >> _FLAG_BITS in tickets)
+
+    def sort_orders(self, sort_types: Iterable[str] = SORT_TYPES) -> dict[str, list[int]]:
+        """Compute the order of the participants for several sort types (see `get_sort_orders()`)."""
+        return get_sort_orders(list(self), sort_types)
+
+
+# NB: this is what `PersonRow._make()` does, but without the overhead of a Python-level call
+_make_row = functools.partial(tuple.__new__, PersonRow)
+
+
+def _pack_flags(is_member: bool, is_contributor: bool, is_committee: bool) -> int:
+    """Pack the membership/contributor/committee flags of a person into an integer."""
+    return (
+        (_FLAG_MEMBER if is_member else 0)
+        | (_FLAG_CONTRIBUTOR if is_contributor else 0)
+        | (_FLAG_COMMITTEE if is_committee else 0)
+    )
@@ -0,0 +1,248 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Persistent database of the participants of all the events (roster database).
+
+Each uploaded list of participants is recorded as an event. The people are identified by their EPFL Alumni user ID
+(`aluso_uid`) and the database keeps their latest name, membership/contributor status and committee flag, along with
+the tickets they registered with for each event. This allows cross-event queries such as attendance counts or
+first-time attendees.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from .people import Person, get_name_key
+
+# ==============================================================================
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS people (
+        uid TEXT PRIMARY KEY,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        first_name_key TEXT NOT NULL,
+        last_name_key TEXT NOT NULL,
+        is_member INTEGER NOT NULL,
+        is_contributor INTEGER NOT NULL,
+        is_committee INTEGER NOT NULL,
+        updated REAL NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS people_name ON people (last_name_key, first_name_key)',
+    '''CREATE TABLE IF NOT EXISTS events (
+        event_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        created REAL NOT NULL
+    )''',
+    '''CREATE TABLE IF NOT EXISTS registrations (
+        event_id INTEGER NOT NULL REFERENCES events (event_id) ON DELETE CASCADE,
+        uid TEXT NOT NULL,
+        ticket TEXT NOT NULL,
+        PRIMARY KEY (event_id, uid, ticket)
+    )''',
+    'CREATE INDEX IF NOT EXISTS registrations_uid ON registrations (uid)',
+    'CREATE INDEX IF NOT EXISTS registrations_ticket ON registrations (ticket)',
+)
+
+_UPSERT_PERSON = '''INSERT INTO people (
+    uid, first_name, last_name, first_name_key, last_name_key, is_member, is_contributor, is_committee, updated
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (uid) DO UPDATE SET
+    first_name = excluded.first_name,
+    last_name = excluded.last_name,
+    first_name_key = excluded.first_name_key,
+    last_name_key = excluded.last_name_key,
+    is_member = excluded.is_member,
+    is_contributor = excluded.is_contributor,
+    is_committee = excluded.is_committee,
+    updated = excluded.updated'''
+
+# ==============================================================================
+
+
+class RosterDatabase:
+    """SQLite database of the participants of all the events.
+
+    The people are indexed by user ID, the registrations by event, user ID and ticket name. People without a user ID
+    cannot be matched across events and are therefore not recorded.
+    """
+
+    def __init__(self, path: str | Path):
+        """Initialize a roster database (the database file is created if needed).
+
+        Args:
+            path (str | Path): Path to the SQLite database file
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a connection to the database and commit the transaction on exit."""
+        with contextlib.closing(sqlite3.connect(self._path, timeout=10)) as conn, conn:
+            conn.execute('PRAGMA foreign_keys = ON')
+            yield conn
+
+    def save_event(self, event: str, people: Iterable[Person]) -> int:
+        """Record the participants of an event (replacing any previous registrations for that event).
+
+        All the rows are inserted using batched statements within a single transaction.
+
+        Args:
+            event (str): Name of the event
+            people (Iterable[Person]): Participants of the event (the participation type being the ticket name)
+
+        Returns:
+            The number of registrations recorded
+        """
+        now = time.time()
+        people_rows = {}
+        registrations = set()
+        for person in people:
+            if not person.aluso_uid:
+                continue
+            people_rows[person.aluso_uid] = (
+                person.aluso_uid,
+                person.first_name,
+                person.last_name,
+                get_name_key(person.first_name),
+                get_name_key(person.last_name),
+                person.is_member,
+                person.is_contributor,
+                person.is_committee,
+                now,
+            )
+            registrations.add((person.aluso_uid, str(person.participation_type)))
+
+        with self._connect() as conn:
+            conn.execute('INSERT INTO events (name, created) VALUES (?, ?) ON CONFLICT (name) DO NOTHING', (event, now))
+            (event_id,) = conn.execute('SELECT event_id FROM events WHERE name = ?', (event,)).fetchone()
+            conn.executemany(_UPSERT_PERSON, people_rows.values())
+            conn.execute('DELETE FROM registrations WHERE event_id = ?', (event_id,))
+            conn.executemany(
+                'INSERT INTO registrations (event_id, uid, ticket) VALUES (?, ?, ?)',
+                ((event_id, uid, ticket) for uid, ticket in registrations),
+            )
+        return len(registrations)
+
+    def delete_event(self, event: str):
+        """Delete an event and all of its registrations."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM events WHERE name = ?', (event,))
+
+    def get_events(self) -> list[str]:
+        """List the names of the recorded events (oldest first)."""
+        with self._connect() as conn:
+            return [name for (name,) in conn.execute('SELECT name FROM events ORDER BY created, event_id')]
+
+    def get_person(self, uid: str) -> Person | None:
+        """Retrieve the latest recorded data of a person (None if unknown).
+
+        NB: the participation type of the returned person is the ticket name of his/her latest registration.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                '''SELECT p.uid, p.first_name, p.last_name, p.is_member, p.is_contributor, p.is_committee, r.ticket
+                FROM people p
+                JOIN registrations r ON r.uid = p.uid
+                JOIN events e ON e.event_id = r.event_id
+                WHERE p.uid = ?
+                ORDER BY e.created DESC, e.event_id DESC
+                LIMIT 1''',
+                (uid,),
+            ).fetchone()
+        if row is None:
+            return None
+        uid, first_name, last_name, is_member, is_contributor, is_committee, ticket = row
+        return Person.from_dict(
+            {
+                'aluso_uid': uid,
+                'first_name': first_name,
+                'last_name': last_name,
+                'is_member': bool(is_member),
+                'is_contributor': bool(is_contributor),
+                'participation_type': ticket,
+                'is_committee': bool(is_committee),
+            }
+        )
+
+    def find_people(self, last_name: str, first_name: str = '') -> list[str]:
+        """Find the user IDs of the people with a given name (accent and case-insensitive, first name optional)."""
+        query = 'SELECT uid FROM people WHERE last_name_key = ?'
+        args = [get_name_key(last_name)]
+        if first_name:
+            query += ' AND first_name_key = ?'
+            args.append(get_name_key(first_name))
+        with self._connect() as conn:
+            return [uid for (uid,) in conn.execute(query, args)]
+
+    # --------------------------------------------------------------------------
+
+    def attendance_counts(self, event: str | None = None) -> dict[str, int]:
+        """Count the number of events attended by each person.
+
+        Args:
+            event (str | None): Only count the attendances of the participants of that event (all people if None)
+        """
+        query = 'SELECT uid, COUNT(DISTINCT event_id) FROM registrations'
+        args = []
+        if event is not None:
+            query += ' WHERE uid IN (SELECT r.uid FROM registrations r JOIN events e USING (event_id) WHERE e.name = ?)'
+            args.append(event)
+        with self._connect() as conn:
+            return dict(conn.execute(query + ' GROUP BY uid', args))
+
+    def first_time_attendees(self, event: str) -> list[str]:
+        """List the user IDs of the participants of an event that did not attend any earlier event."""
+        with self._connect() as conn:
+            return [
+                uid
+                for (uid,) in conn.execute(
+                    '''SELECT DISTINCT r.uid
+                    FROM registrations r
+                    JOIN events e ON e.event_id = r.event_id
+                    WHERE e.name = ? AND NOT EXISTS (
+                        SELECT 1
+                        FROM registrations r2
+                        JOIN events e2 ON e2.event_id = r2.event_id
+                        WHERE r2.uid = r.uid
+                            AND (e2.created < e.created OR e2.created = e.created AND e2.event_id < e.event_id)
+                    )
+                    ORDER BY r.uid''',
+                    (event,),
+                )
+            ]
+
+    def ticket_counts(self, event: str) -> dict[str, int]:
+        """Count the number of participants of an event for each ticket name."""
+        with self._connect() as conn:
+            return dict(
+                conn.execute(
+                    '''SELECT r.ticket, COUNT(*)
+                    FROM registrations r
+                    JOIN events e ON e.event_id = r.event_id
+                    WHERE e.name = ?
+                    GROUP BY r.ticket''',
+                    (event,),
+                )
+            )
@@ -0,0 +1,129 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Snapshots of the participants of an event for which labels were already generated.
+
+A snapshot maps the user ID (`aluso_uid`) of each participant to a fingerprint of everything that ends up on his/her
+label. Comparing a new list of participants with the snapshot of a previous run gives the participants that are new or
+whose label changed (delta labels).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+from .people import Person
+
+# ==============================================================================
+
+
+def person_fingerprint(person: Person) -> str:
+    """Compute a fingerprint of the label of a person (the participation type must already be assigned)."""
+    data = '\x1f'.join(
+        [
+            person.first_name,
+            person.last_name,
+            str(int(person.is_member)),
+            str(int(person.is_contributor)),
+            str(int(person.is_committee)),
+            str(person.participation_type.value),
+        ]
+    )
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def take_snapshot(people: Iterable[Person]) -> dict[str, str]:
+    """Take a snapshot of a list of people (people without a user ID are skipped)."""
+    return {person.aluso_uid: person_fingerprint(person) for person in people if person.aluso_uid}
+
+
+def diff_people(people: Iterable[Person], snapshot: dict[str, str]) -> list[Person]:
+    """Select the people that are new or whose label changed since a snapshot was taken.
+
+    This is a hash join on the user IDs, ie. it runs in linear time. People without a user ID cannot be matched with
+    the snapshot and are therefore always selected.
+
+    Args:
+        people (Iterable[Person]): List of people (keeps the same order)
+        snapshot (dict[str, str]): Snapshot of a previous run (see `take_snapshot()`)
+    """
+    return [
+        person
+        for person in people
+        if not person.aluso_uid or snapshot.get(person.aluso_uid) != person_fingerprint(person)
+    ]
+
+
+# ==============================================================================
+
+
+def load_snapshot(path: str | Path) -> dict[str, str] | None:
+    """Load a snapshot from a JSON file (None if the file does not exist).
+
+    Raises:
+        ValueError: if the file is not a valid snapshot file
+    """
+    try:
+        with Path(path).open(encoding='utf-8') as fd:
+            data = json.load(fd)
+    except FileNotFoundError:
+        return None
+
+    if not isinstance(data, dict) or not isinstance(data.get('people'), dict):
+        raise ValueError(f'Invalid snapshot file: {path}')
+    return data['people']
+
+
+def save_snapshot(path: str | Path, snapshot: dict[str, str], event: str = ''):
+    """Save a snapshot into a JSON file (the file is replaced atomically).
+
+    Args:
+        path (str | Path): Path to the JSON file
+        snapshot (dict[str, str]): Snapshot to save (see `take_snapshot()`)
+        event (str): Name of the event (only informative)
+    """
+    path = Path(path)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, suffix='.tmp', delete=False) as fd:
+        json.dump({'event': event, 'people': snapshot}, fd)
+    Path(fd.name).replace(path)
+
+
+class SnapshotStore:
+    """Directory of snapshots, one per event."""
+
+    def __init__(self, directory: str | Path):
+        """Initialize a snapshot store.
+
+        Args:
+            directory (str | Path): Directory where the snapshots are stored
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, event: str) -> Path:
+        """Path to the snapshot file of an event."""
+        return self._directory / f'{hashlib.sha256(event.encode("utf-8")).hexdigest()}.json'
+
+    def load(self, event: str) -> dict[str, str] | None:
+        """Retrieve the snapshot of an event (None if there is none)."""
+        return load_snapshot(self.path(event))
+
+    def save(self, event: str, snapshot: dict[str, str]):
+        """Store the snapshot of an event (replacing any previous one)."""
+        save_snapshot(self.path(event), snapshot, event)
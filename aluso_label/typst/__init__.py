@@ -0,0 +1,40 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Typst utilities."""
+
+from collections.abc import Iterable, Iterator
+
+from aluso_label.event import EventFood, EventType
+from aluso_label.latex import Label
+from aluso_label.people import Person
+
+from .typst_document import TypstDocument
+
+
+def generate_typst_document(
+    label_type: Label, event_type: EventType, event_food: EventFood, people: Iterable[Person]
+) -> str:
+    """Generate a Typst document."""
+    document = TypstDocument(label_type, event_type, event_food)
+    return document.generate(people)
+
+
+def iter_typst_document(
+    label_type: Label, event_type: EventType, event_food: EventFood, people: Iterable[Person]
+) -> Iterator[str]:
+    """Generate a Typst document as a stream of text chunks."""
+    document = TypstDocument(label_type, event_type, event_food)
+    return document.iter_generate(people)
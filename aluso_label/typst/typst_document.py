@@ -0,0 +1,279 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Typst utilities."""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import textwrap
+from collections.abc import Iterable, Iterator
+
+from aluso_label.event import EventFood, EventType
+from aluso_label.icons import (
+    EPFL_LOGO,
+    EVENT_FOOD_ICONS,
+    EVENT_TYPE_ICONS,
+    ICON_COMMITTEE,
+    ICON_CONTRIBUTOR,
+    ICON_EXTERNAL,
+    ICON_MEMBER,
+    Icon,
+)
+from aluso_label.latex import LABEL_PROPERTIES, Label, LabelProperties
+from aluso_label.latex.latex_document import get_stretch_factor
+from aluso_label.people import EventParticipation, Person
+
+# ==============================================================================
+
+
+def typst_string(value: str) -> str:
+    """Convert a Python string into a Typst string literal."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def typst_name(name: str, max_width: float) -> str:
+    """Serialize a (possibly horizontally stretched) name into Typst.
+
+    Args:
+        name (str): Name to serialize
+        max_width (float): Width available for the name (in millimeters, see `LabelProperties.name_width`)
+    """
+    stretch = get_stretch_factor(name, max_width)
+    if stretch != 1:
+        return f'name({typst_string(name)}, stretch: {stretch * 100:.3f}%)'
+    return f'name({typst_string(name)})'
+
+
+def person_to_typst(person: Person, label_type: Label) -> str:
+    """Serialize a Person into Typst."""
+    max_width = LABEL_PROPERTIES[label_type].name_width
+
+    first_name = typst_name(person.first_name, max_width)
+    last_name = typst_name(person.last_name, max_width)
+
+    if person.is_contributor:
+        member_icons = ['contrib-icon']
+    elif person.is_member:
+        member_icons = ['member-icon']
+    else:
+        member_icons = ['external-icon']
+
+    if person.is_committee:
+        member_icons.append('committee-icon')
+
+    visit_icon = 'visit-icon' if EventParticipation.VISIT in person.participation_type else 'empty-icon'
+
+    post_visit_icon = 'post-visit-icon' if EventParticipation.POST_VISIT in person.participation_type else 'empty-icon'
+
+    return f'add-person({first_name}, {last_name}, ({", ".join(member_icons)},), {visit_icon}, {post_visit_icon})'
+
+
+def _icon_to_typst(icon: Icon) -> str:
+    """Serialize an icon into Typst (as an SVG image)."""
+    return f'svg-icon({typst_string(icon.to_svg())})'
+
+
+def _label_geometry_to_typst(properties: LabelProperties) -> str:
+    """Generate the Typst code for a given label geometry."""
+    label_margin = ', '.join(f'{side}: {value}mm' for side, value in properties.label_margin._asdict().items())
+    page_margin = properties.page_margin
+    return textwrap.dedent(
+        f'''
+        // Label configuration for: {properties.name}
+        #let label-cols = {properties.cols}
+        #let label-rows = {properties.rows}
+        #let label-width = {properties.width}mm
+        #let label-height = {properties.height}mm
+        #let label-column-gutter = {properties.inter_col}mm
+        #let label-row-gutter = {properties.inter_row}mm
+        #let label-inset = ({label_margin})
+
+        #set page(paper: "a4", margin: (left: {page_margin.left}mm, top: {page_margin.top}mm, rest: 0mm))
+        '''
+    )
+
+
+# ==============================================================================
+
+_DOCUMENT_END = '// Local Variables:\n// mode: typst\n// End:\n'
+
+_HEADER = '''// Generated label sheet (requires Typst 0.13 or later)
+{label_type}
+#set text(font: ("Arial", "Liberation Sans", "Helvetica"), size: 12pt)
+#set par(leading: 0.53em)
+
+// ==============================================================================
+// Marks and icons
+
+#let svg-icon(data) = box(image(bytes(data), format: "svg"))
+#let empty-icon = h(5.4mm)
+
+#let external-icon = {external}
+#let member-icon = {member}
+#let contrib-icon = {contrib}
+#let committee-icon = {committee}
+
+#let visit-icon = {visit}
+#let post-visit-icon = {post_visit}
+
+#let epfl-logo = {logo}
+#let logo-width = 2.4cm
+
+// ==============================================================================
+// Label functions
+
+#let name(value, stretch: 100%) = scale(x: stretch, origin: left, reflow: true, value.replace(" ", sym.space.thin))
+
+#let add-person(first-name, last-name, member-icons, visit, post-visit) = box(
+  width: label-width,
+  height: label-height,
+  inset: label-inset,
+  {{
+    grid(
+      columns: (logo-width, 1fr),
+      align: horizon,
+      epfl-logo,
+      text(size: 14.4pt, first-name + linebreak() + last-name),
+    )
+    v(.5em)
+    grid(
+      columns: (logo-width, 1fr),
+      align: bottom,
+      member-icons.join(h(0.278em)),
+      {event_icons},
+    )
+  }},
+)
+
+#let label-sheet(..labels) = {{
+  pagebreak(weak: true)
+  grid(
+    columns: (label-width,) * label-cols,
+    rows: label-height,
+    column-gutter: label-column-gutter,
+    row-gutter: label-row-gutter,
+    ..labels.pos(),
+  )
+}}
+
+// ==============================================================================
+'''
+
+# ==============================================================================
+
+
+class TypstDocument:
+    """A Typst document."""
+
+    def __init__(self, label: Label, event_type: EventType, event_food: EventFood):
+        """Initialize a Typst document instance.
+
+        Args:
+            label (Label): Type of label to generate
+            event_type (EventType): Type of event
+            event_food (EventFood): Type of food provided (if any)
+        """
+        self._label_type = label
+        self._event_type = event_type
+        self._event_food = event_food
+
+    def iter_generate(self, people: Iterable[Person], start_offset: int = 0) -> Iterator[str]:
+        """Generate a Typst document chunk by chunk.
+
+        The header is yielded first, followed by one chunk per person (grouped into one label sheet per page) and
+        finally the document footer.
+
+        Args:
+            people (Iterable[Person]): Participants to generate a label for
+            start_offset (int): Number of labels to skip on the first page (e.g. to reuse a partially used sheet)
+
+        Raises:
+            ValueError: if the start offset is invalid
+        """
+        # NB: the start offset is checked before the generation actually starts
+        LABEL_PROPERTIES[self._label_type].check_start_offset(start_offset)
+        return self._iter_document(people, start_offset)
+
+    def generate(self, people: Iterable[Person], start_offset: int = 0) -> str:
+        """Generate a Typst document."""
+        return ''.join(self.iter_generate(people, start_offset))
+
+    @property
+    def event_type(self) -> EventType:
+        """Getter for the event type."""
+        return self._event_type
+
+    @property
+    def event_food(self) -> EventFood:
+        """Getter for the event food."""
+        return self._event_food
+
+    @property
+    def label_type(self) -> Label:
+        """Getter for the label type."""
+        return self._label_type
+
+    def _iter_document(self, people: Iterable[Person], start_offset: int) -> Iterator[str]:
+        """Generate a Typst document chunk by chunk (see `iter_generate()`)."""
+        yield TypstDocument._build_header(self._label_type, self._event_type, self._event_food)
+
+        labels_per_page = LABEL_PROPERTIES[self._label_type].labels_per_page
+        people = iter(people)
+        page_offset = start_offset
+        while True:
+            page_people = list(itertools.islice(people, labels_per_page - page_offset))
+            if not page_people:
+                break
+            yield '\n#label-sheet(\n'
+            yield '  [],\n' * page_offset
+            for person in page_people:
+                yield f'  {person_to_typst(person, self._label_type)},\n'
+            yield ')\n'
+            page_offset = 0
+
+        yield '\n' + _DOCUMENT_END
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _build_header(label_type: Label, event_type: EventType, event_food: EventFood) -> str:
+        """Build the Typst header for a given combination of label, event type and event food."""
+        visit_icon = 'empty-icon'
+        if event_type in EVENT_TYPE_ICONS:
+            visit_icon = _icon_to_typst(EVENT_TYPE_ICONS[event_type])
+
+        post_visit_icon = 'empty-icon'
+        if event_food in EVENT_FOOD_ICONS:
+            post_visit_icon = _icon_to_typst(EVENT_FOOD_ICONS[event_food])
+
+        if event_type == EventType.MEAL_ONLY:
+            event_icons = 'post-visit'  # skip 'visit' icon
+        elif event_food != EventFood.NOTHING:
+            event_icons = 'visit + h(0.278em) + post-visit'
+        else:
+            event_icons = 'visit'  # skip 'food' icon
+
+        return _HEADER.format(
+            label_type=_label_geometry_to_typst(LABEL_PROPERTIES[label_type]),
+            external=_icon_to_typst(ICON_EXTERNAL),
+            member=_icon_to_typst(ICON_MEMBER),
+            contrib=_icon_to_typst(ICON_CONTRIBUTOR),
+            committee=_icon_to_typst(ICON_COMMITTEE),
+            visit=visit_icon,
+            post_visit=post_visit_icon,
+            logo=_icon_to_typst(EPFL_LOGO),
+            event_icons=event_icons,
+        )
@@ -0,0 +1,99 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""JSON API utilities."""
+
+from __future__ import annotations
+
+import io
+import json
+
+from flask import Response, jsonify, request
+
+from aluso_label.csv_import import MissingFieldError
+from aluso_label.pipeline import generate_latex_from_csv
+from aluso_label.roster import PersonRow
+
+from .roster_store import load_roster
+
+_DEFAULT_PAGE_SIZE = 50
+_MAX_PAGE_SIZE = 500
+
+
+def get_roster_page():
+    """Return a page of the list of participants associated with the current session.
+
+    NB: the loaded roster is cached between the requests of a session (see `load_roster()`) and only the rows of the
+        requested page are created, so the time taken does not depend on the number of participants.
+    """
+    roster = load_roster()
+    if roster is None:
+        return jsonify({'error': 'No list of participants found (did you upload a CSV file?)'}), 404
+
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', _DEFAULT_PAGE_SIZE, type=int), 0), _MAX_PAGE_SIZE)
+
+    people = roster['people']
+    return jsonify(
+        {
+            'offset': offset,
+            'limit': limit,
+            'total': len(people),
+            'columns': list(PersonRow._fields),
+            'people': [people[idx]._asdict() for idx in range(offset, min(offset + limit, len(people)))],
+        }
+    )
+
+
+def generate_labels():
+    """Generate the LaTeX code for a CSV file in a single stateless request.
+
+    The request is either a multipart form with the CSV file in the `csv_file` field or a JSON object with the CSV data
+    in the `csv` key. The following options are supported:
+      - label_type: type of label (required, see `Label`)
+      - event_type: type of event (see `EventType`, defaults to COMPANY_VISIT)
+      - event_food: type of food provided at the event (see `EventFood`, guessed from the ticket names by default)
+      - sort_type: either 'last_name' (default), 'first_name', 'ticket' or 'membership'
+      - tickets: mapping of ticket names to `{"visit": bool, "post_visit": bool}` (guessed from the ticket names by
+                 default). For multipart forms, this needs to be a JSON-encoded string.
+      - start_offset: number of labels to skip on the first page, e.g. to reuse a partially used sheet (defaults to 0)
+
+    See `generate_latex_from_csv()` for more information.
+    """
+    if request.is_json:
+        options = request.get_json()
+        if not isinstance(options, dict) or not isinstance(options.get('csv'), str):
+            return jsonify({'error': 'Missing CSV data (`csv` key)'}), 400
+        stream = io.BytesIO(options['csv'].encode('utf-8'))
+    else:
+        options = request.form.to_dict()
+        if 'csv_file' not in request.files:
+            return jsonify({'error': 'Missing CSV file (`csv_file` field)'}), 400
+        stream = request.files['csv_file'].stream
+        try:
+            options['tickets'] = json.loads(options.get('tickets', '{}'))
+        except json.JSONDecodeError as err:
+            return jsonify({'error': f'Invalid JSON data for ticket options: {err}'}), 400
+
+    try:
+        chunks = generate_latex_from_csv(stream, options)
+    except (MissingFieldError, ValueError) as err:
+        return jsonify({'error': str(err)}), 400
+
+    return Response(
+        chunks,
+        mimetype='application/x-tex',
+        headers={'Content-Disposition': 'attachment; filename=labels.tex'},
+    )
@@ -0,0 +1,137 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Local PDF compilation utilities."""
+
+from __future__ import annotations
+
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+from flask import Flask, current_app, jsonify, request, send_file, url_for
+
+from aluso_label.latex import LatexPage
+from aluso_label.latex.compilation import (
+    DEFAULT_CACHE_MAX_SIZE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_ENGINE_COMMAND,
+    DEFAULT_MAX_PENDING,
+    DEFAULT_MERGE_COMMAND,
+    CommandEngine,
+    CommandMerger,
+    CompilationQueue,
+    JobStatus,
+    QueueFullError,
+    QueueLimits,
+)
+
+
+def init_compilation_queue(app: Flask):
+    """Create the local compilation queue for a Flask application (if enabled).
+
+    The following configuration variables are used:
+      - LATEX_COMPILE: enable local compilation of the generated LaTeX code (disabled by default)
+      - LATEX_ENGINE_COMMAND: command used to compile a LaTeX file (XeLaTeX by default)
+      - LATEX_MERGE_COMMAND: command used to merge the PDF files of documents compiled page by page (pdfunite by
+        default)
+      - LATEX_COMPILE_WORKERS: maximum number of concurrent compilations
+      - LATEX_CACHE_DIR: directory where the generated PDF files are cached
+      - LATEX_CACHE_MAX_SIZE: maximum size in bytes of the cache directory
+      - LATEX_CACHE_TTL: time in seconds after which unused files are removed from the cache directory
+      - LATEX_COMPILE_MAX_PENDING: maximum number of pending compilation jobs
+    """
+    if not app.config.get('LATEX_COMPILE', False):
+        return
+
+    app.extensions['compilation_queue'] = CompilationQueue(
+        CommandEngine(app.config.get('LATEX_ENGINE_COMMAND', DEFAULT_ENGINE_COMMAND)),
+        app.config.get('LATEX_CACHE_DIR', Path(tempfile.gettempdir()) / 'aluso_label' / 'pdf'),
+        max_workers=app.config.get('LATEX_COMPILE_WORKERS', 2),
+        merger=CommandMerger(app.config.get('LATEX_MERGE_COMMAND', DEFAULT_MERGE_COMMAND)),
+        limits=QueueLimits(
+            max_pending=int(app.config.get('LATEX_COMPILE_MAX_PENDING', DEFAULT_MAX_PENDING)),
+            cache_max_size=int(app.config.get('LATEX_CACHE_MAX_SIZE', DEFAULT_CACHE_MAX_SIZE)),
+            cache_ttl=float(app.config.get('LATEX_CACHE_TTL', DEFAULT_CACHE_TTL)),
+        ),
+    )
+
+
+def register_latex_pages(pages: Iterable[LatexPage]) -> str | None:
+    """Register a LaTeX document split into pages for a later compilation (None if local compilation is disabled).
+
+    NB: the pages are generated and written into the cache directory in the background, ie. `pages` must not depend on
+        the request context.
+    """
+    queue = current_app.extensions.get('compilation_queue')
+    if queue is None:
+        return None
+    return queue.register_pages_in_background(page.latex for page in pages)
+
+
+def _job_to_json(job):
+    """Convert a compilation job into a JSON response."""
+    data = {
+        'job_id': job.job_id,
+        'status': job.status.name,
+        'status_url': url_for('get_compilation_status', job_id=job.job_id),
+    }
+    if job.status == JobStatus.DONE:
+        data['pdf_url'] = url_for('get_compiled_pdf', job_id=job.job_id)
+    elif job.status == JobStatus.FAILED:
+        data['error'] = job.error
+    return jsonify(data)
+
+
+def submit_compilation():
+    """Submit a document registered page by page for compilation into a PDF file.
+
+    NB: only the documents generated by the server (see `register_latex_pages()`) can be compiled, arbitrary LaTeX code
+        submitted by clients is rejected since TeX is able to read files on the server.
+    """
+    queue = current_app.extensions.get('compilation_queue')
+    if queue is None:
+        return jsonify({'error': 'Local compilation is disabled'}), 404
+
+    document_id = request.form.get('document_id')
+    if not document_id:
+        return jsonify({'error': 'Missing document ID (only documents generated by the server can be compiled)'}), 400
+
+    try:
+        job = queue.submit_pages(document_id)
+    except QueueFullError as err:
+        return jsonify({'error': str(err)}), 503
+    if job is None:
+        return jsonify({'error': f'No such document: {document_id}'}), 404
+
+    return _job_to_json(job), 200 if job.status == JobStatus.DONE else 202
+
+
+def get_compilation_status(job_id):
+    """Return the status of a compilation job."""
+    queue = current_app.extensions.get('compilation_queue')
+    job = queue.get(job_id) if queue is not None else None
+    if job is None:
+        return jsonify({'error': f'No such compilation job: {job_id}'}), 404
+    return _job_to_json(job)
+
+
+def get_compiled_pdf(job_id):
+    """Return the PDF file of a finished compilation job."""
+    queue = current_app.extensions.get('compilation_queue')
+    job = queue.get(job_id) if queue is not None else None
+    if job is None or job.status != JobStatus.DONE:
+        return jsonify({'error': f'No PDF file available for job: {job_id}'}), 404
+    return send_file(queue.pdf_path(job_id), mimetype='application/pdf', download_name='labels.pdf')
@@ -15,14 +15,22 @@
 
 """Main for Flask app."""
 
+from __future__ import annotations
+
 import os
 
 from flask import Flask
 
+from aluso_label.latex import set_person_cache_size
 from aluso_label.people import Person
 
+from .api import generate_labels, get_roster_page
+from .compilation import get_compilation_status, get_compiled_pdf, init_compilation_queue, submit_compilation
 from .help import show_help
 from .process import process_people_list
+from .roster_db import init_roster_db
+from .roster_store import init_roster_store
+from .snapshots import init_snapshot_store
 from .upload import upload_file
 
 
@@ -34,17 +42,39 @@ def add_version_info_to_template():
     return {'version': version}
 
 
-def create_app():
-    """Create and configure the application."""
+def create_app(test_config: dict | None = None) -> Flask:
+    """Create and configure the application.
+
+    Args:
+        test_config: Configuration overriding the one from the environment (e.g. to isolate the tests)
+    """
     aluso_app = Flask(__name__, instance_relative_config=True, template_folder='templates')
     aluso_app.config.from_mapping(SECRET_KEY='dev')  # noqa: S106
     aluso_app.config.from_prefixed_env()
+    if test_config is not None:
+        aluso_app.config.update(test_config)
+
+    # NB: empty entries are ignored, otherwise all the participants without a user ID would be committee members
+    Person.COMMITTEE_LIST = {
+        uid.strip() for uid in aluso_app.config.get('COMMITTEE_LIST', '').split(',') if uid.strip()
+    }
+
+    if 'LATEX_PERSON_CACHE_SIZE' in aluso_app.config:
+        set_person_cache_size(int(aluso_app.config['LATEX_PERSON_CACHE_SIZE']))
 
-    Person.COMMITTEE_LIST = {uid.strip() for uid in aluso_app.config.get('COMMITTEE_LIST', '').split(',')}
+    init_roster_store(aluso_app)
+    init_roster_db(aluso_app)
+    init_compilation_queue(aluso_app)
+    init_snapshot_store(aluso_app)
 
     aluso_app.add_url_rule('/', view_func=upload_file, methods=['GET', 'POST'])
     aluso_app.add_url_rule('/process', view_func=process_people_list, methods=['GET', 'POST'])
     aluso_app.add_url_rule('/help', view_func=show_help, methods=['GET'])
+    aluso_app.add_url_rule('/api/roster', view_func=get_roster_page, methods=['GET'])
+    aluso_app.add_url_rule('/api/v1/labels', view_func=generate_labels, methods=['POST'])
+    aluso_app.add_url_rule('/api/v1/compile', view_func=submit_compilation, methods=['POST'])
+    aluso_app.add_url_rule('/api/v1/compile/<job_id>', view_func=get_compilation_status, methods=['GET'])
+    aluso_app.add_url_rule('/api/v1/compile/<job_id>/pdf', view_func=get_compiled_pdf, methods=['GET'])
     aluso_app.context_processor(add_version_info_to_template)
     return aluso_app
 
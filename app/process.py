@@ -17,70 +17,30 @@
 
 from __future__ import annotations
 
-import re
-
-from flask import redirect, render_template, request, session, url_for
-
-from aluso_label.event import EventFood, EventType
-from aluso_label.latex import LABEL_PROPERTIES, Label, generate_latex_document
-from aluso_label.people import EventParticipation, Person
-
-
-def convert_people_list_to_html(people: dict) -> str:
-    """Convert a list of people into an HTML table."""
-    if not people:
-        return ''
-
-    html = (
-        '''
-        <table>
-            <thead>
-            <tr>
-    '''
-        + '\n                    '.join(f'<th>{key}</th>' for key in people[0])
-        + r'''
-            </tr>
-            </thead>
-            <tbody>
-    '''
-    )
-
-    for person in people:
-        html += (
-            '            <tr>\n'
-            + '\n                    '.join(f'<td><pre>{person[data]}</pre></td>' for data in person)
-            + '\n            </tr>\n'
-        )
+from flask import Response, abort, current_app, redirect, render_template, request, stream_template, url_for
 
-    html += r'''
-            </tbody>
-        </table>
-    '''
+from aluso_label.backends import BACKENDS, get_backend
+from aluso_label.event import EventFood, EventType, get_ticket_id, guess_ticket_options
+from aluso_label.latex import LABEL_PROPERTIES, Label, LatexDocument, find_overflowing_names
+from aluso_label.people import SORT_TYPES, get_participation_type
+from aluso_label.roster import PersonRow
 
-    return html
+from .compilation import register_latex_pages
+from .roster_store import clear_roster, load_roster
+from .snapshots import save_snapshot_when_done, select_new_people
 
 
-def process_people_list_get(ticket_names, ticket_ids):
+def process_people_list_get(roster, ticket_ids):
     """Process GET requests for the list of participants."""
-    session['people_csv_html'] = convert_people_list_to_html(session['people'])
-    table_labels = [
-        f'td:nth-of-type({idx + 1}):before {{ content: "{key}"; }}' for idx, key in enumerate(session['people'][0])
-    ]
-    session['ticket_names_str'] = str(ticket_names)
-
-    ticket_checkboxes = {'visit': ['checked'] * len(ticket_ids), 'postvisit': [''] * len(ticket_ids)}
-
-    meal_option = EventFood.NOTHING
-
-    for idx, (name, _) in enumerate(zip(ticket_names, ticket_checkboxes['postvisit'])):
-        if re.search(r'(avec|with)\s+(repas|souper|d[iî]ner|meal|lunch|dinner)', name, re.IGNORECASE):
-            meal_option = EventFood.MEAL if meal_option == EventFood.NOTHING else meal_option
-            ticket_checkboxes['postvisit'][idx] = 'checked'
-        elif re.search(r'(avec|with)\s+ap[eé]ro', name, re.IGNORECASE):
-            meal_option = EventFood.APERO if meal_option == EventFood.NOTHING else meal_option
-            ticket_checkboxes['postvisit'][idx] = 'checked'
-        elif re.search(r'visite?\s+(seule|uniquement|only)', name, re.IGNORECASE):
-            pass
+    ticket_names = roster['ticket_names']
+    columns = list(PersonRow._fields)
+    table_labels = [f'td:nth-of-type({idx + 1}):before {{ content: "{key}"; }}' for idx, key in enumerate(columns)]
+
+    post_visit, meal_option = guess_ticket_options(ticket_names)
+    ticket_checkboxes = {
+        'visit': ['checked'] * len(ticket_ids),
+        'postvisit': ['checked' if checked else '' for checked in post_visit],
+    }
 
     meal_radio_button = {'no_meal': '', 'apero': '', 'meal': ''}
     if meal_option == EventFood.MEAL:
@@ -92,6 +52,7 @@ def process_people_list_get(ticket_names, ticket_ids):
 
     return render_template(
         'process.html',
+        ticket_names=ticket_names,
         ticket_ids=ticket_ids,
         ticket_visit_checked=ticket_checkboxes['visit'],
         ticket_postvisit_checked=ticket_checkboxes['postvisit'],
@@ -102,63 +63,98 @@ def process_people_list_get(ticket_names, ticket_ids):
         zip=zip,
         table_style='\n'.join(table_labels),
         label_properties=[(str(label_type), label_props.name) for label_type, label_props in LABEL_PROPERTIES.items()],
+        output_formats=[(name, backend.description) for name, backend in BACKENDS.items()],
+        columns=columns,
+        sort_types=list(SORT_TYPES.items()),
+        snapshots_enabled='snapshot_store' in current_app.extensions,
     )
 
 
-def process_people_list_post(ticket_names, ticket_ids):
+def process_people_list_post(roster, ticket_ids):
     """Process POST requests for the list of participants."""
-    ticket_data = {}
-    for ticket, uid in zip(ticket_names, ticket_ids):
-        participation_type = EventParticipation.NOTHING
-        if int(request.form.get(f'{uid}_visit', '0')):
-            participation_type |= EventParticipation.VISIT
-        if int(request.form.get(f'{uid}_post_visit', '0')):
-            participation_type |= EventParticipation.POST_VISIT
-
-        participation_type ^= EventParticipation.NOTHING
-        ticket_data[ticket] = participation_type
-
-    people = []
-    for person in session['people']:
-        person['participation_type'] = ticket_data[person['participation_type']]
-        people.append(Person.from_dict(person))
-
-    def _sort_by_last_name(person: Person) -> tuple[str, str]:
-        return person.last_name, person.first_name
-
-    def _sort_by_first_name(person: Person) -> tuple[str, str]:
-        return person.first_name, person.last_name
-
-    # NB: By default, sort by last name and if equal, by first name
-    sort_func = _sort_by_last_name
-    if request.form['sort_type'] == 'first_name':
-        sort_func = _sort_by_first_name
-
-    people = sorted(people, key=sort_func)
-
-    latex_code = generate_latex_document(
-        Label[request.form['label_type'].replace(f'{Label.__name__}.', '')],
-        EventType[request.form['event_type_visit']],
-        EventFood[request.form['event_type_post_visit']],
-        people,
-    )
+    ticket_data = {
+        ticket: get_participation_type(
+            bool(int(request.form.get(f'{uid}_visit', '0'))), bool(int(request.form.get(f'{uid}_post_visit', '0')))
+        )
+        for ticket, uid in zip(roster['ticket_names'], ticket_ids)
+    }
+
+    # NB: the sort orders are computed when uploading the CSV file, except for roster stores that do not keep them
+    #     (e.g. the cookie store), in which case the order needs to be computed before assigning the participation types
+    people = roster['people']
+    sort_type = request.form['sort_type']
+    order = roster.get('sort_orders', {}).get(sort_type)
+    if order is None:
+        order = people.sort_orders([sort_type])[sort_type]
+
+    # NB: the stored roster is left untouched since `take()` copies the participation types
+    people = people.take(order)
+    people.map_participation_types(ticket_data)
+
+    label_type = Label[request.form['label_type'].replace(f'{Label.__name__}.', '')]
+    event_type = EventType[request.form['event_type_visit']]
+    event_food = EventFood[request.form['event_type_post_visit']]
+    start_offset = request.form.get('start_offset', 0, type=int)
+    output_format = request.form.get('output_format', 'latex')
+    try:
+        LABEL_PROPERTIES[label_type].check_start_offset(start_offset)
+        if output_format == 'latex':
+            backend = get_backend(output_format, cache_icons=bool(int(request.form.get('cache_icons', '0'))))
+        else:
+            backend = get_backend(output_format)
+    except ValueError as err:
+        abort(400, description=str(err))
+
+    # NB: all the names are checked before generating anything since the document is streamed into the response
+    overflowing_names = find_overflowing_names(people, label_type)
+    if overflowing_names:
+        abort(400, description=f'Names too long to fit on a label: {", ".join(overflowing_names)}')
+
+    # NB: the rows are only created once since the list of people is iterated several times below
+    people = list(people)
+
+    all_people = people
+    event_reference = request.form.get('event_reference', '').strip()
+    if event_reference:
+        people = select_new_people(event_reference, people)
 
-    # Clear data from session if successful
-    del session['people']
-    del session['ticket_names']
+    try:
+        chunks = backend.iter_generate(label_type, event_type, event_food, people, start_offset)
+    except ValueError as err:
+        # NB: e.g. names that cannot be represented within a PDF file without embedding a font
+        abort(400, description=str(err))
+    if event_reference:
+        chunks = save_snapshot_when_done(chunks, event_reference, all_people)
 
-    return render_template('overleaf.html', latex_code=latex_code)
+    # Clear data from session if successful
+    clear_roster()
+
+    # NB: The generated code is streamed directly into the response as it is being generated
+    if backend.name == 'latex':
+        # NB: the pages follow the sort order above, so that a late change to the list of participants only affects
+        #     the pages from the first changed label onwards (and only those are compiled again)
+        document = LatexDocument(label_type, event_type, event_food, backend.cache_icons)
+        return stream_template(
+            'overleaf.html',
+            latex_chunks=chunks,
+            compile_enabled='compilation_queue' in current_app.extensions,
+            document_id=register_latex_pages(document.iter_pages(people, start_offset)),
+        )
+    return Response(
+        chunks,
+        mimetype=backend.mimetype,
+        headers={'Content-Disposition': f'attachment; filename={backend.filename}'},
+    )
 
 
 def process_people_list():
     """Process a list of participants."""
-    try:
-        ticket_names = session['ticket_names']
-    except KeyError:
+    roster = load_roster()
+    if roster is None:
         return redirect(url_for('upload_file'))
 
-    ticket_ids = [re.sub(r'[ -/\{}]', '_', name.lower()) for name in ticket_names]
+    ticket_ids = [get_ticket_id(name) for name in roster['ticket_names']]
 
     if request.method == 'GET':
-        return process_people_list_get(ticket_names, ticket_ids)
-    return process_people_list_post(ticket_names, ticket_ids)
+        return process_people_list_get(roster, ticket_ids)
+    return process_people_list_post(roster, ticket_ids)
@@ -0,0 +1,43 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Roster database utilities (participants of all the events)."""
+
+from __future__ import annotations
+
+from flask import Flask, current_app
+
+from aluso_label.people import Person
+from aluso_label.roster_db import RosterDatabase
+
+
+def init_roster_db(app: Flask):
+    """Create the roster database for a Flask application (if enabled).
+
+    The following configuration variables are used:
+      - ROSTER_DB: path to the SQLite database file recording the participants of all the events (disabled if unset)
+    """
+    path = app.config.get('ROSTER_DB')
+    if not path:
+        return
+
+    app.extensions['roster_db'] = RosterDatabase(path)
+
+
+def record_event(event: str, people: list[Person]):
+    """Record the participants of an event within the roster database (if enabled)."""
+    database = current_app.extensions.get('roster_db')
+    if database is not None and event:
+        database.save_event(event, people)
@@ -0,0 +1,409 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Storage utilities for parsed lists of participants."""
+
+from __future__ import annotations
+
+import abc
+import base64
+import collections
+import contextlib
+import json
+import os
+import secrets
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from pathlib import Path
+
+from flask import Flask, current_app, session
+
+from aluso_label.roster import Roster
+
+# ==============================================================================
+
+_CODEC_VERSION = 2
+_CODEC_VERSION_UIDS = 2  # first version storing the user IDs
+_CODEC_HEADER = struct.Struct('<BII')
+_FLAG_BITS = 3  # see `aluso_label.roster`
+_COOKIE_ATTRIBUTES_SIZE = 100  # upper bound on the size of the attributes of the session cookie (path, expiry, etc.)
+
+
+class RosterTooLargeError(ValueError):
+    """Exception raised when a roster cannot be stored within the session cookie."""
+
+    def __init__(self, n_people: int, cookie_size: int, max_cookie_size: int):
+        """Initialize a RosterTooLargeError exception.
+
+        Args:
+            n_people (int): Number of participants
+            cookie_size (int): Size of the session cookie with the encoded roster (in bytes)
+            max_cookie_size (int): Maximum size of the session cookie (in bytes)
+        """
+        super().__init__(
+            f'The list of participants is too large to be stored within a cookie ({n_people} participants need '
+            f'{cookie_size} bytes while at most {max_cookie_size} bytes are available)'
+        )
+        self.n_people = n_people
+        self.cookie_size = cookie_size
+        self.max_cookie_size = max_cookie_size
+
+
+def encode_roster(roster: dict) -> bytes:
+    """Encode a roster into a compact binary representation.
+
+    The ticket names of the roster are used as a string table: each person is encoded as a single 16-bit integer
+    containing the index of its ticket name and its membership/contributor/committee flags (i.e. the packed flags of the
+    `Roster`). The first and last names and the user IDs are stored as NUL-separated UTF-8 strings and the whole payload
+    is then compressed using zlib. The sort orders are not encoded.
+
+    Args:
+        roster (dict): Roster with the participants (`Roster`) and the list of ticket names
+    """
+    columns = roster['people'].to_columns()
+    ticket_names = columns['ticket_names']
+    n_people = len(columns['flags'])
+    if len(ticket_names) >= 1 << (16 - _FLAG_BITS):
+        raise ValueError(f'Too many ticket names to encode roster ({len(ticket_names)})')
+
+    # NB: the string columns are already NUL-separated, so they are simply appended to the string table
+    strings = (
+        [*ticket_names, columns['first_names'], columns['last_names'], columns['uids']] if n_people else ticket_names
+    )
+    return zlib.compress(
+        _CODEC_HEADER.pack(_CODEC_VERSION, len(ticket_names), n_people)
+        + struct.pack(f'<{n_people}H', *columns['flags'])
+        + '\0'.join(strings).encode('utf-8'),
+        level=9,
+    )
+
+
+def decode_roster(data: bytes) -> dict:
+    """Decode a roster encoded using `encode_roster()`.
+
+    Raises:
+        ValueError: if the data is not a roster encoded using a supported version (e.g. truncated or corrupted data)
+    """
+    try:
+        data = zlib.decompress(data)
+        version, n_tickets, n_people = _CODEC_HEADER.unpack_from(data)
+        if not 1 <= version <= _CODEC_VERSION:
+            raise ValueError(f'Unsupported roster encoding version: {version}')
+
+        offset = _CODEC_HEADER.size
+        flags = struct.unpack_from(f'<{n_people}H', data, offset)
+        strings = data[offset + 2 * n_people :].decode('utf-8').split('\0') if n_tickets + n_people else []
+    except (zlib.error, struct.error, UnicodeDecodeError) as err:
+        raise ValueError(f'Invalid roster data: {err}') from None
+
+    n_columns = 3 if version >= _CODEC_VERSION_UIDS else 2
+    if len(strings) != n_tickets + n_columns * n_people or any(flag >> _FLAG_BITS >= n_tickets for flag in flags):
+        raise ValueError('Invalid roster data: inconsistent number of strings or ticket indices')
+
+    ticket_names = strings[:n_tickets]
+    first_names = strings[n_tickets : n_tickets + n_people]
+    last_names = strings[n_tickets + n_people : n_tickets + 2 * n_people]
+    uids = strings[n_tickets + 2 * n_people :] if version >= _CODEC_VERSION_UIDS else [''] * n_people
+
+    people = Roster.from_columns(
+        {
+            'uids': '\0'.join(uids),
+            'first_names': '\0'.join(first_names),
+            'last_names': '\0'.join(last_names),
+            'flags': flags,
+            'ticket_names': ticket_names,
+        }
+    )
+    return {'people': people, 'ticket_names': sorted(people.ticket_names)}
+
+
+def get_session_cookie_size(session_data: dict) -> int:
+    """Size (in bytes) of the session cookie of the current application with some data (without its attributes)."""
+    serializer = current_app.session_interface.get_signing_serializer(current_app)
+    return len(current_app.config['SESSION_COOKIE_NAME']) + 1 + len(serializer.dumps(session_data))
+
+
+def roster_to_json(roster: dict) -> str:
+    """Serialize a roster as JSON, the participants being stored as columns (see `Roster.to_columns()`).
+
+    NB: the sort orders are stored as base64-encoded arrays of integers, so that loading a roster does not create one
+        integer object per participant and sort type.
+    """
+    data = {**roster, 'people': roster['people'].to_columns()}
+    if 'sort_orders' in roster:
+        data['sort_orders'] = {
+            sort_type: base64.b64encode(array('I', order).tobytes()).decode('ascii')
+            for sort_type, order in roster['sort_orders'].items()
+        }
+    return json.dumps(data, separators=(',', ':'))
+
+
+def roster_from_json(data: str) -> dict:
+    """Deserialize a roster serialized using `roster_to_json()`."""
+    roster = json.loads(data)
+    people = roster['people']
+    # NB: rosters stored before the participants were stored as columns are lists of dictionaries
+    if isinstance(people, list):
+        roster['people'] = Roster.from_dicts(people)
+        return roster
+
+    roster['people'] = Roster.from_columns(people)
+    if 'sort_orders' in roster:
+        roster['sort_orders'] = {
+            sort_type: array('I', base64.b64decode(order)) for sort_type, order in roster['sort_orders'].items()
+        }
+    return roster
+
+
+# ==============================================================================
+
+
+class RosterStore(abc.ABC):
+    """Base class for the storage of parsed lists of participants.
+
+    A roster is a dictionary with the participants of an uploaded CSV file (`Roster`), the sorted list of their ticket
+    names and optionally the orders of the participants for each sort type (see `Roster.sort_orders()`). Only the key
+    returned by `save()` is kept within the user session.
+    """
+
+    @abc.abstractmethod
+    def save(self, roster: dict) -> str:
+        """Store a roster and return the key to retrieve it."""
+
+    @abc.abstractmethod
+    def load(self, key: str) -> dict | None:
+        """Retrieve a roster (None if it does not exist or has expired)."""
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        """Delete a roster."""
+
+
+class CookieRosterStore(RosterStore):
+    """Roster storage within the (signed) Flask session cookie.
+
+    This is meant for stateless deployments where no server-side storage is available. Rosters are encoded using
+    `encode_roster()` in order to keep the size of the cookie to a minimum.
+    """
+
+    def save(self, roster: dict) -> str:
+        """Store a roster and return the key to retrieve it.
+
+        Raises:
+            RosterTooLargeError: if the session cookie with the encoded roster would be too large for browsers
+        """
+        key = secrets.token_urlsafe(16)
+        data = encode_roster(roster)
+
+        # NB: browsers silently ignore cookies that are too large (Flask only issues a warning), in which case the
+        #     roster would simply be lost at the next request
+        cookie_size = get_session_cookie_size({**session, 'roster': data, 'roster_key': key})
+        max_cookie_size = current_app.config['MAX_COOKIE_SIZE'] - _COOKIE_ATTRIBUTES_SIZE
+        if cookie_size > max_cookie_size:
+            raise RosterTooLargeError(len(roster['people']), cookie_size, max_cookie_size)
+
+        session['roster'] = data
+        return key
+
+    def load(self, key: str) -> dict | None:  # noqa: ARG002
+        """Retrieve a roster (None if it does not exist or has expired)."""
+        data = session.get('roster')
+        if data is None:
+            return None
+        try:
+            return decode_roster(data)
+        except ValueError:
+            # NB: e.g. a cookie issued by an incompatible version of the application
+            return None
+
+    def delete(self, key: str):  # noqa: ARG002
+        """Delete a roster."""
+        session.pop('roster', None)
+
+
+class SQLiteRosterStore(RosterStore):
+    """Server-side roster storage using an SQLite database.
+
+    Rosters older than `ttl` seconds are evicted and at most `max_entries` rosters are kept at any given time (oldest
+    ones are evicted first).
+    """
+
+    def __init__(self, path: str | Path, ttl: float = 3600, max_entries: int = 1000):
+        """Initialize an SQLite roster store.
+
+        Args:
+            path (str | Path): Path to the SQLite database file
+            ttl (float): Time-to-live of a roster in seconds
+            max_entries (int): Maximum number of rosters kept within the store
+        """
+        self._path = Path(path)
+        self._ttl = ttl
+        self._max_entries = max_entries
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS rosters (key TEXT PRIMARY KEY, created REAL, data TEXT)')
+            conn.execute('CREATE INDEX IF NOT EXISTS rosters_created ON rosters (created)')
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a connection to the database and commit the transaction on exit."""
+        with contextlib.closing(sqlite3.connect(self._path, timeout=10)) as conn, conn:
+            yield conn
+
+    def save(self, roster: dict) -> str:
+        """Store a roster and return the key to retrieve it."""
+        key = secrets.token_urlsafe(16)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('DELETE FROM rosters WHERE created < ?', (now - self._ttl,))
+            conn.execute(
+                'DELETE FROM rosters WHERE key IN (SELECT key FROM rosters ORDER BY created DESC LIMIT -1 OFFSET ?)',
+                (max(self._max_entries - 1, 0),),
+            )
+            conn.execute(
+                'INSERT INTO rosters (key, created, data) VALUES (?, ?, ?)',
+                (key, now, roster_to_json(roster)),
+            )
+        return key
+
+    def load(self, key: str) -> dict | None:
+        """Retrieve a roster (None if it does not exist or has expired)."""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT data FROM rosters WHERE key = ? AND created >= ?', (key, time.time() - self._ttl)
+            ).fetchone()
+        return roster_from_json(row[0]) if row else None
+
+    def delete(self, key: str):
+        """Delete a roster."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM rosters WHERE key = ?', (key,))
+
+
+class RosterCache:
+    """Least-recently used cache of the loaded rosters (within a single process).
+
+    Stored rosters are never modified (only replaced or deleted), so they are kept in memory between the requests of a
+    session instead of being loaded and decoded again for each page of the participants table (see `/api/roster`).
+    """
+
+    def __init__(self, max_entries: int = 32, ttl: float = 3600):
+        """Initialize a roster cache.
+
+        Args:
+            max_entries (int): Maximum number of rosters kept in memory
+            ttl (float): Time-to-live of a roster in seconds
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._rosters: collections.OrderedDict[str, tuple[float, dict]] = collections.OrderedDict()
+
+    def get(self, key: str) -> dict | None:
+        """Retrieve a roster (None if it is not cached or has expired)."""
+        with self._lock:
+            created, roster = self._rosters.get(key, (0, None))
+            if roster is None or created < time.time() - self._ttl:
+                self._rosters.pop(key, None)
+                return None
+            self._rosters.move_to_end(key)
+            return roster
+
+    def put(self, key: str, roster: dict):
+        """Add a roster to the cache (evicting the least recently used ones if needed)."""
+        with self._lock:
+            self._rosters[key] = (time.time(), roster)
+            self._rosters.move_to_end(key)
+            while len(self._rosters) > self._max_entries:
+                self._rosters.popitem(last=False)
+
+    def pop(self, key: str):
+        """Remove a roster from the cache."""
+        with self._lock:
+            self._rosters.pop(key, None)
+
+
+# ==============================================================================
+
+
+def init_roster_store(app: Flask):
+    """Create the roster store configured for a Flask application.
+
+    The following configuration variables are used:
+      - ROSTER_STORE: type of store (either 'sqlite' or 'cookie'; defaults to 'cookie' on Vercel)
+      - ROSTER_STORE_PATH: path to the SQLite database file
+      - ROSTER_STORE_TTL: time-to-live of a roster in seconds
+      - ROSTER_STORE_MAX_ENTRIES: maximum number of rosters kept within the store
+      - ROSTER_CACHE_SIZE: maximum number of loaded rosters kept in memory (0 to disable the cache)
+    """
+    store_type = app.config.get('ROSTER_STORE', 'cookie' if 'VERCEL' in os.environ else 'sqlite')
+    if store_type == 'cookie':
+        store = CookieRosterStore()
+    elif store_type == 'sqlite':
+        store = SQLiteRosterStore(
+            app.config.get('ROSTER_STORE_PATH', Path(tempfile.gettempdir()) / 'aluso_label' / 'rosters.sqlite3'),
+            ttl=app.config.get('ROSTER_STORE_TTL', 3600),
+            max_entries=app.config.get('ROSTER_STORE_MAX_ENTRIES', 1000),
+        )
+    else:
+        raise ValueError(f'Unsupported roster store type: {store_type}')
+
+    app.extensions['roster_store'] = store
+    app.extensions['roster_cache'] = RosterCache(
+        int(app.config.get('ROSTER_CACHE_SIZE', 32)), ttl=app.config.get('ROSTER_STORE_TTL', 3600)
+    )
+
+
+def save_roster(roster: dict):
+    """Store a roster and keep its key in the current session."""
+    store = current_app.extensions['roster_store']
+    cache = current_app.extensions['roster_cache']
+    old_key = session.get('roster_key')
+    if old_key is not None:
+        store.delete(old_key)
+        cache.pop(old_key)
+    key = session['roster_key'] = store.save(roster)
+    cache.put(key, roster)
+
+
+def load_roster() -> dict | None:
+    """Retrieve the roster associated with the current session (from the cache if possible).
+
+    NB: the returned roster is shared between the requests of a session and must not be modified.
+    """
+    key = session.get('roster_key')
+    if key is None:
+        return None
+    cache = current_app.extensions['roster_cache']
+    roster = cache.get(key)
+    if roster is None:
+        roster = current_app.extensions['roster_store'].load(key)
+        if roster is not None:
+            cache.put(key, roster)
+    return roster
+
+
+def clear_roster():
+    """Delete the roster associated with the current session."""
+    key = session.pop('roster_key', None)
+    if key is not None:
+        current_app.extensions['roster_store'].delete(key)
+        current_app.extensions['roster_cache'].pop(key)
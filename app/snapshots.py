@@ -0,0 +1,85 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Event snapshot utilities (delta labels)."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from flask import Flask, current_app
+
+from aluso_label.people import Person
+from aluso_label.snapshots import SnapshotStore, diff_people, take_snapshot
+
+
+def init_snapshot_store(app: Flask):
+    """Create the event snapshot store for a Flask application (if enabled).
+
+    The following configuration variables are used:
+      - SNAPSHOTS: enable delta labels based on the snapshots of previous runs (enabled by default except on Vercel)
+      - SNAPSHOT_DIR: directory where the snapshots are stored
+    """
+    if not app.config.get('SNAPSHOTS', 'VERCEL' not in os.environ):
+        return
+
+    app.extensions['snapshot_store'] = SnapshotStore(
+        app.config.get('SNAPSHOT_DIR', Path(tempfile.gettempdir()) / 'aluso_label' / 'snapshots')
+    )
+
+
+def select_new_people(event: str, people: list[Person]) -> list[Person]:
+    """Select the people that are new or changed since the previous run for an event.
+
+    All the people are selected if there was no previous run for that event (or if snapshots are disabled). The snapshot
+    of the event is left untouched, see `save_snapshot_when_done()`.
+    """
+    store = current_app.extensions.get('snapshot_store')
+    if store is None:
+        return people
+
+    previous_snapshot = store.load(event)
+    if previous_snapshot is None:
+        return people
+    return diff_people(people, previous_snapshot)
+
+
+def save_snapshot_when_done(chunks: Iterable[str | bytes], event: str, people: list[Person]) -> Iterator[str | bytes]:
+    """Wrap the chunks of generated labels to update the snapshot of an event once all of them were generated.
+
+    NB: the labels are streamed into the response, so the snapshot must only be replaced once the last chunk was
+        successfully generated. Otherwise, a failed run would hide the participants it did not print from the next one.
+
+    Args:
+        chunks (Iterable[str | bytes]): Generated chunks of labels
+        event (str): Reference of the event
+        people (list[Person]): All the participants of the event (not only the ones selected for this run)
+    """
+    # NB: the store is retrieved right away since responses are not necessarily streamed within the application context
+    store = current_app.extensions.get('snapshot_store')
+    if store is None:
+        return iter(chunks)
+    return _iter_then_save_snapshot(chunks, store, event, take_snapshot(people))
+
+
+def _iter_then_save_snapshot(
+    chunks: Iterable[str | bytes], store: SnapshotStore, event: str, snapshot: dict[str, str]
+) -> Iterator[str | bytes]:
+    """Yield some chunks and then store the snapshot of an event (see `save_snapshot_when_done()`)."""
+    yield from chunks
+    store.save(event, snapshot)
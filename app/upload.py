@@ -15,30 +15,16 @@
 
 """CSV file upload utilities."""
 
-import csv
-
-from flask import redirect, render_template, session, url_for
+from flask import current_app, redirect, render_template, url_for
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileAllowed, FileRequired
-from wtforms import FileField, SubmitField
-
-from aluso_label.people import Person
+from wtforms import FileField, StringField, SubmitField, ValidationError
 
+from aluso_label.csv_import import MissingFieldError, read_people
+from aluso_label.roster import Roster
 
-def _decode_csv_data(data: bytes) -> str:
-    """Decode CSV binary data to string, trying multiple encodings.
-
-    Tries utf-8-sig first (handles UTF-8 with BOM and regular UTF-8),
-    then falls back to latin-1 which can decode any byte sequence
-    (common for Windows-generated CSV files with accented characters).
-    """
-    for encoding in ('utf-8-sig', 'latin-1'):
-        try:
-            return data.decode(encoding)
-        except UnicodeDecodeError:
-            continue
-    # latin-1 should never fail, but just in case, fall back to utf-8 with error handling
-    return data.decode('utf-8', errors='replace')
+from .roster_db import record_event
+from .roster_store import RosterTooLargeError, save_roster
 
 
 class CSVFileUploadForm(FlaskForm):
@@ -47,67 +33,64 @@ class CSVFileUploadForm(FlaskForm):
     csv_file = FileField(
         label='CSV File', validators=[FileRequired(), FileAllowed(['csv', 'CSV'])], render_kw={'data-testid': 'file'}
     )
+    event = StringField(label='Event name', render_kw={'data-testid': 'event'})
     submit = SubmitField(label='Upload', render_kw={'data-testid': 'submit'})
 
+    def validate_event(self, field):
+        """Require an event name whenever the participants are recorded within the roster database.
+
+        NB: the event name used to default to the name of the CSV file, which merged unrelated events whose files share
+            the same generic name (e.g. `export.csv`) and replaced the participants of the earlier one.
+        """
+        if 'roster_db' in current_app.extensions and not (field.data or '').strip():
+            raise ValidationError('Please enter the name of the event.')
+
 
 def upload_file():
     """Convert an EPFL Alumni CSV file to a list of participants."""
     form = CSVFileUploadForm()
     if form.validate_on_submit():
-        data_fields = {
-            'aluso_uid': ['ID user AF'],
-            'first_name': ['Prénom', 'First name'],
-            'last_name': ['Nom de famille', 'Family Name'],
-            'contribution_status': ['Cotisant', 'Contributeur', 'Contributor'],
-            'ticket_name': ['Nom du billet', 'Ticket name'],
-        }
-
-        ticket_names = set()
-        people = []
-        for row in csv.DictReader(_decode_csv_data(form.csv_file.data.read()).splitlines(), skipinitialspace=True):
-            current_data = {}
-            for field, options in data_fields.items():
-                for option in options:
-                    if option in row:
-                        current_data[field] = row[option].strip()
-                        break
-                else:
-                    str_options = [f'"{option}"' for option in options]
-                    form.form_errors = [f'Unable to parse CSV data for field {field} (tried {", ".join(str_options)})']
-                    errors = [
-                        ('p', form.form_errors[0]),
-                        ('p', ' '),
-                        (
-                            'p',
-                            (
-                                'Are you sure you that any of the columns listed '
-                                'below were selected when exporting the CSV file?'
-                            ),
-                        ),
-                        ('li', str_options),
-                    ]
-                    return render_template('upload.html', form=form, errors=errors)
-
-            if not current_data['ticket_name']:
-                # There are sometimes some double entries with identical data except empty ticket name
-                continue
-
-            ticket_names.add(current_data['ticket_name'])
-            people.append(
-                Person(
-                    current_data['aluso_uid'],
-                    current_data['first_name'],
-                    current_data['last_name'],
-                    bool(current_data['contribution_status']),
-                    current_data['contribution_status'] in ('Oui', 'Yes'),
-                    current_data['ticket_name'],
-                )
+        try:
+            people = Roster(read_people(form.csv_file.data.stream))
+        except MissingFieldError as err:
+            str_options = [f'"{option}"' for option in err.options]
+            form.form_errors = [str(err)]
+            errors = [
+                ('p', form.form_errors[0]),
+                ('p', ' '),
+                (
+                    'p',
+                    (
+                        'Are you sure you that any of the columns listed '
+                        'below were selected when exporting the CSV file?'
+                    ),
+                ),
+                ('li', str_options),
+            ]
+            return render_template('upload.html', form=form, errors=errors)
+
+        # NB: the orders for all the sort types are computed once here so that sorting later on is a simple permutation
+        try:
+            save_roster(
+                {
+                    'people': people,
+                    'ticket_names': sorted(people.ticket_names),
+                    'sort_orders': people.sort_orders(),
+                }
             )
-
-        ticket_names = sorted(ticket_names)
-
-        session['people'] = people
-        session['ticket_names'] = ticket_names
+        except RosterTooLargeError as err:
+            form.form_errors = [str(err)]
+            errors = [
+                ('p', form.form_errors[0]),
+                ('p', ' '),
+                (
+                    'p',
+                    'Please split the CSV file into smaller ones or use a server-side storage (ROSTER_STORE=sqlite).',
+                ),
+            ]
+            return render_template('upload.html', form=form, errors=errors), 413
+
+        record_event((form.event.data or '').strip(), people)
         return redirect(url_for('process_people_list'))
 
     # Something wrong happened -> resubmit current page
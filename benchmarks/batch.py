@@ -0,0 +1,160 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Benchmark of the parallel batch generation (`aluso-labels-batch`) on many synthetic events.
+
+A season's worth of synthetic CSV files (100 events by default) is generated into a temporary directory and processed
+with an increasing number of worker processes. The wall-clock time of each run is compared with the one of a single
+worker, which gives the speedup and the parallel efficiency.
+
+Usage:
+    python -m benchmarks.batch --events 100 --size 300 --workers 1 2 4 8 --output batch.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from aluso_label.batch import generate_batch
+
+from .pipeline import format_time, get_run_metadata
+from .synthetic import generate_csv
+
+# ==============================================================================
+
+DEFAULT_EVENTS = 100
+DEFAULT_SIZE = 300
+DEFAULT_REPEAT = 3
+
+_MANIFEST = {'defaults': {'label_type': 'AVERY_70X36'}}
+
+# ==============================================================================
+
+
+def get_default_workers() -> list[int]:
+    """Powers of two up to the number of CPUs (along with the number of CPUs itself)."""
+    n_cpus = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= n_cpus:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != n_cpus:
+        workers.append(n_cpus)
+    return workers
+
+
+def write_events(directory: Path, n_events: int, size: int, seed: int = 0) -> list[Path]:
+    """Write synthetic CSV files (one per event, each one with a different seed) into a directory."""
+    csv_files = []
+    for index in range(n_events):
+        path = directory / f'event-{index:03d}.csv'
+        path.write_bytes(generate_csv(size, seed + index))
+        csv_files.append(path)
+    return csv_files
+
+
+def run_batch(csv_files: list[Path], output_dir: Path, workers: int) -> dict:
+    """Process some CSV files with a given number of workers.
+
+    Returns:
+        Dictionary with the wall-clock time, the sum of the times spent on each file and the number of errors
+    """
+    start = time.perf_counter()
+    results = list(generate_batch(csv_files, output_dir, _MANIFEST, max_workers=workers))
+    return {
+        'wall': time.perf_counter() - start,
+        'busy': sum(result.duration for result in results),
+        'errors': sum(result.error is not None for result in results),
+    }
+
+
+def run_benchmarks(
+    n_events: int = DEFAULT_EVENTS,
+    size: int = DEFAULT_SIZE,
+    workers: list[int] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = 0,
+) -> dict:
+    """Measure the wall-clock time of the batch generation for several numbers of workers.
+
+    Returns:
+        Dictionary with the metadata of the run and the results for each number of workers (best of `repeat` runs,
+        times in seconds)
+    """
+    workers = workers or get_default_workers()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_files = write_events(Path(tmp_dir), n_events, size, seed)
+        for n_workers in workers:
+            runs = [run_batch(csv_files, Path(tmp_dir) / 'labels', n_workers) for _ in range(repeat)]
+            results[str(n_workers)] = min(runs, key=lambda run: run['wall'])
+
+    reference = results[str(workers[0])]['wall'] * workers[0]
+    for n_workers, result in results.items():
+        result['speedup'] = reference / result['wall']
+        result['efficiency'] = result['speedup'] / int(n_workers)
+
+    metadata = get_run_metadata(events=n_events, size=size, seed=seed, cpus=os.cpu_count())
+    return {'metadata': metadata, 'results': results}
+
+
+def format_results(results: dict) -> str:
+    """Format the results of the benchmark as a table."""
+    lines = [f'{"workers":>8} {"wall":>10} {"busy":>10} {"speedup":>8} {"efficiency":>11} {"errors":>7}']
+    for n_workers, result in results['results'].items():
+        lines.append(
+            f'{n_workers:>8} {format_time(result["wall"]):>10} {format_time(result["busy"]):>10} '
+            f'{result["speedup"]:>8.2f} {result["efficiency"]:>11.0%} {result["errors"]:>7}'
+        )
+    return '\n'.join(lines)
+
+
+# ==============================================================================
+
+
+def main(argv: list[str] | None = None):
+    """Run the benchmark and print the results (optionally storing them as JSON)."""
+    parser = argparse.ArgumentParser(description='Benchmark the parallel batch generation on synthetic events.')
+    parser.add_argument(
+        '--events', type=int, default=DEFAULT_EVENTS, help=f'number of events (default: {DEFAULT_EVENTS})'
+    )
+    parser.add_argument(
+        '--size', type=int, default=DEFAULT_SIZE, help=f'number of participants per event (default: {DEFAULT_SIZE})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        nargs='+',
+        help='numbers of worker processes (default: powers of two up to the number of CPUs)',
+    )
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='number of runs per number of workers')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic CSV files (default: 0)')
+    parser.add_argument('-o', '--output', help='output JSON file')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.events, args.size, args.workers, args.repeat, args.seed)
+    print(format_results(results))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f'Results written to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,437 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""End-to-end load test of the web application.
+
+Many organizers are simulated concurrently (one thread each), every one of them going through the whole flow of the web
+application with a synthetic CSV file: loading the upload page, uploading the file, loading the processing page and
+submitting it with the options detected on that page. Each session uses its own cookies, exactly like a browser.
+
+The requests are either sent in-process to an application created with `create_app()` (using the Flask test client),
+to that same application served by a local WSGI server running in a background thread (`--server`) or to an already
+running server (`--url`, e.g. a single gunicorn worker in order to measure its throughput ceiling).
+
+Usage:
+    python -m benchmarks.load_test --sizes 100 1000 --organizers 8 --sessions 40
+    python -m benchmarks.load_test --server --roster-store cookie --output load.json
+    python -m benchmarks.load_test --url http://127.0.0.1:8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import http.cookiejar
+import io
+import json
+import logging
+import math
+import re
+import secrets
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from flask import Flask
+
+from aluso_label.backends import BACKENDS
+from aluso_label.people import SORT_TYPES
+from app.main import create_app
+from app.roster_store import CookieRosterStore, SQLiteRosterStore
+
+from .pipeline import get_run_metadata
+from .synthetic import generate_csv
+
+# ==============================================================================
+
+DEFAULT_SIZES = (100, 1000)
+DEFAULT_ORGANIZERS = 8
+DEFAULT_SESSIONS = 40
+
+STEPS = ('GET /', 'POST /', 'GET /process', 'POST /process')
+
+_LABEL_TYPE = 'Label.AVERY_70X36'
+_EVENT_TYPE = 'COMPANY_VISIT'
+
+_CSRF_TOKEN_RE = re.compile(r'<input[^>]*name="csrf_token"[^>]*value="([^"]*)"')
+_CHECKED_BOX_RE = re.compile(r'<input\s+type="checkbox"\s+checked\s+value="1"\s+id="[^"]*"\s+name="([^"]+)"')
+_EVENT_FOOD_RE = re.compile(r'<input type="radio" name="event_type_post_visit" id="[^"]*" value="(\w+)" checked')
+
+# ==============================================================================
+
+
+class Response(NamedTuple):
+    """Response to a request of the load test."""
+
+    status: int
+    body: bytes
+    set_cookie_size: int  # total size of the Set-Cookie headers
+
+
+class RequestRecord(NamedTuple):
+    """Measurement of a single request."""
+
+    step: str
+    latency: float
+    status: int
+    response_size: int
+    set_cookie_size: int
+
+
+class TestClientSession:
+    """Browser-like session sending requests in-process using the Flask test client."""
+
+    def __init__(self, app: Flask):
+        """Initialize a session with its own cookies."""
+        self._client = app.test_client()
+
+    def request(self, method: str, path: str, data: dict | None = None, file: tuple | None = None) -> Response:
+        """Send a request (redirections are not followed).
+
+        Args:
+            method (str): HTTP method
+            path (str): Path of the page
+            data (dict): Form fields
+            file (tuple): Field name, file name and content of a file to upload (multipart form)
+        """
+        data = dict(data or {})
+        if file is not None:
+            name, filename, content = file
+            data[name] = (io.BytesIO(content), filename)
+        response = self._client.open(path, method=method, data=data)
+        return Response(
+            response.status_code,
+            response.get_data(),
+            sum(len(value) for value in response.headers.getlist('Set-Cookie')),
+        )
+
+
+class HttpSession:
+    """Browser-like session sending requests to an HTTP server using urllib."""
+
+    def __init__(self, base_url: str):
+        """Initialize a session with its own cookies."""
+        self._base_url = base_url.rstrip('/')
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirectHandler()
+        )
+
+    def request(self, method: str, path: str, data: dict | None = None, file: tuple | None = None) -> Response:
+        """Send a request (see `TestClientSession.request()`)."""
+        headers = {}
+        body = None
+        if file is not None:
+            boundary = secrets.token_hex(16)
+            headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+            body = _encode_multipart(data or {}, file, boundary)
+        elif data is not None:
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            body = urllib.parse.urlencode(data).encode()
+
+        request = urllib.request.Request(self._base_url + path, data=body, headers=headers, method=method)  # noqa: S310
+        try:
+            response = self._opener.open(request)
+        except urllib.error.HTTPError as err:
+            # NB: error responses (including redirections) are still responses to be measured
+            response = err
+        with response:
+            return Response(
+                response.status,
+                response.read(),
+                sum(len(value) for value in response.headers.get_all('Set-Cookie', ())),
+            )
+
+
+class _NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Redirection handler that does not follow redirections (they are steps of the flow on their own)."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):  # noqa: PLR0913, PLR0917
+        """Do not follow any redirection."""
+
+
+def _encode_multipart(data: dict, file: tuple, boundary: str) -> bytes:
+    """Encode form fields and a file as a multipart/form-data request body."""
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in data.items()
+    ]
+    name, filename, content = file
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+        f'Content-Type: text/csv\r\n\r\n'.encode()
+        + content
+        + b'\r\n'
+    )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts)
+
+
+# ==============================================================================
+
+
+def create_load_test_app(roster_store: str, store_dir: str | Path) -> Flask:
+    """Create the application to test (only the roster store is replaced, the CSRF protection is kept enabled).
+
+    Args:
+        roster_store (str): Type of roster store (either 'sqlite' or 'cookie')
+        store_dir (str | Path): Directory of the SQLite roster store
+    """
+    app = create_app()
+    if roster_store == 'cookie':
+        app.extensions['roster_store'] = CookieRosterStore()
+    else:
+        # NB: every simulated session keeps a roster until its last step, so the store must not evict them
+        app.extensions['roster_store'] = SQLiteRosterStore(Path(store_dir) / 'rosters.sqlite3', max_entries=100000)
+    return app
+
+
+@contextlib.contextmanager
+def serve_app(app: Flask) -> Iterator[str]:
+    """Serve an application with a local (threaded) WSGI server in a background thread and yield its URL."""
+    from werkzeug.serving import make_server  # noqa: PLC0415
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def run_session(session: TestClientSession | HttpSession, csv_data: bytes, options: dict) -> list[RequestRecord]:
+    """Go through the whole flow of the web application like an organizer would.
+
+    Args:
+        session (TestClientSession | HttpSession): Session to send the requests with
+        csv_data (bytes): Content of the CSV file to upload
+        options (dict): Form fields of the processing page that are not detected from the page itself
+
+    Raises:
+        RuntimeError: if a step fails (the requests of the previous steps are recorded within the exception)
+    """
+    records = []
+
+    def _step(step: str, path: str, expected_status: int, data: dict | None = None, file: tuple | None = None) -> str:
+        method = step.split(' ', 1)[0]
+        start = time.perf_counter()
+        response = session.request(method, path, data, file)
+        latency = time.perf_counter() - start
+        records.append(RequestRecord(step, latency, response.status, len(response.body), response.set_cookie_size))
+        if response.status != expected_status:
+            raise RuntimeError(f'{step} returned {response.status} instead of {expected_status}', records)
+        return response.body.decode('utf-8', errors='replace')
+
+    page = _step('GET /', '/', 200)
+    match = _CSRF_TOKEN_RE.search(page)
+    _step(
+        'POST /',
+        '/',
+        302,
+        data={'csrf_token': match.group(1) if match else '', 'event': ''},
+        file=('csv_file', 'participants.csv', csv_data),
+    )
+
+    # NB: the ticket options and the type of food are submitted as detected on the page (i.e. the default choices)
+    page = _step('GET /process', '/process', 200)
+    match = _EVENT_FOOD_RE.search(page)
+    form = dict.fromkeys(_CHECKED_BOX_RE.findall(page), '1')
+    form.update(event_type_visit=_EVENT_TYPE, event_type_post_visit=match.group(1) if match else 'NOTHING')
+    form.update(options)
+    _step('POST /process', '/process', 200, data=form)
+    return records
+
+
+def run_load_test(
+    session_factory: Callable[[], TestClientSession | HttpSession],
+    csv_data: bytes,
+    options: dict,
+    *,
+    organizers: int = DEFAULT_ORGANIZERS,
+    sessions: int = DEFAULT_SESSIONS,
+) -> dict:
+    """Run many sessions concurrently and compute statistics about each step.
+
+    Args:
+        session_factory (Callable): Function creating a new (browser-like) session
+        csv_data (bytes): Content of the CSV file uploaded by each session
+        options (dict): Form fields of the processing page (see `run_session()`)
+        organizers (int): Number of concurrent organizers (i.e. threads)
+        sessions (int): Total number of sessions
+
+    Returns:
+        Dictionary with the overall throughput and the statistics of each step (see `summarize_step()`)
+    """
+
+    def _run() -> tuple[list[RequestRecord], str | None]:
+        try:
+            return run_session(session_factory(), csv_data, options), None
+        except RuntimeError as err:
+            return err.args[1], err.args[0]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=organizers) as executor:
+        outcomes = list(executor.map(lambda _: _run(), range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    records = [record for session_records, _ in outcomes for record in session_records]
+    errors = [error for _, error in outcomes if error is not None]
+    return {
+        'organizers': organizers,
+        'sessions': sessions,
+        'failed_sessions': len(errors),
+        'errors': sorted(set(errors)),
+        'elapsed': elapsed,
+        'sessions_per_second': (sessions - len(errors)) / elapsed,
+        'requests_per_second': len(records) / elapsed,
+        'steps': {
+            step: summarize_step([record for record in records if record.step == step], elapsed) for step in STEPS
+        },
+    }
+
+
+def summarize_step(records: list[RequestRecord], elapsed: float) -> dict:
+    """Compute the statistics of the requests of a step (latencies in seconds, sizes in bytes)."""
+    if not records:
+        return {'requests': 0}
+    latencies = sorted(record.latency for record in records)
+    return {
+        'requests': len(records),
+        'errors': sum(record.status >= 400 for record in records),  # noqa: PLR2004
+        'requests_per_second': len(records) / elapsed,
+        'mean': statistics.fmean(latencies),
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p99': percentile(latencies, 99),
+        'max': latencies[-1],
+        'response_size': statistics.fmean(record.response_size for record in records),
+        'set_cookie_size': max(record.set_cookie_size for record in records),
+    }
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Percentile of some sorted values (nearest-rank method)."""
+    return sorted_values[max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)]
+
+
+def format_report(size: int, results: dict) -> str:
+    """Format the results of a load test as a table."""
+    lines = [
+        (
+            f'{size} participants, {results["organizers"]} organizers, {results["sessions"]} sessions '
+            f'({results["failed_sessions"]} failed) in {results["elapsed"]:.2f} s: '
+            f'{results["sessions_per_second"]:.2f} sessions/s, {results["requests_per_second"]:.2f} requests/s'
+        ),
+        *(f'  error: {error}' for error in results['errors']),
+        (
+            f'  {"step":<14} {"requests":>8} {"errors":>6} {"p50":>9} {"p90":>9} {"p99":>9} {"max":>9} {"req/s":>8} '
+            f'{"response":>10} {"set-cookie":>10}'
+        ),
+    ]
+    for step, stats in results['steps'].items():
+        if not stats['requests']:
+            continue
+        lines.append(
+            f'  {step:<14} {stats["requests"]:>8} {stats["errors"]:>6} '
+            + ' '.join(f'{stats[key] * 1000:>6.1f} ms' for key in ('p50', 'p90', 'p99', 'max'))
+            + f' {stats["requests_per_second"]:>8.2f} {_format_size(stats["response_size"]):>10} '
+            f'{_format_size(stats["set_cookie_size"]):>10}'
+        )
+    return '\n'.join(lines)
+
+
+def _format_size(size: float) -> str:
+    """Format a number of bytes with a suitable unit."""
+    for unit, scale in (('MB', 1 << 20), ('kB', 1 << 10)):
+        if size >= scale:
+            return f'{size / scale:.1f} {unit}'
+    return f'{size:.0f} B'
+
+
+# ==============================================================================
+
+
+def main(argv: list[str] | None = None):
+    """Run the load test for several numbers of participants."""
+    parser = argparse.ArgumentParser(description='Load test of the upload and processing flow of the web application.')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='numbers of participants (default: 100 1000)'
+    )
+    parser.add_argument('--organizers', type=int, default=DEFAULT_ORGANIZERS, help='number of concurrent organizers')
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help='total number of sessions per size')
+    parser.add_argument('--warmup', type=int, default=1, help='number of sessions run before the measurements')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--server', action='store_true', help='serve the application with a local WSGI server')
+    target.add_argument('--url', help='URL of an already running server (instead of creating the application)')
+    parser.add_argument(
+        '--roster-store', choices=('sqlite', 'cookie'), default='sqlite', help='roster store of the created application'
+    )
+    parser.add_argument('--sort-type', choices=tuple(SORT_TYPES), default='last_name', help='sort order of the labels')
+    parser.add_argument('--output-format', choices=tuple(BACKENDS), default='latex', help='generated document format')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic CSV files (default: 0)')
+    parser.add_argument('-o', '--output', help='output JSON file')
+    args = parser.parse_args(argv)
+
+    options = {'sort_type': args.sort_type, 'label_type': _LABEL_TYPE, 'output_format': args.output_format}
+    mode = 'url' if args.url else 'server' if args.server else 'test_client'
+    results = {}
+    with tempfile.TemporaryDirectory() as store_dir, contextlib.ExitStack() as stack:
+        if args.url:
+            base_url = args.url
+        else:
+            app = create_load_test_app(args.roster_store, store_dir)
+            base_url = stack.enter_context(serve_app(app)) if args.server else None
+
+        if base_url is None:
+            session_factory = functools.partial(TestClientSession, app)
+        else:
+            session_factory = functools.partial(HttpSession, base_url)
+
+        for size in args.sizes:
+            csv_data = generate_csv(size, args.seed)
+            # NB: the first requests are slower (e.g. templates are compiled), so some sessions are not measured
+            for _ in range(args.warmup):
+                run_session(session_factory(), csv_data, options)
+            results[str(size)] = size_results = run_load_test(
+                session_factory,
+                csv_data,
+                options,
+                organizers=args.organizers,
+                sessions=args.sessions,
+            )
+            print(format_report(size, size_results), file=sys.stderr)
+
+    if args.output:
+        metadata = get_run_metadata(seed=args.seed, mode=mode, roster_store=None if args.url else args.roster_store)
+        Path(args.output).write_text(
+            json.dumps({'metadata': {**metadata, **options}, 'results': results}, indent=2), encoding='utf-8'
+        )
+        print(f'Results written to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
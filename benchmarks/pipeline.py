@@ -0,0 +1,361 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Micro-benchmarks of each stage of the label pipeline on synthetic CSV files of various sizes.
+
+Each stage is timed separately (using `timeit`) for each number of participants and the results are stored as JSON,
+along with the commit they were measured on, so that they can be compared between commits.
+
+Usage:
+    python -m benchmarks.pipeline --sizes 10 1000 100000 --output before.json
+    python -m benchmarks.pipeline --baseline before.json
+    python -m benchmarks.pipeline --compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gc
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import unicodedata
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+from aluso_label.csv_import import iter_decoded_lines, read_people
+from aluso_label.event import EventFood, EventType, TicketClassifier, get_ticket_id
+from aluso_label.latex import Label, LatexDocument
+from aluso_label.latex.latex_document import (
+    _SPACES,
+    DEFAULT_PERSON_CACHE_SIZE,
+    escape_latex,
+    person_to_latex,
+    set_person_cache_size,
+)
+from aluso_label.people import Person, get_participation_type
+from aluso_label.roster import PersonRow, Roster
+from app.roster_store import encode_roster, roster_from_json, roster_to_json
+
+from .synthetic import generate_csv, generate_ticket_names
+
+# ==============================================================================
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+DEFAULT_REPEAT = 5
+RESULTS_DIR = Path(__file__).parent / 'results'
+N_TICKET_NAMES = 5000
+
+_LABEL_TYPE = Label.AVERY_70X36
+# NB: row of a Windows-edited file, ie. the first byte that is not valid UTF-8 is only found at the very end of the file
+_CP1252_ROW = ',M.,Jérôme,Dupré,user@example.com,Oui,Visite seule,25.00\r\n'.encode('cp1252')
+
+# ==============================================================================
+
+
+class Dataset(NamedTuple):
+    """Input data of the benchmarks for a given number of participants."""
+
+    csv_utf8: bytes
+    csv_latin1: bytes
+    csv_late_cp1252: bytes
+    roster: Roster
+    stored_roster: dict
+    stored_json: str
+    ticket_data: dict
+    ticket_names: list[str]
+    rows: list[PersonRow]
+
+
+def make_dataset(n_rows: int, seed: int = 0) -> Dataset:
+    """Generate the synthetic data for a number of participants.
+
+    The CSV files are in French (UTF-8 with BOM, as well as UTF-8 without BOM followed by a cp1252 row) and in English
+    (latin-1). The ticket detection uses its own list of distinct ticket names (`N_TICKET_NAMES` whatever the number of
+    participants), since the synthetic CSV files only contain a handful of tickets.
+    """
+    csv_utf8 = generate_csv(n_rows, seed, 'fr', 'utf-8-sig')
+    roster = Roster(read_people(io.BytesIO(csv_utf8)))
+    stored_roster = {
+        'people': roster,
+        'ticket_names': sorted(roster.ticket_names),
+        'sort_orders': roster.sort_orders(),
+    }
+    ticket_data = {ticket: get_participation_type(True, 'avec' in ticket) for ticket in roster.ticket_names}
+    stored_json = roster_to_json(stored_roster)
+    rows = _process_roster(stored_json, ticket_data)
+    return Dataset(
+        csv_utf8,
+        generate_csv(n_rows, seed, 'en', 'latin-1'),
+        generate_csv(n_rows, seed, 'fr', 'utf-8') + _CP1252_ROW,
+        roster,
+        stored_roster,
+        stored_json,
+        ticket_data,
+        generate_ticket_names(N_TICKET_NAMES, seed),
+        rows,
+    )
+
+
+def _process_roster(stored_json: str, ticket_data: dict) -> list[PersonRow]:
+    """Same as the POST request of the processing page: load the roster, sort it and assign the participation types."""
+    stored_roster = roster_from_json(stored_json)
+    roster = stored_roster['people'].take(stored_roster['sort_orders']['last_name'])
+    roster.map_participation_types(ticket_data)
+    return list(roster)
+
+
+def _person_to_latex(rows: list[PersonRow], cold: bool):
+    """Generate the LaTeX code of each label (optionally clearing the cache first)."""
+    if cold:
+        set_person_cache_size(DEFAULT_PERSON_CACHE_SIZE)
+    for person in rows:
+        person_to_latex(person, _LABEL_TYPE)
+
+
+def _generate_latex(rows: list[PersonRow], cache_icons: bool = False) -> str:
+    """Generate a whole LaTeX document from scratch (see `LatexDocument` for `cache_icons`)."""
+    set_person_cache_size(DEFAULT_PERSON_CACHE_SIZE)
+    return LatexDocument(_LABEL_TYPE, EventType.COMPANY_VISIT, EventFood.MEAL, cache_icons).generate(rows)
+
+
+def _escape_latex_replace(string: str) -> str:
+    """Reference implementation of `escape_latex()` using chained `str.replace()` calls (one per special character)."""
+    string = unicodedata.normalize('NFC', string)
+    # NB: backslashes first, since the other replacements introduce some
+    string = string.replace('\\', '\0')
+    for char in '&%$#_{}':
+        string = string.replace(char, f'\\{char}')
+    string = string.replace('~', r'\textasciitilde{}').replace('^', r'\textasciicircum{}')
+    string = string.replace('\0', r'\textbackslash{}')
+    for space in _SPACES:
+        string = string.replace(space, r'\,')
+    return string
+
+
+def _escape_names(escape: Callable[[str], str], rows: list[PersonRow]) -> Callable[[], list[str]]:
+    """Escape the first and last names of all the participants."""
+    names = [name for person in rows for name in (person.first_name, person.last_name)]
+    return lambda: list(map(escape, names))
+
+
+def _detect_tickets(ticket_names: list[str]):
+    """Same as the GET request of the processing page (without the memoized results of previous requests)."""
+    get_ticket_id.cache_clear()
+    TicketClassifier().guess_ticket_options(ticket_names)
+    [get_ticket_id(name) for name in ticket_names]
+
+
+# NB: each stage creates the function to time from the dataset
+STAGES: dict[str, Callable[[Dataset], Callable[[], object]]] = {
+    'decode_utf8_bom': lambda data: lambda: list(iter_decoded_lines(io.BytesIO(data.csv_utf8))),
+    'decode_latin1': lambda data: lambda: list(iter_decoded_lines(io.BytesIO(data.csv_latin1))),
+    'decode_late_fallback': lambda data: lambda: list(iter_decoded_lines(io.BytesIO(data.csv_late_cp1252))),
+    'parse': lambda data: lambda: Roster(read_people(io.BytesIO(data.csv_utf8))),
+    'sort_orders': lambda data: data.roster.sort_orders,
+    'roster_json': lambda data: lambda: roster_to_json(data.stored_roster),
+    'roster_cookie': lambda data: lambda: encode_roster(data.stored_roster),
+    'ticket_detection': lambda data: lambda: _detect_tickets(data.ticket_names),
+    'process_roster': lambda data: lambda: _process_roster(data.stored_json, data.ticket_data),
+    'escape_latex': lambda data: _escape_names(escape_latex, data.rows),
+    'escape_latex_replace': lambda data: _escape_names(_escape_latex_replace, data.rows),
+    'person_to_latex_cold': lambda data: lambda: _person_to_latex(data.rows, cold=True),
+    'person_to_latex_warm': lambda data: lambda: _person_to_latex(data.rows, cold=False),
+    'latex_generate': lambda data: lambda: _generate_latex(data.rows),
+    'latex_generate_cached_icons': lambda data: lambda: _generate_latex(data.rows, cache_icons=True),
+}
+
+# ==============================================================================
+
+
+def time_stage(func: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> dict:
+    """Time a function (the number of calls per measurement is chosen so that each one takes at least 0.2s).
+
+    Returns:
+        Dictionary with the minimum, median and maximum time per call (in seconds), as well as the number of calls per
+        measurement and the number of measurements
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'max': max(times),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def measure_memory(data: Dataset) -> dict:
+    """Measure the memory used per participant by a list of `Person` objects and by a `Roster` (using tracemalloc).
+
+    The memory used by a stored roster once loaded is also measured, for both the former storage as a list of
+    dictionaries and the current storage as columns.
+    """
+    people = data.roster.to_dicts()
+    people_json = json.dumps(people)
+
+    def _traced_size(build: Callable[[], object]) -> float:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            obj = build()
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del obj
+        return size / max(len(people), 1)
+
+    # NB: the strings are copied so that they are accounted for in both cases
+    return {
+        'person_list': _traced_size(lambda: [Person.from_dict(json.loads(json.dumps(person))) for person in people]),
+        'roster': _traced_size(lambda: Roster.from_dicts(json.loads(json.dumps(people)))),
+        'stored_dicts': _traced_size(lambda: json.loads(people_json)),
+        'stored_columns': _traced_size(lambda: roster_from_json(data.stored_json)),
+    }
+
+
+def measure_output_size(data: Dataset) -> dict:
+    """Measure the size of the generated LaTeX code (in bytes), with the icons typeset inline or once per document."""
+    return {
+        'latex_inline': len(_generate_latex(data.rows).encode('utf-8')),
+        'latex_cached_icons': len(_generate_latex(data.rows, cache_icons=True).encode('utf-8')),
+    }
+
+
+def run_benchmarks(sizes: list[int], stages: list[str], repeat: int = DEFAULT_REPEAT, seed: int = 0) -> dict:
+    """Run the benchmarks of some stages for several numbers of participants.
+
+    Returns:
+        Dictionary with the metadata of the run (commit, Python version, etc.) and the results for each size and stage
+    """
+    results = {}
+    for size in sizes:
+        data = make_dataset(size, seed)
+        results[str(size)] = size_results = {}
+        for stage in stages:
+            size_results[stage] = time_stage(STAGES[stage](data), repeat)
+            print(f'{size:>8} {stage:<28} {format_time(size_results[stage]["min"])}', file=sys.stderr)
+        size_results['memory_per_participant'] = measure_memory(data)
+        size_results['output_size'] = output_size = measure_output_size(data)
+        print(
+            f'{size:>8} {"latex_size":<28} {output_size["latex_inline"]} bytes inline, '
+            f'{output_size["latex_cached_icons"]} bytes with cached icons',
+            file=sys.stderr,
+        )
+
+    return {'metadata': get_run_metadata(seed=seed), 'results': results}
+
+
+def get_run_metadata(**extra: object) -> dict:
+    """Metadata of a benchmark run (commit, date, Python version and platform, along with some extra values)."""
+    return {
+        'commit': _git_output('rev-parse', 'HEAD'),
+        'dirty': bool(_git_output('status', '--porcelain', '--untracked-files=no')),
+        'date': dt.datetime.now(dt.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        **extra,
+    }
+
+
+def compare_results(baseline: dict, current: dict) -> str:
+    """Compare the minimum times of two benchmark runs (ratios above 1 mean that the current run is slower)."""
+    lines = [
+        f'baseline: {baseline["metadata"]["commit"]}',
+        f'current:  {current["metadata"]["commit"]}',
+        f'{"size":>8} {"stage":<28} {"baseline":>10} {"current":>10} {"ratio":>6}',
+    ]
+    for size, stages in current['results'].items():
+        for stage, result in stages.items():
+            baseline_result = baseline['results'].get(size, {}).get(stage)
+            if stage not in STAGES or baseline_result is None:
+                continue
+            lines.append(
+                f'{size:>8} {stage:<28} {format_time(baseline_result["min"]):>10} {format_time(result["min"]):>10} '
+                f'{result["min"] / baseline_result["min"]:>6.2f}'
+            )
+    return '\n'.join(lines)
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration with a suitable unit."""
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def _git_output(*args: str) -> str | None:
+    """Run a git command in the repository and return its output (None if git is not available)."""
+    try:
+        result = subprocess.run(
+            ['git', *args],  # noqa: S607
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+# ==============================================================================
+
+
+def main(argv: list[str] | None = None):
+    """Run the benchmarks and store the results as JSON."""
+    parser = argparse.ArgumentParser(description='Benchmark each stage of the label pipeline.')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='numbers of participants (default: 10 to 100000)'
+    )
+    parser.add_argument('--stages', nargs='+', choices=tuple(STAGES), default=tuple(STAGES), help='stages to time')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='number of measurements per stage')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic CSV files (default: 0)')
+    parser.add_argument('-o', '--output', help='output JSON file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--baseline', help='JSON file of a previous run to compare the results with')
+    parser.add_argument(
+        '--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='only compare the results of two previous runs'
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, current = (json.loads(Path(path).read_text(encoding='utf-8')) for path in args.compare)
+        print(compare_results(baseline, current))
+        return
+
+    results = run_benchmarks(args.sizes, args.stages, args.repeat, args.seed)
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f'{(results["metadata"]["commit"] or "unknown")[:12]}.json'
+    Path(output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(f'Results written to {output}', file=sys.stderr)
+
+    if args.baseline:
+        print(compare_results(json.loads(Path(args.baseline).read_text(encoding='utf-8')), results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Benchmark of the binary encoding of rosters used by the cookie-based roster storage.
+
+For each number of participants, the encoding and decoding times are measured along with the size of the encoded roster
+and of the resulting session cookie, compared to a session cookie holding the list of participants as dictionaries.
+
+Usage:
+    python -m benchmarks.roster_codec --sizes 100 1000 10000 --output codec.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+from pathlib import Path
+
+from aluso_label.csv_import import read_people
+from aluso_label.roster import Roster
+from app.main import create_app
+from app.roster_store import decode_roster, encode_roster, get_session_cookie_size
+
+from .pipeline import DEFAULT_REPEAT, format_time, get_run_metadata, time_stage
+from .synthetic import generate_csv
+
+# ==============================================================================
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# ==============================================================================
+
+
+def run_benchmarks(sizes: list[int], repeat: int = DEFAULT_REPEAT, seed: int = 0) -> dict:
+    """Measure the encoding/decoding times and sizes of rosters for several numbers of participants.
+
+    Returns:
+        Dictionary with the metadata of the run and the results for each size (times in seconds, sizes in bytes)
+    """
+    app = create_app()
+    results = {}
+    with app.test_request_context():
+        for size in sizes:
+            people = Roster(read_people(io.BytesIO(generate_csv(size, seed))))
+            roster = {'people': people, 'ticket_names': sorted(people.ticket_names)}
+            data = encode_roster(roster)
+            results[str(size)] = {
+                'encode': time_stage(lambda roster=roster: encode_roster(roster), repeat),
+                'decode': time_stage(lambda data=data: decode_roster(data), repeat),
+                'json_size': len(json.dumps(people.to_dicts(), separators=(',', ':')).encode('utf-8')),
+                'encoded_size': len(data),
+                'dicts_cookie_size': get_session_cookie_size({'roster': people.to_dicts()}),
+                'cookie_size': get_session_cookie_size({'roster': data}),
+                'max_cookie_size': app.config['MAX_COOKIE_SIZE'],
+            }
+
+    return {'metadata': get_run_metadata(seed=seed), 'results': results}
+
+
+def format_results(results: dict) -> str:
+    """Format the results of the benchmark as a table."""
+    lines = [
+        (
+            f'{"size":>8} {"encode":>10} {"decode":>10} {"JSON":>9} {"encoded":>9} {"cookie (dicts)":>15} '
+            f'{"cookie":>9} {"ratio":>6} {"fits":>5}'
+        )
+    ]
+    for size, result in results['results'].items():
+        lines.append(
+            f'{size:>8} {format_time(result["encode"]["min"]):>10} {format_time(result["decode"]["min"]):>10} '
+            f'{result["json_size"]:>9} {result["encoded_size"]:>9} {result["dicts_cookie_size"]:>15} '
+            f'{result["cookie_size"]:>9} {result["dicts_cookie_size"] / result["cookie_size"]:>6.1f} '
+            f'{"yes" if result["cookie_size"] <= result["max_cookie_size"] else "no":>5}'
+        )
+    return '\n'.join(lines)
+
+
+# ==============================================================================
+
+
+def main(argv: list[str] | None = None):
+    """Run the benchmark and print the results (optionally storing them as JSON)."""
+    parser = argparse.ArgumentParser(description='Benchmark the binary encoding of rosters for cookie-based storage.')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='numbers of participants (default: 100 1000 10000)'
+    )
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='number of measurements per size')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic CSV files (default: 0)')
+    parser.add_argument('-o', '--output', help='output JSON file')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.seed)
+    print(format_results(results))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f'Results written to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Seeded generator of synthetic EPFL Alumni CSV export files.
+
+The generated files mimic the real exports: French or English column names (along with some columns that are not used
+by the label generator), accented and compound names, a few long names that need to be stretched on the labels and
+duplicated rows with an empty ticket name. The same seed always produces the same file.
+
+Usage:
+    python -m benchmarks.synthetic 1000 -o participants.csv --language en --encoding latin-1
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import random
+import sys
+from pathlib import Path
+
+# ==============================================================================
+
+HEADERS = {
+    'fr': ('ID user AF', 'Civilité', 'Prénom', 'Nom de famille', 'E-mail', 'Cotisant', 'Nom du billet', 'Prix'),
+    'en': ('ID user AF', 'Title', 'First name', 'Family Name', 'E-mail', 'Contributor', 'Ticket name', 'Price'),
+}
+CONTRIBUTION_STATUSES = {
+    'fr': ('Oui', 'Non', ''),
+    'en': ('Yes', 'No', ''),
+}
+TICKET_NAMES = {
+    'fr': ('Visite avec repas', 'Visite avec apéro', 'Visite seule', 'Visite uniquement (étudiants)', 'Invité'),
+    'en': ('Visit with dinner', 'Visit with apéro', 'Visit only', 'Visit only (students)', 'Guest'),
+}
+TITLES = {
+    'fr': ('M.', 'Mme', ''),
+    'en': ('Mr', 'Ms', ''),
+}
+
+# fmt: off
+FIRST_NAMES = (
+    'Adèle', 'Anaïs', 'André', 'Béatrice', 'Chloé', 'Clément', 'Élodie', 'Émile', 'François', 'Gaëlle', 'Hélène',
+    'Jean-Pierre', 'Jérôme', 'Jürg', 'Léa', 'Loïc', 'Marie Claire', 'Noël', 'Océane', 'Raphaël', 'Siobhán', 'Søren',
+    'Thérèse', 'Zoë', 'Alice', 'Benoît', 'David', 'Emma', 'Hugo', 'Laura', 'Lucas', 'Marc', 'Nicolas', 'Sarah',
+    'Łukasz', 'Dvořák', 'Ngọc Anh', 'Takumi', 'Ahmed', 'Priya',
+)
+LAST_NAMES = (
+    'Dupont', 'Martin', 'Müller', 'Favre', 'Rochat', 'Schär', 'Gindrat', 'de la Fontaine', 'Dubois-Cosandier',
+    "O'Connor", 'Nuñez', 'Gómez', 'Løvstad', 'Zoé', 'Pérez', 'Bürki', 'von Gunten', 'Rey-Bellet', 'Clément',
+    'Nguyễn', 'Wójcik', 'Çelik', 'Ødegaard', 'Smith', 'Meier', 'Jeanneret', 'Python & Fils', 'Mc_Donald',
+)
+# fmt: on
+LONG_NAME_PARTS = ('Wolfeschlegel', 'Montmollin', 'Kirchhofer', 'Vuilleumier', 'Grandjean', 'Oberholzer')
+
+_UID_RATIO = 0.95  # participants with a user ID (guests have none)
+_LONG_NAME_RATIO = 0.01
+_PADDED_NAME_RATIO = 0.02
+
+# ==============================================================================
+
+
+def _encodable_names(names: tuple[str, ...], encoding: str) -> list[str]:
+    """Select the names that can be represented in an encoding."""
+    selected = []
+    for name in names:
+        try:
+            name.encode(encoding)
+        except UnicodeEncodeError:
+            continue
+        selected.append(name)
+    return selected
+
+
+def generate_rows(
+    n_rows: int,
+    seed: int = 0,
+    language: str = 'fr',
+    encoding: str = 'utf-8-sig',
+    duplicate_ratio: float = 0.05,
+) -> list[list[str]]:
+    """Generate the rows of a synthetic EPFL Alumni CSV export (including the header).
+
+    Args:
+        n_rows (int): Number of participants (the duplicated rows with an empty ticket name are not included)
+        seed (int): Seed of the random number generator
+        language (str): Language of the column names and ticket names (either 'fr' or 'en')
+        encoding (str): Encoding of the file (only names that can be represented in that encoding are used)
+        duplicate_ratio (float): Proportion of participants that are duplicated with an empty ticket name
+    """
+    rng = random.Random(seed)  # noqa: S311
+    first_names = _encodable_names(FIRST_NAMES, encoding)
+    last_names = _encodable_names(LAST_NAMES, encoding)
+    statuses = CONTRIBUTION_STATUSES[language]
+    tickets = TICKET_NAMES[language]
+    titles = TITLES[language]
+
+    rows = [list(HEADERS[language])]
+    for idx in range(n_rows):
+        first_name = rng.choice(first_names)
+        if rng.random() < _LONG_NAME_RATIO:
+            # NB: long names still fit on the labels of all types once stretched
+            last_name = '-'.join(rng.sample(LONG_NAME_PARTS, 2))
+        else:
+            last_name = rng.choice(last_names)
+        # NB: extra spaces are part of real exports and stripped when reading the file
+        if rng.random() < _PADDED_NAME_RATIO:
+            first_name = f' {first_name} '
+
+        row = [
+            str(100000 + idx) if rng.random() < _UID_RATIO else '',
+            rng.choice(titles),
+            first_name,
+            last_name,
+            f'user{idx}@example.com',
+            rng.choices(statuses, weights=(3, 4, 3))[0],
+            rng.choices(tickets, weights=(6, 2, 4, 1, 1))[0],
+            f'{rng.choice((0, 25, 45, 60))}.00',
+        ]
+        rows.append(row)
+        if rng.random() < duplicate_ratio:
+            rows.append([*row[:6], '', row[7]])
+    return rows
+
+
+def generate_ticket_names(n_tickets: int, seed: int = 0, language: str = 'fr') -> list[str]:
+    """Generate distinct ticket names (e.g. the tickets of all the sessions of a season).
+
+    The names are based on the usual ticket names of the synthetic exports, followed by the date and a session number.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    tickets = TICKET_NAMES[language]
+    return [
+        f'{rng.choice(tickets)} - {rng.randint(1, 28):02d}.{rng.randint(1, 12):02d} (session {idx + 1})'
+        for idx in range(n_tickets)
+    ]
+
+
+def generate_csv(
+    n_rows: int,
+    seed: int = 0,
+    language: str = 'fr',
+    encoding: str = 'utf-8-sig',
+    duplicate_ratio: float = 0.05,
+) -> bytes:
+    """Generate a synthetic EPFL Alumni CSV export file (see `generate_rows()` for the arguments)."""
+    text = io.StringIO()
+    csv.writer(text, lineterminator='\r\n').writerows(generate_rows(n_rows, seed, language, encoding, duplicate_ratio))
+    return text.getvalue().encode(encoding)
+
+
+# ==============================================================================
+
+
+def main(argv: list[str] | None = None):
+    """Write a synthetic CSV file."""
+    parser = argparse.ArgumentParser(description='Generate a synthetic EPFL Alumni CSV export file.')
+    parser.add_argument('n_rows', type=int, help='number of participants')
+    parser.add_argument('-o', '--output', help='output CSV file (default: standard output)')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='seed of the random number generator (default: 0)')
+    parser.add_argument('-l', '--language', choices=tuple(HEADERS), default='fr', help='language of the column names')
+    parser.add_argument(
+        '-e', '--encoding', default='utf-8-sig', help='encoding of the file (e.g. utf-8-sig (default), latin-1)'
+    )
+    args = parser.parse_args(argv)
+
+    data = generate_csv(args.n_rows, args.seed, args.language, args.encoding)
+    if args.output is None:
+        sys.stdout.buffer.write(data)
+    else:
+        Path(args.output).write_bytes(data)
+
+
+if __name__ == '__main__':
+    main()
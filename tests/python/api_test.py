@@ -0,0 +1,152 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+# ==============================================================================
+
+
+def test_generate_labels_json(client, csv_data):
+    response = client.post(
+        '/api/v1/labels',
+        json={
+            'csv': csv_data,
+            'label_type': 'AVERY_70X36',
+            'tickets': {'Visite seule': {'post_visit': False}},
+            'start_offset': 2,
+        },
+    )
+    assert response.status_code == 200
+    latex = response.get_data(as_text=True)
+    assert latex.count(r'\addPerson{') == 2
+    assert r'\addPerson{Élise}{Zoé}{\memberIcon}{\visitIcon}{\emptyIcon}' in latex
+
+
+def test_generate_labels_form(client, csv_data):
+    response = client.post(
+        '/api/v1/labels',
+        data={
+            'csv_file': (io.BytesIO(csv_data.encode('utf-8')), 'participants.csv'),
+            'label_type': 'AVERY_70X36',
+            'tickets': json.dumps({'Visite seule': {'post_visit': False}}),
+        },
+        content_type='multipart/form-data',
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        {'csv': 42},
+        {'tickets': ['Visite seule']},
+        {'tickets': 'Visite seule'},
+        {'tickets': {'Visite seule': True}},
+        {'tickets': {'Visite seule': {'visit': 'false'}}},
+        {'tickets': {'Visite seule': {'post_visit': 0}}},
+        {'tickets': {'Visite seule': {'apero': True}}},
+        {'start_offset': 99},
+        {'start_offset': 24},
+        {'start_offset': -1},
+        {'start_offset': '-1'},
+        {'start_offset': 1.7},
+        {'start_offset': True},
+        {'start_offset': 'two'},
+        {'start_offset': [1]},
+        {'label_type': 'UNKNOWN'},
+        {'label_type': 5},
+        {'event_type': 5},
+        {'event_food': 3},
+        {'sort_type': 'bogus'},
+        {'sort_type': ['x']},
+    ],
+)
+def test_generate_labels_invalid_json(client, csv_data, options):
+    response = client.post('/api/v1/labels', json={'csv': csv_data, 'label_type': 'AVERY_70X36', **options})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        {'start_offset': '9', 'sort_type': 'first_name'},
+        {'start_offset': '', 'event_type': 'CULTURAL_VISIT', 'event_food': 'EventFood.MEAL'},
+        {'start_offset': None, 'tickets': {'Visite seule': {'visit': True, 'post_visit': False}}},
+    ],
+)
+def test_generate_labels_valid_json(client, csv_data, options):
+    response = client.post('/api/v1/labels', json={'csv': csv_data, 'label_type': 'AVERY_70X36', **options})
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).count(r'\addPerson{') == 2
+
+
+@pytest.mark.parametrize('tickets', ['[1, 2]', '"Visite seule"', '{"Visite seule": 1}', '{'])
+def test_generate_labels_invalid_form_tickets(client, csv_data, tickets):
+    response = client.post(
+        '/api/v1/labels',
+        data={
+            'csv_file': (io.BytesIO(csv_data.encode('utf-8')), 'participants.csv'),
+            'label_type': 'AVERY_70X36',
+            'tickets': tickets,
+        },
+        content_type='multipart/form-data',
+    )
+    assert response.status_code == 400
+
+
+def test_roster_page(upload, client):
+    assert client.get('/api/roster').status_code == 404
+
+    assert upload().status_code == 302
+    page = client.get('/api/roster').get_json()
+    assert page['total'] == 2
+    assert sorted(page['columns']) == sorted(page['people'][0])
+    assert [person['first_name'] for person in page['people']] == ['Jean', 'Élise']
+
+    page = client.get('/api/roster?offset=1&limit=5').get_json()
+    assert (page['offset'], page['limit']) == (1, 5)
+    assert [person['last_name'] for person in page['people']] == ['Zoé']
+
+
+@pytest.mark.parametrize(
+    ('query', 'expected'),
+    [('offset=-3', (0, 50, 2)), ('offset=7', (7, 50, 0)), ('limit=-1', (0, 0, 0)), ('limit=10000', (0, 500, 2))],
+)
+def test_roster_page_bounds(upload, client, query, expected):
+    upload()
+    page = client.get(f'/api/roster?{query}').get_json()
+    assert (page['offset'], page['limit'], len(page['people'])) == expected
+
+
+def test_process_pdf_unsupported_characters(upload, client):
+    upload('ID user AF,Prénom,Nom de famille,Cotisant,Nom du billet\n1,Łukasz,Nguyễn,Oui,Visite\n')
+    response = client.post(
+        '/process',
+        data={
+            'sort_type': 'last_name',
+            'label_type': 'AVERY_70X36',
+            'event_type_visit': 'COMPANY_VISIT',
+            'event_type_post_visit': 'MEAL',
+            'output_format': 'pdf',
+        },
+    )
+    assert response.status_code == 400
+    assert 'Łukasz, Nguyễn' in response.get_data(as_text=True)
@@ -0,0 +1,216 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Golden-file tests of the document backends.
+
+The generated documents are compared with the files of the `golden` directory. After an intended change of the output,
+these files can be regenerated using:
+
+    ALUSO_UPDATE_GOLDEN=1 python -m pytest tests/python/backends_test.py
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+from aluso_label.backends import BACKENDS, get_backend
+from aluso_label.event import EventFood, EventType
+from aluso_label.latex import LABEL_PROPERTIES, Label, LatexDocument
+from aluso_label.people import EventParticipation, Person
+
+# ==============================================================================
+
+GOLDEN_DIR = Path(__file__).parent / 'golden'
+TRUETYPE_FONT = Path('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
+UPDATE_GOLDEN = bool(os.environ.get('ALUSO_UPDATE_GOLDEN'))
+
+LABEL_TYPE = Label.AVERY_70X36
+EVENT_TYPE = EventType.CULTURAL_VISIT
+EVENT_FOOD = EventFood.MEAL
+START_OFFSET = 2
+VISIT_AND_POST_VISIT = EventParticipation.VISIT | EventParticipation.POST_VISIT
+
+_LATEX_PERSON_RE = re.compile(r'\\addPerson\{.*\}\{([^{}]*)\}\{(\\\w+)\}\{(\\\w+)\}')
+_LATEX_ICONS = {
+    r'\contribIcon': 'contrib',
+    r'\memberIcon': 'member',
+    r'\externalIcon': 'external',
+    r'\committeeIcon': 'committee',
+    r'\visitIcon': 'visit',
+    r'\postVisitIcon': 'post-visit',
+    r'\emptyIcon': 'empty',
+}
+_TYPST_PERSON_RE = re.compile(r'add-person\(.*, \(([\w, -]*),\), ([\w-]+), ([\w-]+)\)')
+
+
+def _person(first_name, last_name, status, participation_type):
+    """Create a person (status: external, member, contributor or committee)."""
+    return Person.from_dict(
+        {
+            'first_name': first_name,
+            'last_name': last_name,
+            'is_member': status != 'external',
+            'is_contributor': status == 'contributor',
+            'is_committee': status == 'committee',
+            'participation_type': participation_type,
+        }
+    )
+
+
+def make_people():
+    """List of participants covering all the icons, some special characters and a name that needs to be stretched."""
+    people = [
+        _person('Jean Paul', 'Dupont', 'committee', VISIT_AND_POST_VISIT),
+        _person('Élise', 'Zoé', 'member', EventParticipation.VISIT),
+        _person('Marc', "O'Brien & Co_ 100%", 'external', EventParticipation.POST_VISIT),
+        _person('Anna', 'Wolfeschlegel-Montmollin', 'contributor', VISIT_AND_POST_VISIT),
+        _person('Guest', '#1 {$x^2$} ~\\', 'external', EventParticipation.NOTHING),
+    ]
+    # NB: enough participants to fill more than one page (including the skipped labels)
+    people.extend(
+        _person(f'First{idx:02d}', f'Last{idx:02d}', 'member', VISIT_AND_POST_VISIT)
+        for idx in range(LABEL_PROPERTIES[LABEL_TYPE].labels_per_page)
+    )
+    return people
+
+
+def generate(name, **kwargs):
+    """Generate a document using a backend."""
+    backend = get_backend(name, **kwargs)
+    chunks = backend.iter_generate(LABEL_TYPE, EVENT_TYPE, EVENT_FOOD, make_people(), START_OFFSET)
+    return b''.join(chunks) if backend.binary else ''.join(chunks)
+
+
+def check_golden(filename, content):
+    """Compare some generated content with a golden file (or update the latter)."""
+    path = GOLDEN_DIR / filename
+    if UPDATE_GOLDEN:
+        GOLDEN_DIR.mkdir(exist_ok=True)
+        path.write_text(content, encoding='utf-8', newline='\n')
+    assert content == path.read_text(encoding='utf-8')
+
+
+def latex_labels(latex):
+    """Extract the icons of each label from some LaTeX code (None for empty labels)."""
+    labels = []
+    for line in latex.splitlines():
+        line = line.strip()  # noqa: PLW2901
+        if line == '~':
+            labels.append(None)
+        elif line.startswith(r'\addPerson'):
+            member_icons, visit_icon, post_visit_icon = _LATEX_PERSON_RE.fullmatch(line).groups()
+            labels.append(
+                (
+                    tuple(_LATEX_ICONS[icon] for icon in member_icons.split(r'\ ')),
+                    _LATEX_ICONS[visit_icon],
+                    _LATEX_ICONS[post_visit_icon],
+                )
+            )
+    return labels
+
+
+def typst_labels(typst):
+    """Extract the icons of each label from some Typst code (None for empty labels)."""
+    labels = []
+    for line in typst.splitlines():
+        line = line.strip()  # noqa: PLW2901
+        if line == '[],':
+            labels.append(None)
+        elif line.startswith('add-person('):
+            member_icons, visit_icon, post_visit_icon = _TYPST_PERSON_RE.fullmatch(line.rstrip(',')).groups()
+            labels.append(
+                (
+                    tuple(icon.strip().replace('-icon', '') for icon in member_icons.split(',')),
+                    visit_icon.replace('-icon', ''),
+                    post_visit_icon.replace('-icon', ''),
+                )
+            )
+    return labels
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('filename', 'name', 'kwargs'),
+    [
+        ('labels.tex', 'latex', {}),
+        ('labels_cache_icons.tex', 'latex', {'cache_icons': True}),
+        ('labels.typ', 'typst', {}),
+    ],
+)
+def test_golden(filename, name, kwargs):
+    check_golden(filename, generate(name, **kwargs))
+
+
+def test_latex_typst_same_structure():
+    latex = latex_labels(generate('latex'))
+    typst = typst_labels(generate('typst'))
+
+    people = make_people()
+    assert len(latex) == START_OFFSET + len(people)
+    assert latex[:START_OFFSET] == [None] * START_OFFSET
+    assert latex[START_OFFSET] == (('member', 'committee'), 'visit', 'post-visit')
+    assert latex[START_OFFSET + 3] == (('contrib',), 'visit', 'post-visit')
+    assert latex[START_OFFSET + 4] == (('external',), 'empty', 'empty')
+    assert typst == latex
+
+
+def test_same_number_of_pages():
+    people = make_people()
+    n_pages = len(list(LatexDocument(LABEL_TYPE, EVENT_TYPE, EVENT_FOOD).iter_pages(people, START_OFFSET)))
+    assert n_pages == 2
+
+    assert generate('typst').count('#label-sheet(') == n_pages
+    assert len(re.findall(rb'/Type\s*/Page\b', generate('pdf'))) == n_pages
+
+
+@pytest.mark.parametrize('name', list(BACKENDS))
+def test_invalid_start_offset(name):
+    backend = get_backend(name)
+    with pytest.raises(ValueError, match='Invalid start offset'):
+        b''.join(
+            chunk if isinstance(chunk, bytes) else chunk.encode()
+            for chunk in backend.iter_generate(LABEL_TYPE, EVENT_TYPE, EVENT_FOOD, make_people(), -1)
+        )
+
+
+def test_pdf_unsupported_characters():
+    people = [
+        _person('Łukasz', 'Nguyễn', 'member', EventParticipation.VISIT),
+        _person('Élise', 'Zoé', 'member', EventParticipation.VISIT),
+        _person('Łukasz', 'Dupont', 'member', EventParticipation.VISIT),
+    ]
+    backend = get_backend('pdf')
+    with pytest.raises(ValueError, match=r'Helvetica font: Łukasz, Nguyễn \(.*--font') as excinfo:
+        backend.iter_generate(LABEL_TYPE, EVENT_TYPE, EVENT_FOOD, people, START_OFFSET)
+    assert 'Zoé' not in str(excinfo.value)
+
+
+@pytest.mark.skipif(not TRUETYPE_FONT.exists(), reason='no TrueType font available')
+def test_pdf_truetype_font():
+    people = [_person('Łukasz', 'Nguyễn', 'member', EventParticipation.VISIT)]
+    backend = get_backend('pdf', font_path=TRUETYPE_FONT)
+    pdf = b''.join(backend.iter_generate(LABEL_TYPE, EVENT_TYPE, EVENT_FOOD, people, START_OFFSET))
+    assert b'/FontFile2' in pdf
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError, match='Invalid output format'):
+        get_backend('docx')
@@ -0,0 +1,141 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import json
+import re
+
+import pytest
+
+from aluso_label import batch
+from aluso_label.batch import check_manifest, check_unique_names, generate_batch, generate_event, main
+
+# ==============================================================================
+
+
+@pytest.fixture
+def events(tmp_path, csv_data):
+    paths = [tmp_path / 'spring' / 'export.csv', tmp_path / 'autumn' / 'Export.CSV', tmp_path / 'autumn' / 'gala.csv']
+    for path in paths:
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(csv_data, encoding='utf-8')
+    return paths
+
+
+# ==============================================================================
+
+
+def test_unique_names(events):
+    check_unique_names(events[1:])
+    with pytest.raises(ValueError, match='same name'):
+        check_unique_names(events)
+
+
+def test_duplicate_names_are_rejected(events, tmp_path):
+    output_dir = tmp_path / 'labels'
+    with pytest.raises(ValueError, match='same name'):
+        list(generate_batch(events, output_dir, {'defaults': {'label_type': 'AVERY_70X36'}}, max_workers=1))
+    assert not output_dir.exists()
+
+    with pytest.raises(SystemExit) as excinfo:
+        main([*map(str, events), '-l', 'AVERY_70X36', '-o', str(output_dir)])
+    assert excinfo.value.code == 2
+
+
+def test_generate_batch(events, tmp_path):
+    output_dir = tmp_path / 'labels'
+    results = list(generate_batch(events[1:], output_dir, {'defaults': {'label_type': 'AVERY_70X36'}}, max_workers=1))
+    assert [result.error for result in results] == [None, None]
+    assert sorted(path.name for path in output_dir.iterdir()) == ['Export.tex', 'gala.tex']
+
+
+def test_generate_event_error(events, tmp_path):
+    output_path = tmp_path / 'export.tex'
+    result = generate_event(events[0], output_path, {'label_type': ['AVERY_70X36']})
+    assert result.output_path is None
+    assert result.error.startswith('Invalid value for Label')
+    assert not output_path.exists()
+
+
+def test_generate_event_unexpected_error(events, tmp_path, monkeypatch):
+    def generate_latex_from_csv(*_args):
+        raise AttributeError('unexpected')
+
+    monkeypatch.setattr(batch, 'generate_latex_from_csv', generate_latex_from_csv)
+    result = generate_event(events[0], tmp_path / 'export.tex', {'label_type': 'AVERY_70X36'})
+    assert (result.output_path, result.error) == (None, 'AttributeError: unexpected')
+
+
+def test_generate_batch_invalid_options(events, tmp_path):
+    manifest = {'defaults': {'label_type': 'AVERY_70X36'}, 'events': {'gala.csv': {'label_type': 42}}}
+    results = {result.csv_path.name: result for result in generate_batch(events[1:], tmp_path / 'labels', manifest)}
+    assert results['Export.CSV'].error is None
+    assert results['gala.csv'].error.startswith('Invalid value for Label: 42')
+
+
+@pytest.mark.parametrize(
+    ('manifest', 'message'),
+    [
+        ([], 'expected a JSON object, not list'),
+        ('AVERY_70X36', 'expected a JSON object, not str'),
+        ({'defaults': 'AVERY_70X36'}, '"defaults" must be an object'),
+        ({'events': ['gala.csv']}, '"events" must be an object'),
+        ({'events': {'gala.csv': 'AVERY_70X36'}}, '"events" must be an object'),
+    ],
+)
+def test_invalid_manifest(manifest, message, events, tmp_path):
+    with pytest.raises(ValueError, match=message):
+        check_manifest(manifest)
+    with pytest.raises(ValueError, match=message):
+        list(generate_batch(events[1:], tmp_path / 'labels', manifest))
+
+
+@pytest.mark.parametrize(
+    ('content', 'message'),
+    [
+        ('{"defaults": ', 'cannot read manifest'),
+        ('["AVERY_70X36"]', 'expected a JSON object'),
+        ('{"defaults": {"label_type": 42}}', r'gala\.csv: Invalid value for Label: 42'),
+        ('{"events": {"gala.csv": {"label_type": "AVERY_70X36"}}}', r'Export\.CSV: Missing label type'),
+        ('{"events": {"gala.csv": {"label_type": "AVERY_70X36", "start_offset": 99}}}', 'Invalid start offset'),
+        ('{"events": {"gala.csv": {"label_type": "AVERY_70X36", "tickets": []}}}', 'Invalid ticket options'),
+    ],
+)
+def test_main_invalid_manifest(content, message, events, tmp_path, capsys):
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(content, encoding='utf-8')
+    output_dir = tmp_path / 'labels'
+    with pytest.raises(SystemExit) as excinfo:
+        main([*map(str, events[1:]), '-m', str(manifest_path), '-o', str(output_dir)])
+    assert excinfo.value.code == 2
+    assert re.search(message, capsys.readouterr().err)
+    assert not output_dir.exists()
+
+
+def test_main_missing_manifest(events, tmp_path, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(events[2]), '-m', str(tmp_path / 'missing.json'), '-o', str(tmp_path / 'labels')])
+    assert excinfo.value.code == 2
+    assert 'cannot read manifest' in capsys.readouterr().err
+
+
+def test_main(events, tmp_path):
+    manifest_path = tmp_path / 'manifest.json'
+    manifest = {'events': {'gala.csv': {'event_type': 'CULTURAL_VISIT', 'start_offset': 2}}}
+    manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+    output_dir = tmp_path / 'labels'
+    assert main([*map(str, events[1:]), '-m', str(manifest_path), '-l', 'AVERY_70X36', '-o', str(output_dir)]) == 0
+    assert sorted(path.name for path in output_dir.iterdir()) == ['Export.tex', 'gala.tex']
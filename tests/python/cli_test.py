@@ -0,0 +1,93 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from aluso_label.cli import main
+
+# ==============================================================================
+
+ROOT_DIR = Path(__file__).parents[2]
+
+# NB: modules that would make the startup of the command line interface noticeably slower
+HEAVY_MODULES = ('flask', 'werkzeug', 'jinja2', 'wtforms', 'aluso_label.latex', 'aluso_label.pdf', 'aluso_label.typst')
+
+
+def loaded_modules(code):
+    """Run some Python code in a fresh interpreter and return the modules loaded afterwards."""
+    code = f'import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))'
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT_DIR, capture_output=True, text=True, check=True, timeout=60
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def heavy_modules(modules):
+    return [module for module in modules if module.startswith(HEAVY_MODULES)]
+
+
+# ==============================================================================
+
+
+def test_import_is_lightweight():
+    assert heavy_modules(loaded_modules('import aluso_label.cli')) == []
+
+
+def test_help_is_lightweight():
+    code = 'from aluso_label.cli import main\ntry:\n    main(["--help"])\nexcept SystemExit:\n    pass'
+    assert heavy_modules(loaded_modules(code)) == []
+
+
+def test_generate(csv_file, tmp_path):
+    output = tmp_path / 'labels.tex'
+    assert main([str(csv_file), '-l', 'AVERY_70X36', '-o', str(output)]) == 0
+    latex = output.read_text(encoding='utf-8')
+    assert latex.count(r'\addPerson{') == 2
+
+
+def test_invalid_start_offset_leaves_no_output(csv_file, tmp_path):
+    output = tmp_path / 'labels.tex'
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(csv_file), '-l', 'AVERY_70X36', '--start-offset', '99', '-o', str(output)])
+    assert excinfo.value.code == 2
+    assert not output.exists()
+
+
+def test_missing_column_leaves_no_output(tmp_path):
+    csv_file = tmp_path / 'participants.csv'
+    csv_file.write_text('Prénom,Nom de famille\nJean,Dupont\n', encoding='utf-8')
+    output = tmp_path / 'labels.pdf'
+    assert main([str(csv_file), '-l', 'AVERY_70X36', '-F', 'pdf', '-o', str(output)]) == 1
+    assert not output.exists()
+
+
+def test_pdf_unsupported_characters(tmp_path, capsys):
+    csv_file = tmp_path / 'participants.csv'
+    csv_file.write_text(
+        'ID user AF,Prénom,Nom de famille,Cotisant,Nom du billet\n1,Łukasz,Nguyễn,Oui,Visite\n', encoding='utf-8'
+    )
+    output = tmp_path / 'labels.pdf'
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(csv_file), '-l', 'AVERY_70X36', '-F', 'pdf', '-o', str(output)])
+    assert excinfo.value.code == 2
+    assert '--font' in capsys.readouterr().err
+    assert not output.exists()
@@ -0,0 +1,179 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+
+import pytest
+
+from aluso_label.latex.compilation import CompilationQueue, JobStatus, QueueLimits
+
+# ==============================================================================
+
+TIMEOUT = 10
+
+
+class StubEngine:
+    """TeX engine "compiling" a .tex file by copying it into a PDF file (and counting the compilations)."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.compiled = []
+        self._lock = threading.Lock()
+
+    def __call__(self, tex_path):
+        time.sleep(self.delay)
+        data = tex_path.read_bytes()
+        with self._lock:
+            self.compiled.append(data.decode())
+        pdf_path = tex_path.with_suffix('.pdf')
+        pdf_path.write_bytes(data)
+        return pdf_path
+
+
+def stub_merger(pdf_paths, output_path):
+    output_path.write_bytes(b'\n'.join(path.read_bytes() for path in pdf_paths))
+
+
+def wait(queue, job_id):
+    """Wait for a job to be done or to fail."""
+    deadline = time.monotonic() + TIMEOUT
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job is not None and job.status in (JobStatus.DONE, JobStatus.FAILED):
+            return job
+        time.sleep(0.01)
+    pytest.fail(f'Job {job_id} did not finish within {TIMEOUT}s')
+
+
+@pytest.fixture
+def engine():
+    return StubEngine()
+
+
+@pytest.fixture
+def queue(tmp_path, engine):
+    compilation_queue = CompilationQueue(engine, tmp_path / 'cache', max_workers=1, merger=stub_merger)
+    yield compilation_queue
+    compilation_queue.shutdown()
+
+
+# ==============================================================================
+
+
+def test_cache_hit(queue, engine):
+    job = queue.submit('page 1')
+    assert job.job_id == hashlib.sha256(b'page 1').hexdigest()
+    assert wait(queue, job.job_id).status == JobStatus.DONE
+
+    assert queue.submit('page 1').status == JobStatus.DONE
+    assert queue.pdf_path(job.job_id).read_bytes() == b'page 1'
+    assert engine.compiled == ['page 1']
+
+
+def test_concurrent_submissions(tmp_path):
+    engine = StubEngine(delay=0.01)
+    queue = CompilationQueue(engine, tmp_path, max_workers=1, merger=stub_merger)
+    document_id = queue.register_pages(['page 1', 'page 2', 'page 3'])
+
+    jobs = []
+    threads = [threading.Thread(target=lambda: jobs.append(queue.submit_pages(document_id))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(TIMEOUT)
+    assert not any(thread.is_alive() for thread in threads)
+
+    assert len({job.job_id for job in jobs}) == 1
+    assert wait(queue, jobs[0].job_id).status == JobStatus.DONE
+    assert queue.pdf_path(jobs[0].job_id).read_bytes() == b'page 1\npage 2\npage 3'
+    assert sorted(engine.compiled) == ['page 1', 'page 2', 'page 3']
+    queue.shutdown()
+
+
+def test_manifest_reuse(queue, engine):
+    document_id = queue.register_pages(['page 1', 'page 2'])
+    assert queue.register_pages(['page 1', 'page 2']) == document_id
+    assert wait(queue, queue.submit_pages(document_id).job_id).status == JobStatus.DONE
+
+    # NB: only the page that changed is compiled again
+    other_id = queue.register_pages(['page 1', 'page 2 (edited)'])
+    assert other_id != document_id
+    job = wait(queue, queue.submit_pages(other_id).job_id)
+    assert job.status == JobStatus.DONE
+    assert queue.pdf_path(job.job_id).read_bytes() == b'page 1\npage 2 (edited)'
+    assert engine.compiled == ['page 1', 'page 2', 'page 2 (edited)']
+
+
+def test_background_registration(queue):
+    document_id = queue.register_pages_in_background(iter(['page 1', 'page 2']))
+    job = wait(queue, queue.submit_pages(document_id).job_id)
+    assert queue.pdf_path(job.job_id).read_bytes() == b'page 1\npage 2'
+
+
+def test_unknown_document(queue):
+    assert queue.submit_pages('0' * 64) is None
+    assert queue.submit_pages('../etc/passwd') is None
+    assert queue.get('0' * 64) is None
+
+
+def test_eviction(tmp_path, engine):
+    queue = CompilationQueue(engine, tmp_path, merger=stub_merger, limits=QueueLimits(cache_ttl=3600))
+    old_job = wait(queue, queue.submit('old page').job_id)
+    new_job = wait(queue, queue.submit('new page').job_id)
+    two_hours_ago = time.time() - 7200
+    os.utime(queue.pdf_path(old_job.job_id), (two_hours_ago, two_hours_ago))
+
+    queue.evict_cache()
+    assert queue.get(old_job.job_id) is None
+    assert queue.get(new_job.job_id).status == JobStatus.DONE
+
+    # NB: evicted documents are simply compiled again
+    assert wait(queue, queue.submit('old page').job_id).status == JobStatus.DONE
+    assert engine.compiled == ['old page', 'new page', 'old page']
+    queue.shutdown()
+
+
+def test_eviction_max_size(tmp_path, engine):
+    queue = CompilationQueue(engine, tmp_path, merger=stub_merger, limits=QueueLimits(cache_max_size=12))
+    jobs = [wait(queue, queue.submit(f'page {index}').job_id) for index in range(3)]
+    # NB: 6 bytes per page, hence only the two most recently used pages fit into the cache
+    now = time.time()
+    for index, job in enumerate(jobs):
+        os.utime(queue.pdf_path(job.job_id), (now - 10 + index, now - 10 + index))
+
+    queue.evict_cache()
+    assert [queue.get(job.job_id) is not None for job in jobs] == [False, True, True]
+    queue.shutdown()
+
+
+def test_evicted_page(queue):
+    document_id = queue.register_pages(['page 1', 'page 2'])
+    page_id = hashlib.sha256(b'page 2').hexdigest()
+    queue.pdf_path(page_id).with_suffix('.tex').unlink()
+
+    job = wait(queue, queue.submit_pages(document_id).job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.error == 'Page 2: missing LaTeX code'
+
+
+def test_evicted_manifest(queue):
+    document_id = queue.register_pages(['page 1'])
+    queue.pdf_path(document_id).with_suffix('.pages').unlink()
+    assert queue.submit_pages(document_id) is None
@@ -0,0 +1,87 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import io
+import re
+
+import pytest
+
+from aluso_label.people import Person
+from app.main import create_app
+
+# ==============================================================================
+
+_CSRF_TOKEN_RE = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+CSV_DATA = '''ID user AF,Prénom,Nom de famille,Cotisant,Nom du billet
+1,Jean,Dupont,Oui,Visite avec repas
+2,Élise,Zoé,Non,Visite seule
+'''
+
+
+@pytest.fixture
+def csv_data():
+    """Content of a small CSV export with two participants."""
+    return CSV_DATA
+
+
+@pytest.fixture
+def csv_file(tmp_path, csv_data):
+    """CSV export with two participants written into a temporary directory."""
+    path = tmp_path / 'participants.csv'
+    path.write_text(csv_data, encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Application whose roster store and snapshots are kept in a temporary directory."""
+    # NB: create_app() overwrites the global list of committee members
+    monkeypatch.setattr(Person, 'COMMITTEE_LIST', Person.COMMITTEE_LIST)
+    return create_app(
+        {
+            'TESTING': True,
+            'ROSTER_STORE': 'sqlite',
+            'ROSTER_STORE_PATH': tmp_path / 'rosters.sqlite3',
+            'SNAPSHOT_DIR': tmp_path / 'snapshots',
+            'LATEX_CACHE_DIR': tmp_path / 'pdf',
+        }
+    )
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def upload(client, csv_data):
+    """Function uploading a CSV file through the upload page (returns the response)."""
+
+    def _upload(data=csv_data, event=''):
+        csrf_token = _CSRF_TOKEN_RE.search(client.get('/').get_data(as_text=True)).group(1)
+        return client.post(
+            '/',
+            data={
+                'csrf_token': csrf_token,
+                'csv_file': (io.BytesIO(data.encode('utf-8')), 'participants.csv'),
+                'event': event,
+            },
+            content_type='multipart/form-data',
+        )
+
+    return _upload
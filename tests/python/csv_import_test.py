@@ -0,0 +1,142 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import codecs
+import io
+
+import pytest
+
+from aluso_label.csv_import import MissingFieldError, detect_encoding, iter_decoded_lines, read_people
+
+# ==============================================================================
+
+HEADER = 'ID user AF,Prénom,Nom de famille,Cotisant,Nom du billet\r\n'
+UTF8_ROW = '1,Zoé,Çelik,Oui,Visite avec repas\r\n'
+CP1252_ROW = '2,Jérôme,Dupré – €,Oui,Visite seule\r\n'  # noqa: RUF001
+LATIN1_ROW = '3,Hélène,Müller\x81,Non,Visite seule\r\n'
+
+
+class CountingStream(io.BytesIO):
+    """Binary stream keeping track of the number of bytes read."""
+
+    n_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.n_read += len(data)
+        return data
+
+
+def decode(data, **kwargs):
+    return ''.join(iter_decoded_lines(io.BytesIO(data), **kwargs))
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('sample', 'encoding'),
+    [
+        (codecs.BOM_UTF8 + b'abc', ('utf-8', 3)),
+        (codecs.BOM_UTF16_LE + b'a\0', ('utf-16-le', 2)),
+        ('Zoé'.encode(), ('utf-8', 0)),
+        ('Zoé'.encode()[:-1], ('utf-8', 0)),
+        ('Zoé €'.encode('cp1252'), ('cp1252', 0)),
+        (b'Zo\xe9 \x81', ('latin-1', 0)),
+        (b'', ('utf-8', 0)),
+    ],
+)
+def test_detect_encoding(sample, encoding):
+    assert detect_encoding(sample) == encoding
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 64, 64 * 1024])
+def test_fallback_beyond_sample(chunk_size):
+    # NB: the first byte that is not valid UTF-8 comes after the sample used to detect the encoding
+    utf8_data = (HEADER + UTF8_ROW * 10).encode('utf-8')
+    data = utf8_data + CP1252_ROW.encode('cp1252') + UTF8_ROW.encode('cp1252') + LATIN1_ROW.encode('latin-1')
+    text = decode(data, chunk_size=chunk_size, sample_size=len(utf8_data) // 2)
+    assert text == HEADER + UTF8_ROW * 10 + CP1252_ROW + UTF8_ROW + LATIN1_ROW
+
+
+def test_fallback_beyond_default_sample():
+    utf8_data = (HEADER + UTF8_ROW * 5000).encode('utf-8')
+    assert len(utf8_data) > 128 * 1024
+    lines = list(iter_decoded_lines(io.BytesIO(utf8_data + CP1252_ROW.encode('cp1252'))))
+    assert lines[-2:] == [UTF8_ROW, CP1252_ROW]
+    assert len(lines) == 5002
+
+
+def test_fallback_split_character():
+    # NB: the UTF-8 character split across two chunks is valid, the error only comes with the next one
+    data = 'Zoé\r\n'.encode() + b'Zo\xe9\r\n'
+    for chunk_size in range(1, len(data) + 1):
+        assert decode(data, chunk_size=chunk_size, sample_size=3) == 'Zoé\r\nZoé\r\n'
+
+
+def test_line_endings():
+    assert list(iter_decoded_lines(io.BytesIO(b'a\r\nb\rc\nd'), chunk_size=1, sample_size=1)) == [
+        'a\r\n',
+        'b\r',
+        'c\n',
+        'd',
+    ]
+
+
+def test_read_people_fallback():
+    data = (HEADER + UTF8_ROW * 3000).encode('utf-8') + CP1252_ROW.encode('cp1252')
+    people = list(read_people(io.BytesIO(data)))
+    assert len(people) == 3001
+    assert (people[0].first_name, people[0].last_name) == ('Zoé', 'Çelik')
+    assert (people[-1].first_name, people[-1].last_name) == ('Jérôme', 'Dupré – €')  # noqa: RUF001
+
+
+def test_read_people():
+    data = (
+        'First name,Ticket name,Family Name,Contributor,ID user AF,Price\r\n'
+        ' Jean ,Visit only,Dupont,Yes,1,10\r\n'
+        '\r\n'
+        'Élise,,Zoé,No,2\r\n'
+        '"Anna, Maria","Visit\r\nwith dinner",Wolf,\r\n'
+        'Marc,Guest,Short\r\n'
+    )
+    people = list(read_people(io.BytesIO(data.encode('utf-8'))))
+    assert [
+        (p.aluso_uid, p.first_name, p.last_name, p.is_member, p.is_contributor, p.participation_type) for p in people
+    ] == [
+        ('1', 'Jean', 'Dupont', True, True, 'Visit only'),
+        ('', 'Anna, Maria', 'Wolf', False, False, 'Visit\r\nwith dinner'),
+        ('', 'Marc', 'Short', False, False, 'Guest'),
+    ]
+
+
+def test_read_people_missing_field():
+    with pytest.raises(MissingFieldError, match='ticket_name') as excinfo:
+        list(read_people(io.BytesIO(b'ID user AF,First name,Family Name,Contributor\r\n1,Jean,Dupont,Yes\r\n')))
+    assert excinfo.value.options == ['Nom du billet', 'Ticket name']
+
+    with pytest.raises(MissingFieldError, match='aluso_uid'):
+        list(read_people(io.BytesIO(b'')))
+
+
+def test_read_people_streaming():
+    stream = CountingStream((HEADER + UTF8_ROW * 20000).encode('utf-8'))
+    people = read_people(stream)
+    assert next(people).last_name == 'Çelik'
+    assert stream.n_read < len(stream.getvalue()) // 2
+    assert sum(1 for _ in people) == 19999
+    assert stream.n_read == len(stream.getvalue())
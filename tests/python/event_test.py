@@ -0,0 +1,122 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+from __future__ import annotations
+
+import pytest
+
+from aluso_label.event import (
+    DEFAULT_TICKET_RULES,
+    EventFood,
+    TicketClassifier,
+    TicketGuess,
+    TicketRule,
+    get_ticket_id,
+    guess_ticket_options,
+)
+from aluso_label.people import EventParticipation
+
+# ==============================================================================
+
+VISIT_AND_POST_VISIT = EventParticipation.VISIT | EventParticipation.POST_VISIT
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('ticket_name', 'expected'),
+    [
+        ('Visite avec repas', TicketGuess(VISIT_AND_POST_VISIT, EventFood.MEAL, 'meal')),
+        ('Visit with dinner', TicketGuess(VISIT_AND_POST_VISIT, EventFood.MEAL, 'meal')),
+        ('VISITE AVEC DÎNER', TicketGuess(VISIT_AND_POST_VISIT, EventFood.MEAL, 'meal')),
+        ('Visite avec apéro', TicketGuess(VISIT_AND_POST_VISIT, EventFood.APERO, 'apero')),
+        ('Visit with apero', TicketGuess(VISIT_AND_POST_VISIT, EventFood.APERO, 'apero')),
+        ('Visite seule', TicketGuess(EventParticipation.VISIT, EventFood.NOTHING, 'visit_only')),
+        ('Visit only (students)', TicketGuess(EventParticipation.VISIT, EventFood.NOTHING, 'visit_only')),
+        ('Invité', TicketGuess(EventParticipation.VISIT, EventFood.NOTHING)),
+        ('', TicketGuess(EventParticipation.VISIT, EventFood.NOTHING)),
+    ],
+)
+def test_classify(ticket_name, expected):
+    assert TicketClassifier().classify(ticket_name) == expected
+
+
+def test_classify_priority():
+    # NB: the first rule that matches wins
+    assert TicketClassifier().classify('Visite avec apéro avec repas').rule == 'meal'
+    rules = [DEFAULT_TICKET_RULES[1], DEFAULT_TICKET_RULES[0]]
+    assert TicketClassifier(rules).classify('Visite avec apéro avec repas').rule == 'apero'
+
+
+def test_custom_rules():
+    classifier = TicketClassifier([TicketRule('lunch', r'\blunch\b', VISIT_AND_POST_VISIT, EventFood.MEAL)])
+    assert classifier.classify('Visit + Lunch') == TicketGuess(VISIT_AND_POST_VISIT, EventFood.MEAL, 'lunch')
+    assert classifier.classify('Visit with dinner') == TicketGuess(EventParticipation.VISIT, EventFood.NOTHING)
+
+
+def test_invalid_rule():
+    with pytest.raises(ValueError, match='Invalid ticket rule pattern'):
+        TicketClassifier([TicketRule('broken', r'(avec', VISIT_AND_POST_VISIT, EventFood.MEAL)])
+
+
+def test_guess_ticket_options():
+    ticket_names = ['Visite seule', 'Visite avec apéro', 'Visite avec repas', 'Invité']
+    expected = ([False, True, True, False], EventFood.APERO)
+    assert TicketClassifier().guess_ticket_options(ticket_names) == expected
+    assert guess_ticket_options(ticket_names) == expected
+    assert guess_ticket_options(iter(ticket_names)) == expected
+    assert guess_ticket_options(['Visite seule', 'Invité']) == ([False, False], EventFood.NOTHING)
+    assert guess_ticket_options([]) == ([], EventFood.NOTHING)
+
+
+def test_cache():
+    classifier = TicketClassifier()
+    ticket_names = ['Visite seule', 'Visite avec repas', 'Visite seule', 'Visite seule']
+    classifier.guess_ticket_options(ticket_names)
+    info = classifier.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+    # NB: the results are memoized for each classifier (with its own rules)
+    assert TicketClassifier().cache_info().currsize == 0
+    assert classifier.classify('Visite avec repas').rule == 'meal'
+    assert classifier.cache_info().hits == 3
+
+
+def test_cache_size():
+    classifier = TicketClassifier(cache_size=2)
+    ticket_names = [f'Visite avec repas ({idx})' for idx in range(5)]
+    assert classifier.guess_ticket_options(ticket_names) == ([True] * 5, EventFood.MEAL)
+    info = classifier.cache_info()
+    assert (info.misses, info.maxsize, info.currsize) == (5, 2, 2)
+
+    # NB: the least recently used names were evicted
+    classifier.classify(ticket_names[0])
+    classifier.classify(ticket_names[-1])
+    info = classifier.cache_info()
+    assert (info.hits, info.misses) == (1, 6)
+
+
+@pytest.mark.parametrize(
+    ('ticket_name', 'expected'),
+    [
+        ('Visite seule', 'visite_seule'),
+        ('Visit with dinner', 'visit_with_dinner'),
+        ('Visite uniquement (étudiants)', 'visite_uniquement__étudiants_'),
+        ('Prix: 25.00/{CHF}', 'prix:_25_00__chf_'),
+    ],
+)
+def test_get_ticket_id(ticket_name, expected):
+    assert get_ticket_id(ticket_name) == expected
@@ -0,0 +1,112 @@
+// Generated label sheet (requires Typst 0.13 or later)
+
+// Label configuration for: 70x36mm (A3475,A3490,A6122)
+#let label-cols = 3
+#let label-rows = 8
+#let label-width = 70mm
+#let label-height = 36mm
+#let label-column-gutter = 0mm
+#let label-row-gutter = 0mm
+#let label-inset = (left: 5mm, right: 5mm, top: 5mm, bottom: 5mm)
+
+#set page(paper: "a4", margin: (left: 0mm, top: 5mm, rest: 0mm))
+
+#set text(font: ("Arial", "Liberation Sans", "Helvetica"), size: 12pt)
+#set par(leading: 0.53em)
+
+// ==============================================================================
+// Marks and icons
+
+#let svg-icon(data) = box(image(bytes(data), format: "svg"))
+#let empty-icon = h(5.4mm)
+
+#let external-icon = svg-icon("<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"9.638pt\" height=\"11.339pt\" viewBox=\"0.000 -11.339 9.638 11.339\" overflow=\"visible\"><path d=\"M 0.000 -2.835 C 0.000 -5.026 1.777 -6.803 3.969 -6.803 C 6.160 -6.803 7.937 -5.026 7.937 -2.835 M 6.236 -9.071 C 6.236 -10.323 5.221 -11.339 3.969 -11.339 C 2.716 -11.339 1.701 -10.323 1.701 -9.071 C 1.701 -7.818 2.716 -6.803 3.969 -6.803 C 5.221 -6.803 6.236 -7.818 6.236 -9.071 Z M 0.000 -2.835 L 0.000 -0.000 L 7.937 -0.000 L 7.937 -2.835\" fill=\"none\" stroke=\"#000000\" stroke-width=\"0.4\"/><path d=\"M 9.638 -1.701 C 9.638 -2.640 8.876 -3.402 7.937 -3.402 C 6.998 -3.402 6.236 -2.640 6.236 -1.701 C 6.236 -0.761 6.998 -0.000 7.937 -0.000 C 8.876 0.000 9.638 -0.761 9.638 -1.701 Z M 7.087 -1.701 L 8.787 -1.701 M 7.937 -0.850 L 7.937 -2.551\" fill=\"#ffffff\" stroke=\"#000000\" stroke-width=\"0.4\"/></svg>")
+#let member-icon = svg-icon("<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"7.937pt\" height=\"11.339pt\" viewBox=\"0.000 -11.339 7.937 11.339\" overflow=\"visible\"><path d=\"M 0.000 -2.835 C 0.000 -5.026 1.777 -6.803 3.969 -6.803 C 6.160 -6.803 7.937 -5.026 7.937 -2.835 M 6.236 -9.071 C 6.236 -10.323 5.221 -11.339 3.969 -11.339 C 2.716 -11.339 1.701 -10.323 1.701 -9.071 C 1.701 -7.818 2.716 -6.803 3.969 -6.803 C 5.221 -6.803 6.236 -7.818 6.236 -9.071 Z M 0.000 -2.835 L 0.000 -0.000 L 7.937 -0.000 L 7.937 -2.835\" fill=\"none\" stroke=\"#000000\" stroke-width=\"0.4\"/></svg>")
+#let contrib-icon = svg-icon("<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"12.140pt\" height=\"12.926pt\" viewBox=\"-6.070 -12.926 12.140 12.926\" overflow=\"visible\"><path d=\"M 0.000 -0.000 L 0.000 -5.102 M 1.474 -5.102 L 1.474 -0.000 M -1.474 -5.102 L -1.474 -0.000 M -2.948 -0.000 L -2.948 -10.205 M 2.948 -0.000 L 2.948 -10.205 M -2.948 -6.236 L 2.948 -6.236 M -2.948 -7.767 L 2.948 -7.767 M 4.008 -10.375 L 4.034 -10.377 L 4.059 -10.383 L 4.083 -10.393 L 4.106 -10.407 L 4.127 -10.425 L 4.146 -10.446 L 4.161 -10.470 L 4.174 -10.497 L 4.183 -10.527 L 4.189 -10.559 L 4.190 -10.592 L 4.187 -10.627 L 4.180 -10.663 L 4.168 -10.698 L 4.151 -10.734 L 4.130 -10.769 L 4.103 -10.802 L 4.073 -10.834 L 4.038 -10.864 L 3.998 -10.890 L 3.955 -10.913 L 3.908 -10.933 L 3.857 -10.948 L 3.803 -10.958 L 3.747 -10.964 L 3.689 -10.964 L 3.629 -10.958 L 3.568 -10.947 L 3.507 -10.929 L 3.446 -10.905 L 3.385 -10.875 L 3.326 -10.839 L 3.269 -10.796 L 3.215 -10.747 L 3.164 -10.691 L 3.116 -10.631 L 3.074 -10.564 L 3.036 -10.492 L 3.004 -10.416 L 2.978 -10.335 L 2.959 -10.250 L 2.947 -10.162 L 2.942 -10.071 L 2.946 -9.979 L 2.957 -9.885 L 2.977 -9.790 L 3.005 -9.696 L 3.042 -9.602 L 3.088 -9.510 L 3.142 -9.421 L 3.205 -9.334 L 3.276 -9.252 L 3.355 -9.175 L 3.442 -9.104 L 3.536 -9.038 L 3.637 -8.980 L 3.745 -8.930 L 3.858 -8.888 L 3.976 -8.855 L 4.098 -8.831 L 4.224 -8.818 L 4.352 -8.815 L 4.483 -8.822 L 4.614 -8.841 L 4.745 -8.871 L 4.876 -8.912 L 5.004 -8.964 L 5.129 -9.028 L 5.251 -9.103 L 5.367 -9.189 L 5.478 -9.285 L 5.582 -9.392 L 5.678 -9.508 L 5.765 -9.633 L 5.843 -9.767 L 5.910 -9.908 L 5.967 -10.057 L 6.012 -10.211 L 6.044 -10.371 L 6.064 -10.535 L 6.070 -10.701 L 6.062 -10.870 L 6.041 -11.040 L 6.006 -11.209 L 5.956 -11.377 L 5.892 -11.542 L 5.814 -11.703 L 5.723 -11.859 L 5.617 -12.009 L 5.499 -12.151 L 5.368 -12.285 L 5.225 -12.409 L 5.071 -12.523 L 4.907 -12.624 L 4.733 -12.713 L 4.551 -12.788 L 4.361 -12.849 L 4.165 -12.895 L 3.964 -12.926 M -4.008 -10.375 L -4.034 -10.377 L -4.059 -10.383 L -4.083 -10.393 L -4.106 -10.407 L -4.127 -10.425 L -4.146 -10.446 L -4.161 -10.470 L -4.174 -10.497 L -4.183 -10.527 L -4.189 -10.559 L -4.190 -10.592 L -4.187 -10.627 L -4.180 -10.663 L -4.168 -10.698 L -4.151 -10.734 L -4.130 -10.769 L -4.103 -10.802 L -4.073 -10.834 L -4.038 -10.864 L -3.998 -10.890 L -3.955 -10.913 L -3.908 -10.933 L -3.857 -10.948 L -3.803 -10.958 L -3.747 -10.964 L -3.689 -10.964 L -3.629 -10.958 L -3.568 -10.947 L -3.507 -10.929 L -3.446 -10.905 L -3.385 -10.875 L -3.326 -10.839 L -3.269 -10.796 L -3.215 -10.747 L -3.164 -10.691 L -3.116 -10.631 L -3.074 -10.564 L -3.036 -10.492 L -3.004 -10.416 L -2.978 -10.335 L -2.959 -10.250 L -2.947 -10.162 L -2.942 -10.071 L -2.946 -9.979 L -2.957 -9.885 L -2.977 -9.790 L -3.005 -9.696 L -3.042 -9.602 L -3.088 -9.510 L -3.142 -9.421 L -3.205 -9.334 L -3.276 -9.252 L -3.355 -9.175 L -3.442 -9.104 L -3.536 -9.038 L -3.637 -8.980 L -3.745 -8.930 L -3.858 -8.888 L -3.976 -8.855 L -4.098 -8.831 L -4.224 -8.818 L -4.352 -8.815 L -4.483 -8.822 L -4.614 -8.841 L -4.745 -8.871 L -4.876 -8.912 L -5.004 -8.964 L -5.129 -9.028 L -5.251 -9.103 L -5.367 -9.189 L -5.478 -9.285 L -5.582 -9.392 L -5.678 -9.508 L -5.765 -9.633 L -5.843 -9.767 L -5.910 -9.908 L -5.967 -10.057 L -6.012 -10.211 L -6.044 -10.371 L -6.064 -10.535 L -6.070 -10.701 L -6.062 -10.870 L -6.041 -11.040 L -6.006 -11.209 L -5.956 -11.377 L -5.892 -11.542 L -5.814 -11.703 L -5.723 -11.859 L -5.617 -12.009 L -5.499 -12.151 L -5.368 -12.285 L -5.225 -12.409 L -5.071 -12.523 L -4.907 -12.624 L -4.733 -12.713 L -4.551 -12.788 L -4.361 -12.849 L -4.165 -12.895 L -3.964 -12.926 M -3.997 -12.926 L 3.997 -12.926\" fill=\"none\" stroke=\"#000000\" stroke-width=\"0.4\"/></svg>")
+#let committee-icon = svg-icon("<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"22.677pt\" height=\"14.173pt\" viewBox=\"0.000 -5.669 22.677 14.173\" overflow=\"visible\"><path d=\"M 2.835 -0.000 C 2.835 -1.566 4.104 -2.835 5.669 -2.835 C 7.235 -2.835 8.504 -1.566 8.504 0.000 M 7.087 -4.252 C 7.087 -5.035 6.452 -5.669 5.669 -5.669 C 4.887 -5.669 4.252 -5.035 4.252 -4.252 C 4.252 -3.469 4.887 -2.835 5.669 -2.835 C 6.452 -2.835 7.087 -3.469 7.087 -4.252 Z M 8.504 -0.000 C 8.504 -1.566 9.773 -2.835 11.339 -2.835 C 12.904 -2.835 14.173 -1.566 14.173 0.000 M 12.756 -4.252 C 12.756 -5.035 12.121 -5.669 11.339 -5.669 C 10.556 -5.669 9.921 -5.035 9.921 -4.252 C 9.921 -3.469 10.556 -2.835 11.339 -2.835 C 12.121 -2.835 12.756 -3.469 12.756 -4.252 Z M 14.173 -0.000 C 14.173 -1.566 15.442 -2.835 17.008 -2.835 C 18.573 -2.835 19.843 -1.566 19.843 0.000 M 18.425 -4.252 C 18.425 -5.035 17.791 -5.669 17.008 -5.669 C 16.225 -5.669 15.591 -5.035 15.591 -4.252 C 15.591 -3.469 16.225 -2.835 17.008 -2.835 C 17.791 -2.835 18.425 -3.469 18.425 -4.252 Z M 0.000 2.835 L 22.677 2.835 L 22.677 -0.000 L 0.000 -0.000 Z M 2.835 3.118 L 2.835 8.504 L 19.843 8.504 L 19.843 3.118\" fill=\"none\" stroke=\"#ff0000\" stroke-width=\"0.4\"/></svg>")
+
+#let visit-icon = svg-icon("<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"12.756pt\" height=\"13.779pt\" viewBox=\"-0.000 -14.860 12.756 13.779\" overflow=\"visible\"><path d=\"M 4.252 -6.803 L 4.252 -10.205 M 12.756 -6.803 L 12.756 -10.205 M 4.252 -6.803 C 4.252 -4.186 5.961 -1.876 8.464 -1.111 M 12.756 -6.803 C 12.756 -4.147 10.997 -1.813 8.444 -1.081 M 4.252 -10.205 C 6.940 -11.458 10.045 -11.458 12.734 -10.205 M 5.953 -8.504 L 7.654 -8.504 M 11.055 -8.504 L 9.354 -8.504 M 6.378 -4.252 C 7.643 -5.313 9.486 -5.313 10.751 -4.252\" fill=\"none\" stroke=\"#000000\" stroke-width=\"0.4\"/><path d=\"M 8.504 -10.205 C 8.504 -7.549 6.745 -5.215 4.192 -4.483 L 3.402 -10.205 L 8.504 -13.606 Z\" fill=\"#ffffff\" stroke=\"none\" stroke-width=\"0.4\"/><path d=\"M 0.000 -10.205 L 0.000 -13.606 M 8.504 -10.205 L 8.504 -13.606 M 0.000 -10.205 C -0.000 -7.587 1.709 -5.277 4.212 -4.512 M 8.504 -10.205 C 8.504 -7.549 6.745 -5.215 4.192 -4.483 M 0.000 -13.606 C 2.688 -14.860 5.793 -14.860 8.482 -13.606 M 1.701 -11.906 L 3.402 -11.906 M 6.803 -11.906 L 5.102 -11.906 M 2.126 -8.504 C 3.391 -7.443 5.234 -7.443 6.499 -8.504\" fill=\"none\" stroke=\"#000000\" stroke-width=\"0.4\"/></svg>")
+#let post-visit-icon = svg-icon("<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"12.518pt\" height=\"12.790pt\" viewBox=\"-0.000 -0.000 12.518 12.790\" overflow=\"visible\"><path d=\"M 0.000 4.762 L 0.000 -0.000 L 7.620 -0.000 L 7.620 4.762 C 7.620 6.566 6.158 8.028 4.354 8.028 L 4.354 10.749 C 4.354 11.876 5.268 12.790 6.395 12.790 L 7.075 12.790 M 0.000 4.762 C -0.000 6.566 1.462 8.028 3.266 8.028 L 3.266 10.749 C 3.266 11.876 2.352 12.790 1.225 12.790 L 0.544 12.790 M 9.252 -0.000 L 9.252 3.538 M 10.885 -0.000 L 10.885 3.538 M 12.518 -0.000 L 12.518 4.082 C 12.518 4.984 11.787 5.715 10.885 5.715 L 10.885 12.790\" fill=\"none\" stroke=\"#000000\" stroke-width=\"0.4\"/></svg>")
+
+#let epfl-logo = svg-icon("<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"51.639pt\" height=\"15.024pt\" viewBox=\"0.000 -15.024 51.639 15.024\" overflow=\"visible\"><path d=\"M 0.000 -8.929 L 3.308 -8.929 L 3.308 -15.024 L 0.000 -15.024 Z M 3.308 -12.189 L 10.820 -12.189 L 10.820 -15.024 L 3.308 -15.024 Z M 3.308 -6.094 L 10.395 -6.094 L 10.395 -8.929 L 3.308 -8.929 Z M 0.000 -0.000 L 10.820 -0.000 L 10.820 -2.835 L 0.000 -2.835 Z M 0.000 -0.000 L 3.308 -0.000 L 3.308 -6.094 L 0.000 -6.094 Z M 13.606 -0.000 L 16.914 -0.000 L 16.914 -15.024 L 13.606 -15.024 Z M 16.914 -12.189 L 21.308 -12.189 L 21.308 -15.024 L 16.914 -15.024 Z M 16.914 -6.094 L 21.308 -6.094 L 21.308 -8.929 L 16.914 -8.929 Z M 21.047 -6.094 C 23.513 -6.094 25.512 -8.093 25.512 -10.559 C 25.512 -13.025 23.513 -15.024 21.047 -15.024 L 21.047 -12.189 C 21.947 -12.189 22.677 -11.459 22.677 -10.559 C 22.677 -9.659 21.947 -8.929 21.047 -8.929 L 21.047 -6.094 Z M 27.638 -0.000 L 30.946 -0.000 L 30.946 -6.094 L 27.638 -6.094 Z M 30.946 -6.094 L 37.891 -6.094 L 37.891 -8.929 L 30.946 -8.929 Z M 27.638 -8.929 L 30.946 -8.929 L 30.946 -15.024 L 27.638 -15.024 Z M 30.946 -12.189 L 38.599 -12.189 L 38.599 -15.024 L 30.946 -15.024 Z M 40.819 -0.000 L 44.127 -0.000 L 44.127 -15.024 L 40.819 -15.024 Z M 44.127 -0.000 L 51.639 -0.000 L 51.639 -2.835 L 44.127 -2.835 Z\" fill=\"#ff0000\" stroke=\"none\" stroke-width=\"0.4\"/></svg>")
+#let logo-width = 2.4cm
+
+// ==============================================================================
+// Label functions
+
+#let name(value, stretch: 100%) = scale(x: stretch, origin: left, reflow: true, value.replace(" ", sym.space.thin))
+
+#let add-person(first-name, last-name, member-icons, visit, post-visit) = box(
+  width: label-width,
+  height: label-height,
+  inset: label-inset,
+  {
+    grid(
+      columns: (logo-width, 1fr),
+      align: horizon,
+      epfl-logo,
+      text(size: 14.4pt, first-name + linebreak() + last-name),
+    )
+    v(.5em)
+    grid(
+      columns: (logo-width, 1fr),
+      align: bottom,
+      member-icons.join(h(0.278em)),
+      visit + h(0.278em) + post-visit,
+    )
+  },
+)
+
+#let label-sheet(..labels) = {
+  pagebreak(weak: true)
+  grid(
+    columns: (label-width,) * label-cols,
+    rows: label-height,
+    column-gutter: label-column-gutter,
+    row-gutter: label-row-gutter,
+    ..labels.pos(),
+  )
+}
+
+// ==============================================================================
+
+#label-sheet(
+  [],
+  [],
+  add-person(name("Jean Paul"), name("Dupont"), (member-icon, committee-icon,), visit-icon, post-visit-icon),
+  add-person(name("Élise"), name("Zoé"), (member-icon,), visit-icon, empty-icon),
+  add-person(name("Marc"), name("O'Brien & Co_ 100%", stretch: 80.200%), (external-icon,), empty-icon, post-visit-icon),
+  add-person(name("Anna"), name("Wolfeschlegel-Montmollin", stretch: 62.400%), (contrib-icon,), visit-icon, post-visit-icon),
+  add-person(name("Guest"), name("#1 {$x^2$} ~\\"), (external-icon,), empty-icon, empty-icon),
+  add-person(name("First00"), name("Last00"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First01"), name("Last01"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First02"), name("Last02"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First03"), name("Last03"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First04"), name("Last04"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First05"), name("Last05"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First06"), name("Last06"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First07"), name("Last07"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First08"), name("Last08"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First09"), name("Last09"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First10"), name("Last10"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First11"), name("Last11"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First12"), name("Last12"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First13"), name("Last13"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First14"), name("Last14"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First15"), name("Last15"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First16"), name("Last16"), (member-icon,), visit-icon, post-visit-icon),
+)
+
+#label-sheet(
+  add-person(name("First17"), name("Last17"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First18"), name("Last18"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First19"), name("Last19"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First20"), name("Last20"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First21"), name("Last21"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First22"), name("Last22"), (member-icon,), visit-icon, post-visit-icon),
+  add-person(name("First23"), name("Last23"), (member-icon,), visit-icon, post-visit-icon),
+)
+
+// Local Variables:
+// mode: typst
+// End:
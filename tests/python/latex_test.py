@@ -0,0 +1,174 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import pytest
+
+from aluso_label.latex import LABEL_PROPERTIES, Label, find_overflowing_names, person_cache_info, set_person_cache_size
+from aluso_label.latex.latex_document import (
+    DEFAULT_PERSON_CACHE_SIZE,
+    apply_stretch_factor,
+    escape_latex,
+    get_stretch_factor,
+    person_to_latex,
+)
+from aluso_label.metrics import get_name_width
+from aluso_label.people import EventParticipation, Person
+from aluso_label.roster import Roster
+from app.main import create_app
+
+# ==============================================================================
+
+LABEL_TYPE = Label.AVERY_70X36
+
+
+def make_person(first_name='Jean', last_name='Dupont', participation_type=EventParticipation.VISIT):
+    return Person('1', first_name, last_name, True, False, participation_type)
+
+
+@pytest.fixture
+def person_cache():
+    """Start with an empty cache of the default size (restored afterwards)."""
+    set_person_cache_size(DEFAULT_PERSON_CACHE_SIZE)
+    yield
+    set_person_cache_size(DEFAULT_PERSON_CACHE_SIZE)
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('name', 'expected'),
+    [
+        ('a\\b', r'a\textbackslash{}b'),
+        ('a~b', r'a\textasciitilde{}b'),
+        ('a^b', r'a\textasciicircum{}b'),
+        ('#1', r'\#1'),
+        ('A & B', r'A\,\&\,B'),
+        ('100%', r'100\%'),
+        ('$x_1$', r'\$x\_1\$'),
+        ('{x}', r'\{x\}'),
+        ('Jean\u00a0Paul', r'Jean\,Paul'),
+        ('Jean\u202fPaul', r'Jean\,Paul'),
+        ('Jean\tPaul', r'Jean\,Paul'),
+        ('\\{}', r'\textbackslash{}\{\}'),
+    ],
+)
+def test_escape_latex(name, expected):
+    assert escape_latex(name) == expected
+
+
+def test_escape_latex_normalization():
+    # NB: decomposed 'É' (E + combining acute accent)
+    assert escape_latex('E\u0301lise') == '\u00c9lise'
+
+
+def test_escape_latex_unchanged():
+    name = 'Élise Zoé-Dupont'
+    assert escape_latex(name) == r'Élise\,Zoé-Dupont'
+    name = "O'Brien"
+    assert escape_latex(name) is name
+
+
+@pytest.mark.usefixtures('person_cache')
+def test_person_cache():
+    person = make_person()
+    latex = person_to_latex(person, LABEL_TYPE)
+    assert latex == r'\addPerson{Jean}{Dupont}{\memberIcon}{\visitIcon}{\emptyIcon}'
+    assert person_to_latex(make_person(), LABEL_TYPE) == latex
+    # NB: the rows of a roster share the entries of the equivalent people
+    assert person_to_latex(Roster([person])[0], LABEL_TYPE) == latex
+    info = person_cache_info()
+    assert (info.hits, info.misses, info.currsize, info.maxsize) == (2, 1, 1, DEFAULT_PERSON_CACHE_SIZE)
+
+    person_to_latex(person, Label.AVERY_80X50)
+    person_to_latex(person, LABEL_TYPE, cache_icons=True)
+    assert (person_cache_info().misses, person_cache_info().currsize) == (3, 3)
+
+
+@pytest.mark.usefixtures('person_cache')
+def test_person_cache_key():
+    # NB: people are mutable, so everything that ends up on the label needs to be part of the key
+    person = make_person()
+    person_to_latex(person, LABEL_TYPE)
+    person.last_name = 'Dupond'
+    assert '{Dupond}' in person_to_latex(person, LABEL_TYPE)
+    person.is_committee = True
+    assert r'\committeeIcon' in person_to_latex(person, LABEL_TYPE)
+    person.participation_type = EventParticipation.VISIT | EventParticipation.POST_VISIT
+    assert r'\postVisitIcon' in person_to_latex(person, LABEL_TYPE)
+    assert person_cache_info().misses == 4
+
+
+@pytest.mark.usefixtures('person_cache')
+def test_person_cache_size():
+    set_person_cache_size(2)
+    people = [make_person(first_name) for first_name in ('Anna', 'Jean', 'Marc')]
+    for person in people:
+        person_to_latex(person, LABEL_TYPE)
+    assert person_cache_info().currsize == 2
+
+    # NB: the least recently used entry (Anna) was evicted
+    person_to_latex(people[2], LABEL_TYPE)
+    person_to_latex(people[0], LABEL_TYPE)
+    assert (person_cache_info().hits, person_cache_info().misses) == (1, 4)
+
+    set_person_cache_size(0)
+    assert person_to_latex(people[0], LABEL_TYPE) == person_to_latex(people[0], LABEL_TYPE)
+    assert (person_cache_info().hits, person_cache_info().misses, person_cache_info().currsize) == (0, 2, 0)
+
+
+@pytest.mark.usefixtures('person_cache')
+def test_person_cache_config(monkeypatch):
+    monkeypatch.setattr(Person, 'COMMITTEE_LIST', Person.COMMITTEE_LIST)
+    create_app({'ROSTER_STORE': 'cookie', 'SNAPSHOTS': False, 'LATEX_PERSON_CACHE_SIZE': '16'})
+    assert person_cache_info().maxsize == 16
+
+
+def test_stretch_factor():
+    max_width = LABEL_PROPERTIES[LABEL_TYPE].name_width
+    assert get_stretch_factor('Dupont', max_width) == 1
+    assert get_stretch_factor('W' * 10, get_name_width('W' * 10)) == 1
+
+    name = 'Wolfeschlegel-Montmollin'
+    stretch = get_stretch_factor(name, max_width)
+    assert 0.5 <= stretch < 1
+    # NB: rounded down, so that the stretched name always fits
+    assert get_name_width(name) * stretch <= max_width < get_name_width(name) * (stretch + 0.001)
+
+    with pytest.raises(RuntimeError, match='Too small stretch factor'):
+        get_stretch_factor(name * 2, max_width)
+    assert get_stretch_factor(name * 2, max_width, threshold=0.1) < 0.5
+
+
+def test_apply_stretch_factor():
+    assert apply_stretch_factor('Dupont', 1) == 'Dupont'
+    assert apply_stretch_factor('Dupont', 0.85) == r'{\addfontfeatures{FakeStretch=0.85}Dupont}'
+
+
+@pytest.mark.parametrize('label_type', list(Label))
+def test_overflowing_names(label_type):
+    names = ['Dupont', 'Wolfeschlegel-Montmollin', 'Wolfeschlegel-Montmollin-Wolfeschlegel', 'W' * 40]
+    overflowing = find_overflowing_names([make_person(name, name) for name in names], label_type)
+
+    max_width = LABEL_PROPERTIES[label_type].name_width
+    for name in names:
+        if name in overflowing:
+            with pytest.raises(RuntimeError):
+                get_stretch_factor(name, max_width)
+        else:
+            get_stretch_factor(name, max_width)
+    assert overflowing[-2:] == ['W' * 40, 'W' * 40]
@@ -0,0 +1,57 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import unicodedata
+
+import pytest
+
+from aluso_label.metrics import NAME_FONT_SIZE, THIN_SPACE_WIDTH, get_char_width, get_name_width
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('char', 'width'),
+    [
+        ('W', 944),
+        ('i', 222),
+        ('é', 556),
+        ('ß', 611),
+        ('ă', 556),  # base character
+        ('Ł', 556),  # no decomposition
+        ('ﬁ', 278 + 222),  # compatibility decomposition
+        ('李', 1000),
+        ('Ж', 556),
+        (' ', THIN_SPACE_WIDTH),
+        ('\u00a0', THIN_SPACE_WIDTH),
+        ('\u2009', THIN_SPACE_WIDTH),
+    ],
+)
+def test_char_width(char, width):
+    assert get_char_width(char) == width
+
+
+def test_name_width():
+    # NB: 1000 thousandths of an em at 14.4pt, converted into millimeters
+    assert get_name_width('李') == pytest.approx(NAME_FONT_SIZE * 25.4 / 72.27)
+    assert get_name_width('') == 0
+    assert get_name_width('WW') == 2 * get_name_width('W')
+    assert get_name_width('Jean Paul') == pytest.approx(
+        get_name_width('Jean') + get_name_width('Paul') + get_name_width(' ')
+    )
+    # NB: precomposed and decomposed accented characters have the same width
+    assert get_name_width(unicodedata.normalize('NFD', 'Zoé Ăgnès')) == get_name_width('Zoé Ăgnès')
@@ -0,0 +1,120 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import pytest
+
+from aluso_label.people import SORT_TYPES, EventParticipation, Person, get_name_key, get_sort_orders, sort_people
+
+# ==============================================================================
+
+
+def make_person(first_name, last_name, ticket='Visite seule', status='member'):
+    person = Person('', first_name, last_name, status != 'external', status == 'contributor', ticket)
+    person.is_committee = status == 'committee'
+    return person
+
+
+def names(people, order):
+    return [f'{people[idx].first_name} {people[idx].last_name}' for idx in order]
+
+
+@pytest.fixture
+def people():
+    return [
+        make_person('Zoé', 'Dupont', 'Visite avec repas', 'external'),
+        make_person('élise', 'Zoé', 'Apéro', 'committee'),
+        make_person('Anna', 'dupont', 'Visite seule', 'contributor'),
+        make_person('Émile', 'Ärger', 'apéro', 'member'),
+        make_person('anna', 'Dupont', 'Visite avec repas', 'member'),
+    ]
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('name', 'key'),
+    [
+        ('Élodie', 'elodie'),
+        ('ÇELIK', 'celik'),
+        ('Straße', 'strasse'),
+        ('Nguyễn', 'nguyen'),
+        ('Ångström', 'angstrom'),
+        ('ﬁlippi', 'filippi'),
+        ('', ''),
+    ],
+)
+def test_name_key(name, key):
+    assert get_name_key(name) == key
+
+
+def test_sort_orders(people):
+    orders = get_sort_orders(people)
+    assert list(orders) == list(SORT_TYPES)
+
+    # NB: ties are broken by the other name, then by the names themselves (uppercase first)
+    assert names(people, orders['last_name']) == [
+        'Émile Ärger',
+        'anna Dupont',
+        'Anna dupont',
+        'Zoé Dupont',
+        'élise Zoé',
+    ]
+    assert names(people, orders['first_name']) == [
+        'anna Dupont',
+        'Anna dupont',
+        'élise Zoé',
+        'Émile Ärger',
+        'Zoé Dupont',
+    ]
+    # NB: the tickets are compared like the names, ties being broken by last name
+    assert names(people, orders['ticket']) == [
+        'Émile Ärger',
+        'élise Zoé',
+        'anna Dupont',
+        'Zoé Dupont',
+        'Anna dupont',
+    ]
+    assert names(people, orders['membership']) == [
+        'élise Zoé',
+        'Anna dupont',
+        'Émile Ärger',
+        'anna Dupont',
+        'Zoé Dupont',
+    ]
+
+
+def test_sort_orders_subset(people):
+    assert get_sort_orders(people, ['ticket']) == {'ticket': get_sort_orders(people)['ticket']}
+    assert get_sort_orders(people, []) == {}
+    assert get_sort_orders([], SORT_TYPES) == {sort_type: [] for sort_type in SORT_TYPES}
+    # NB: unknown sort types fall back to sorting by last name
+    assert get_sort_orders(people, ['unknown'])['unknown'] == get_sort_orders(people)['last_name']
+
+
+def test_sort_people(people):
+    order = get_sort_orders(people)['first_name']
+    assert sort_people(people, 'first_name') == [people[idx] for idx in order]
+
+
+def test_sort_participation_types():
+    # NB: sorting by ticket is meant to be done before the participation types are assigned, but still works after
+    people = [
+        make_person('Jean', 'Dupont', EventParticipation.VISIT),
+        make_person('Anna', 'Wolf', EventParticipation.NOTHING),
+    ]
+    assert names(people, get_sort_orders(people, ['ticket'])['ticket']) == ['Anna Wolf', 'Jean Dupont']
@@ -0,0 +1,122 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import pytest
+
+from aluso_label.people import Person
+from aluso_label.roster_db import RosterDatabase
+from app.main import create_app
+
+# ==============================================================================
+
+
+def make_person(uid, first_name, last_name, ticket, is_member=True):
+    return Person(uid, first_name, last_name, is_member, False, ticket)
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = RosterDatabase(tmp_path / 'db' / 'roster.sqlite3')
+    database.save_event(
+        'Spring visit',
+        [
+            make_person('1', 'Jean', 'Dupont', 'Visite seule'),
+            make_person('2', 'Élise', 'Zoé', 'Visite avec repas'),
+            make_person('', 'Guest', 'Anonymous', 'Visite seule'),
+        ],
+    )
+    database.save_event(
+        'Autumn visit',
+        [
+            make_person('2', 'Élise', 'Zoé-Martin', 'Visite seule', is_member=False),
+            make_person('3', 'Anna', 'Dupont', 'Visite seule'),
+            make_person('3', 'Anna', 'Dupont', 'Apéro'),
+        ],
+    )
+    return database
+
+
+# ==============================================================================
+
+
+def test_save_event(database):
+    assert database.get_events() == ['Spring visit', 'Autumn visit']
+    assert database.ticket_counts('Spring visit') == {'Visite seule': 1, 'Visite avec repas': 1}
+    assert database.ticket_counts('Autumn visit') == {'Visite seule': 2, 'Apéro': 1}
+    assert database.ticket_counts('Unknown') == {}
+
+    # NB: the registrations of an event are replaced when it is recorded again
+    assert database.save_event('Spring visit', [make_person('1', 'Jean', 'Dupont', 'Apéro')]) == 1
+    assert database.get_events() == ['Spring visit', 'Autumn visit']
+    assert database.ticket_counts('Spring visit') == {'Apéro': 1}
+
+
+def test_get_person(database):
+    person = database.get_person('2')
+    assert (person.first_name, person.last_name, person.is_member, person.participation_type) == (
+        'Élise',
+        'Zoé-Martin',
+        False,
+        'Visite seule',
+    )
+    assert database.get_person('1').participation_type == 'Visite seule'
+    assert database.get_person('') is None
+    assert database.get_person('4') is None
+
+
+def test_find_people(database):
+    assert sorted(database.find_people('dupont')) == ['1', '3']
+    assert database.find_people('DUPONT', 'anna') == ['3']
+    assert database.find_people('zoe-martin', 'Elise') == ['2']
+    assert database.find_people('Zoé') == []
+
+
+def test_attendance(database):
+    assert database.attendance_counts() == {'1': 1, '2': 2, '3': 1}
+    assert database.attendance_counts('Autumn visit') == {'2': 2, '3': 1}
+    assert database.first_time_attendees('Spring visit') == ['1', '2']
+    assert database.first_time_attendees('Autumn visit') == ['3']
+
+
+def test_delete_event(database):
+    database.delete_event('Spring visit')
+    assert database.get_events() == ['Autumn visit']
+    assert database.attendance_counts() == {'2': 1, '3': 1}
+    assert database.first_time_attendees('Autumn visit') == ['2', '3']
+    # NB: the people themselves are kept
+    assert database.get_person('1') is None
+    assert database.find_people('Dupont', 'Jean') == ['1']
+
+
+def test_upload_records_event(tmp_path, upload, app):
+    app.config['ROSTER_DB'] = tmp_path / 'roster.sqlite3'
+    app.extensions['roster_db'] = database = RosterDatabase(app.config['ROSTER_DB'])
+    response = upload()
+    assert response.status_code == 200
+    assert 'Please enter the name of the event.' in response.get_data(as_text=True)
+    assert database.get_events() == []
+
+    assert upload(event=' Spring visit ').status_code == 302
+    assert database.get_events() == ['Spring visit']
+    assert database.ticket_counts('Spring visit') == {'Visite avec repas': 1, 'Visite seule': 1}
+
+
+def test_init_roster_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(Person, 'COMMITTEE_LIST', Person.COMMITTEE_LIST)
+    assert 'roster_db' not in create_app({'ROSTER_STORE': 'cookie', 'SNAPSHOTS': False}).extensions
+    app = create_app({'ROSTER_STORE': 'cookie', 'SNAPSHOTS': False, 'ROSTER_DB': str(tmp_path / 'roster.sqlite3')})
+    assert isinstance(app.extensions['roster_db'], RosterDatabase)
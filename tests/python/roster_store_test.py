@@ -0,0 +1,222 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import struct
+import zlib
+
+import pytest
+from flask import session
+
+from aluso_label.roster import Roster
+from app import roster_store
+from app.roster_store import CookieRosterStore, RosterCache, decode_roster, encode_roster
+
+# ==============================================================================
+
+
+def make_roster(people):
+    """Roster as stored by the application from a list of (user ID, first name, last name, ticket, flags) tuples."""
+    roster = Roster.from_dicts(
+        {
+            'aluso_uid': uid,
+            'first_name': first_name,
+            'last_name': last_name,
+            'is_member': 'member' in flags,
+            'is_contributor': 'contributor' in flags,
+            'is_committee': 'committee' in flags,
+            'participation_type': ticket,
+        }
+        for uid, first_name, last_name, ticket, flags in people
+    )
+    return {'people': roster, 'ticket_names': sorted(roster.ticket_names)}
+
+
+def round_trip(roster):
+    decoded = decode_roster(encode_roster(roster))
+    assert decoded['people'].to_dicts() == roster['people'].to_dicts()
+    assert decoded['ticket_names'] == roster['ticket_names']
+    return decoded
+
+
+def encode_v1(ticket_names, people):
+    """Encode a roster using the first version of the codec (without the user IDs)."""
+    strings = list(ticket_names)
+    if people:
+        strings += ['\0'.join(person[0] for person in people), '\0'.join(person[1] for person in people)]
+    flags = [ticket_names.index(person[2]) << 3 | person[3] for person in people]
+    return zlib.compress(
+        struct.pack('<BII', 1, len(ticket_names), len(people))
+        + struct.pack(f'<{len(people)}H', *flags)
+        + '\0'.join(strings).encode('utf-8')
+    )
+
+
+# ==============================================================================
+
+
+def test_round_trip():
+    decoded = round_trip(
+        make_roster(
+            [
+                ('1', 'Jean', 'Dupont', 'Visite avec repas', 'member committee'),
+                ('', 'Élise', '', 'Visite seule', ''),
+                ('3', '', 'Zoé', 'Visite avec repas', 'member contributor'),
+            ]
+        )
+    )
+    assert decoded['people'][1].first_name == 'Élise'
+    assert decoded['people'][2].is_contributor
+
+
+def test_round_trip_empty():
+    decoded = round_trip(make_roster([]))
+    assert len(decoded['people']) == 0
+    assert decoded['ticket_names'] == []
+
+
+def test_round_trip_single_person():
+    round_trip(make_roster([('', '', '', '', '')]))
+
+
+def test_round_trip_non_ascii():
+    round_trip(
+        make_roster(
+            [
+                ('1', 'Łukasz', 'Nguyễn', 'Visite & repas 🍷', 'member'),
+                ('2', '李', 'Müller-Šťastný', 'Apéro', 'contributor'),
+            ]
+        )
+    )
+
+
+def test_round_trip_many_tickets():
+    people = [(str(idx), f'First{idx}', f'Last{idx}', f'Ticket {idx}', 'member') for idx in range(5000)]
+    decoded = round_trip(make_roster(people))
+    assert len(decoded['ticket_names']) == 5000
+
+    with pytest.raises(ValueError, match='Too many ticket names'):
+        encode_roster(make_roster([(str(idx), 'A', 'B', f'Ticket {idx}', '') for idx in range(1 << 13)]))
+
+
+def test_decode_v1():
+    decoded = decode_roster(encode_v1(['Visite seule', 'Apéro'], [('Jean', 'Dupont', 'Apéro', 0b101)]))
+    assert decoded['people'].to_dicts() == [
+        {
+            'aluso_uid': '',
+            'first_name': 'Jean',
+            'last_name': 'Dupont',
+            'is_member': True,
+            'is_contributor': False,
+            'participation_type': 'Apéro',
+            'is_committee': True,
+        }
+    ]
+    assert decoded['ticket_names'] == ['Apéro', 'Visite seule']
+
+    assert len(decode_roster(encode_v1([], []))['people']) == 0
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'',
+        b'not a roster',
+        zlib.compress(b''),
+        zlib.compress(struct.pack('<BII', 3, 0, 0)),
+        zlib.compress(struct.pack('<BII', 2, 1, 2) + b'\x00\x00'),
+        zlib.compress(struct.pack('<BII', 2, 1, 1) + struct.pack('<H', 1 << 3) + b'T\0A\0B\0'),
+        zlib.compress(struct.pack('<BII', 2, 1, 1) + struct.pack('<H', 0) + b'T\0A'),
+        zlib.compress(struct.pack('<BII', 2, 1, 1) + struct.pack('<H', 0) + b'T\0\xff\0B\0'),
+    ],
+)
+def test_decode_invalid(data):
+    with pytest.raises(ValueError, match='roster'):
+        decode_roster(data)
+
+
+def test_decode_truncated():
+    data = encode_roster(make_roster([('1', 'Jean', 'Dupont', 'Visite seule', 'member')] * 100))
+    for size in range(len(data)):
+        with pytest.raises(ValueError, match='Invalid roster data'):
+            decode_roster(data[:size])
+
+
+def test_cookie_store_invalid_roster(app):
+    store = CookieRosterStore()
+    with app.test_request_context():
+        key = store.save(make_roster([('1', 'Jean', 'Dupont', 'Visite seule', 'member')]))
+        assert store.load(key)['people'][0].last_name == 'Dupont'
+
+        session['roster'] = encode_roster(make_roster([]))[:-4]
+        assert store.load(key) is None
+
+
+def test_roster_cache():
+    cache = RosterCache(max_entries=2)
+    rosters = {key: make_roster([]) for key in 'abc'}
+    cache.put('a', rosters['a'])
+    cache.put('b', rosters['b'])
+    assert cache.get('a') is rosters['a']
+
+    # NB: 'b' is the least recently used roster since 'a' was just retrieved
+    cache.put('c', rosters['c'])
+    assert cache.get('b') is None
+    assert cache.get('a') is rosters['a']
+    assert cache.get('c') is rosters['c']
+
+    cache.pop('a')
+    cache.pop('unknown')
+    assert cache.get('a') is None
+    assert cache.get('c') is rosters['c']
+
+
+def test_roster_cache_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(roster_store.time, 'time', lambda: now)
+    cache = RosterCache(ttl=60)
+    roster = make_roster([])
+    cache.put('a', roster)
+
+    now += 60
+    assert cache.get('a') is roster
+    now += 1
+    assert cache.get('a') is None
+    # NB: replacing an expired roster makes it valid again
+    cache.put('a', roster)
+    assert cache.get('a') is roster
+
+
+def test_roster_cache_disabled():
+    cache = RosterCache(max_entries=0)
+    cache.put('a', make_roster([]))
+    assert cache.get('a') is None
+
+
+def test_load_roster_cached(app, upload, client):
+    upload()
+    cache = app.extensions['roster_cache']
+    with client.session_transaction() as session_data:
+        key = session_data['roster_key']
+    roster = cache.get(key)
+    assert [person.first_name for person in roster['people']] == ['Jean', 'Élise']
+
+    # NB: the cached roster is served without loading it from the store again
+    app.extensions['roster_store'].delete(key)
+    assert client.get('/api/roster').get_json()['total'] == 2
+
+    cache.pop(key)
+    assert client.get('/api/roster').status_code == 404
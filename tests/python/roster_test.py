@@ -0,0 +1,141 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import io
+import itertools
+
+import pytest
+
+from aluso_label.csv_import import read_people
+from aluso_label.people import SORT_TYPES, EventParticipation, get_sort_orders
+from aluso_label.pipeline import assign_participation_types
+from aluso_label.roster import PersonRow, Roster, StringColumn
+
+# ==============================================================================
+
+CSV_DATA = '''ID user AF,Prénom,Nom de famille,Cotisant,Nom du billet
+3,Zoé,Martin,Oui,Apéro
+1,Jean,Dupont,Oui,Visite avec repas
+,Élise,dupont,Non,Visite seule
+2,Anna,Ärger,Oui,Visite seule
+'''
+
+PERSON_ATTRIBUTES = PersonRow._fields
+
+
+def person_tuple(person):
+    return tuple(getattr(person, name) for name in PERSON_ATTRIBUTES)
+
+
+@pytest.fixture
+def people():
+    return list(read_people(io.BytesIO(CSV_DATA.encode('utf-8'))))
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize('strings', [[], [''], ['a'], ['', ''], ['Jean', '', 'Élise', 'Łukasz 李']])
+def test_string_column_round_trip(strings):
+    column = StringColumn(strings)
+    assert len(column) == len(strings)
+    assert list(column) == column.tolist() == strings
+    assert [column[idx] for idx in range(len(strings))] == strings
+
+    copy = StringColumn.from_string(column.to_string(), len(strings))
+    assert copy.tolist() == strings
+    assert [copy[idx] for idx in range(len(strings))] == strings
+
+
+def test_string_column_invalid():
+    with pytest.raises(ValueError, match='NUL characters'):
+        StringColumn(['a\0b'])
+    with pytest.raises(ValueError, match='does not contain 2 items'):
+        StringColumn.from_string('a', 2)
+    with pytest.raises(ValueError, match='does not contain 0 items'):
+        StringColumn.from_string('a', 0)
+
+
+def test_same_rows_as_people(people):
+    roster = Roster(people)
+    assert len(roster) == len(people)
+    assert [person_tuple(row) for row in roster] == [person_tuple(person) for person in people]
+    assert [person_tuple(roster[idx]) for idx in range(len(people))] == [person_tuple(person) for person in people]
+    assert roster.ticket_names == ['Apéro', 'Visite avec repas', 'Visite seule']
+
+    assert Roster.from_dicts(roster.to_dicts()).to_dicts() == roster.to_dicts()
+    assert Roster.from_columns(roster.to_columns()).to_dicts() == roster.to_dicts()
+    assert roster[0].to_person().__dict__ == people[0].__dict__
+
+
+def test_same_sort_orders_as_people(people):
+    assert Roster(people).sort_orders() == get_sort_orders(people, SORT_TYPES)
+
+
+def test_same_participation_types_as_people(people):
+    roster = Roster(people)
+    ticket_names = [person.participation_type for person in people]
+    assign_participation_types(people, {'Visite seule': {'post_visit': False}})
+
+    roster.map_participation_types(dict(zip(ticket_names, (person.participation_type for person in people))))
+    assert [person_tuple(row) for row in roster] == [person_tuple(person) for person in people]
+
+
+@pytest.mark.parametrize('flags', list(itertools.product([False, True], repeat=3)))
+def test_packed_flags(flags):
+    is_member, is_contributor, is_committee = flags
+    people = [
+        {'first_name': 'Élise', 'last_name': 'Zoé', 'participation_type': 'Visite seule'},
+        {'first_name': 'Jean', 'last_name': 'Dupont', 'participation_type': 'Apéro'},
+    ]
+    roster = Roster.from_dicts(
+        {**person, 'is_member': is_member, 'is_contributor': is_contributor, 'is_committee': is_committee}
+        for person in people
+    )
+
+    assert [roster.flags[idx] >> 3 for idx in range(2)] == [0, 1]
+    for row in (roster[1], list(roster)[1], roster.take([1])[0]):
+        assert (row.is_member, row.is_contributor, row.is_committee) == flags
+        assert row.participation_type == 'Apéro'
+
+
+def test_take(people):
+    roster = Roster(people)
+    taken = roster.take([3, 0, 2])
+    assert [row.first_name for row in taken] == ['Anna', 'Zoé', 'Élise']
+    assert taken[-1].first_name == 'Élise'
+    assert taken.to_columns()['first_names'] == 'Anna\0Zoé\0Élise'
+
+    # NB: the indices of a taken roster are relative to that roster
+    assert [row.first_name for row in taken.take([2, 0])] == ['Élise', 'Anna']
+    assert [row.first_name for row in taken.filter_tickets(['Visite seule'])] == ['Anna', 'Élise']
+    assert len(roster.take([])) == 0
+    assert list(roster.take([])) == []
+
+    with pytest.raises(IndexError):
+        taken[3]
+    with pytest.raises(IndexError):
+        taken[-4]
+
+
+def test_take_participation_types(people):
+    roster = Roster(people)
+    taken = roster.take([1, 2])
+    taken.map_participation_types(dict.fromkeys(roster.ticket_names, EventParticipation.VISIT))
+    assert [row.participation_type for row in taken] == [EventParticipation.VISIT] * 2
+    # NB: the participation types of the original roster are not modified
+    assert [row.participation_type for row in roster.take([1, 2])] == ['Visite avec repas', 'Visite seule']
@@ -0,0 +1,126 @@
+#   Copyright 2023 <Damien Nguyen>
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+#   documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+#   rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+#   Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+#   WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+#   OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#   OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import pytest
+
+from aluso_label.people import EventParticipation, Person
+from aluso_label.snapshots import (
+    SnapshotStore,
+    diff_people,
+    load_snapshot,
+    person_fingerprint,
+    save_snapshot,
+    take_snapshot,
+)
+
+# ==============================================================================
+
+
+def make_person(uid, first_name='Jean', last_name='Dupont', participation_type=EventParticipation.VISIT):
+    return Person(uid, first_name, last_name, True, False, participation_type)
+
+
+@pytest.fixture
+def people():
+    return [
+        make_person('1'),
+        make_person('2', 'Élise', 'Zoé'),
+        make_person('', 'Guest', 'Anonymous'),
+        make_person('3', 'Anna', 'Wolf', EventParticipation.VISIT | EventParticipation.POST_VISIT),
+    ]
+
+
+# ==============================================================================
+
+
+def test_take_snapshot(people):
+    snapshot = take_snapshot(people)
+    assert sorted(snapshot) == ['1', '2', '3']
+    assert snapshot['1'] == person_fingerprint(make_person('1'))
+    assert len(set(snapshot.values())) == 3
+
+
+@pytest.mark.parametrize(
+    'changes',
+    [
+        {'first_name': 'Jeanne'},
+        {'last_name': 'Dupond'},
+        {'is_member': False},
+        {'is_contributor': True},
+        {'is_committee': True},
+        {'participation_type': EventParticipation.POST_VISIT},
+    ],
+)
+def test_fingerprint_changes(changes):
+    person = make_person('1')
+    fingerprint = person_fingerprint(person)
+    for name, value in changes.items():
+        setattr(person, name, value)
+    assert person_fingerprint(person) != fingerprint
+
+
+def test_fingerprint_separator():
+    # NB: the fields are separated, so moving characters from one name to the other changes the fingerprint
+    assert person_fingerprint(make_person('1', 'Jean', 'Paul')) != person_fingerprint(make_person('1', 'Jea', 'nPaul'))
+
+
+def test_diff_people(people):
+    snapshot = take_snapshot(people)
+    assert diff_people(people, snapshot) == [people[2]]
+    assert diff_people(people, {}) == people
+    assert diff_people([], snapshot) == []
+
+    new_people = [
+        make_person('4', 'Marc', 'Neuf'),
+        make_person('3', 'Anna', 'Wolf', EventParticipation.VISIT),
+        *people[:3],
+    ]
+    # NB: the order is kept and removed participants are simply ignored
+    assert diff_people(new_people, snapshot) == [new_people[0], new_people[1], people[2]]
+    assert diff_people(new_people[2:4], snapshot) == []
+
+
+def test_save_load_snapshot(tmp_path, people):
+    path = tmp_path / 'snapshot.json'
+    assert load_snapshot(path) is None
+
+    snapshot = take_snapshot(people)
+    save_snapshot(path, snapshot, 'Visite')
+    assert load_snapshot(path) == snapshot
+    save_snapshot(path, {}, 'Visite')
+    assert load_snapshot(path) == {}
+    assert [file.name for file in tmp_path.iterdir()] == ['snapshot.json']
+
+
+@pytest.mark.parametrize('content', ['{', '[]', '{"people": []}', '{"event": "Visite"}'])
+def test_load_invalid_snapshot(tmp_path, content):
+    path = tmp_path / 'snapshot.json'
+    path.write_text(content, encoding='utf-8')
+    with pytest.raises(ValueError):  # noqa: PT011
+        load_snapshot(path)
+
+
+def test_snapshot_store(tmp_path, people):
+    store = SnapshotStore(tmp_path / 'snapshots')
+    assert store.load('Visite') is None
+
+    snapshot = take_snapshot(people)
+    store.save('Visite', snapshot)
+    store.save('../Visite', {})
+    assert store.load('Visite') == snapshot
+    assert store.load('../Visite') == {}
+    assert all(path.parent == tmp_path / 'snapshots' for path in (store.path('Visite'), store.path('../Visite')))